@@ -0,0 +1,60 @@
+"""
+Benchmarks evaluating 60 secrets which each take 15 ms to fetch, one after another by `evaluate_conf`, compared with
+concurrently by `evaluate_conf_async`.
+
+Usage: python -m benchmarks.async_evaluate_bench
+"""
+import asyncio
+import time
+from typing import Any
+
+from pyfig import AbstractAsyncEvaluator, AbstractEvaluator, evaluate_conf, evaluate_conf_async
+
+
+_LATENCY = 0.015
+
+
+class _BlockingSecrets(AbstractEvaluator):
+    def name(self) -> str:
+        return "secret"
+
+    def evaluate(self, value: str) -> Any:
+        time.sleep(_LATENCY)
+        return value.upper()
+
+
+class _AsyncSecrets(AbstractAsyncEvaluator):
+    def name(self) -> str:
+        return "secret"
+
+    async def evaluate(self, value: str) -> Any:
+        await asyncio.sleep(_LATENCY)
+        return value.upper()
+
+
+def _build_conf() -> dict:
+    return {f"service{i}": {"password": f"${{{{secret.service{i}}}}}", "port": 8000 + i} for i in range(60)}
+
+
+def main() -> None:
+    conf = _build_conf()
+    start = time.perf_counter()
+    evaluate_conf(conf, [_BlockingSecrets()])
+    blocking = time.perf_counter() - start
+
+    print(f"{'max_concurrency':>16} {'seconds':>8} {'speedup':>8}")
+    print(f"{'(sync)':>16} {blocking:>8.3f} {1:>7.1f}x")
+
+    for max_concurrency in (None, 16, 4):
+        expected = conf
+        conf = _build_conf()
+        start = time.perf_counter()
+        asyncio.run(evaluate_conf_async(conf, [_AsyncSecrets()], max_concurrency=max_concurrency))
+        concurrent = time.perf_counter() - start
+        assert conf == expected
+
+        print(f"{str(max_concurrency):>16} {concurrent:>8.3f} {blocking / concurrent:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmarks `load_configuration` validating many small overrides against the same (~50k field) class, with and without
+the cached defaults dump.
+
+Usage: python -m benchmarks.defaults_cache_bench
+"""
+import timeit
+from typing import Type
+
+from pyfig import Pyfig, load_configuration
+from pyfig._loader import _clear_defaults_cache
+
+
+def _build_wide_config(sections: int, fields: int) -> Type[Pyfig]:
+    """
+    Builds a root config with `sections` sub-models of `fields` string fields each.
+    """
+    section = type("Section", (Pyfig,), {
+        "__annotations__": {f"field{i}": str for i in range(fields)},
+        **{f"field{i}": f"value {i}" for i in range(fields)},
+    })
+
+    return type("Root", (Pyfig,), {
+        "__annotations__": {f"section{i}": section for i in range(sections)},
+        **{f"section{i}": section() for i in range(sections)},
+    })
+
+
+def main() -> None:
+    root = _build_wide_config(sections=500, fields=100)
+    overrides = [{f"section{i}": {"field0": "overridden"}} for i in range(20)]
+
+    def uncached():
+        for override in overrides:
+            _clear_defaults_cache()
+            load_configuration(root, [override], [])
+
+    def cached():
+        for override in overrides:
+            load_configuration(root, [override], [])
+
+    uncached_seconds = min(timeit.repeat(uncached, number=1, repeat=3)) / len(overrides)
+    cached_seconds = min(timeit.repeat(cached, number=1, repeat=3)) / len(overrides)
+
+    print(f"uncached defaults: {uncached_seconds * 1e3:8.1f} ms/load")
+    print(f"cached defaults:   {cached_seconds * 1e3:8.1f} ms/load")
+    print(f"speedup:           {uncached_seconds / cached_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmarks importing a config package (100 Pyfig classes, whose default factories build large lists) with and without
+deferred default validation. Also checks that validating a nested config tree (with deferral off) is as fast as
+validating the same tree of plain pydantic models, i.e., the support for deferral costs nothing when unused.
+
+Usage: python -m benchmarks.deferred_defaults_bench
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+from pyfig import Pyfig
+
+
+_CONFIG_MODULE = "\n".join([
+    "from typing import List",
+    "from pydantic import Field",
+    "from pyfig import Pyfig",
+    *(
+        f"class Section{i}(Pyfig):\n"
+        f"    values: List[int] = Field(default_factory=lambda: list(range(20_000)))\n"
+        f"    name: str = 'section{i}'\n"
+        for i in range(100)
+    ),
+])
+
+
+def _best_import_time(env: dict, number: int) -> float:
+    """
+    Returns the best wall-clock time (seconds) of `number` interpreters importing the config module.
+    """
+    best = float("inf")
+    for _ in range(number):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import bench_defaults"], env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _tree(base: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Creates a config class with 20 sections of 2000 fields each.
+    """
+    sections = [
+        create_model(f"Section{i}", __base__=base, **{f"leaf{j}": (int, j) for j in range(2000)}) # type: ignore
+        for i in range(20)
+    ]
+    return create_model("Root", __base__=base, **{f"section{i}": (s, s()) for i, s in enumerate(sections)}) # type: ignore
+
+
+class _Plain(BaseModel):
+    model_config = ConfigDict(validate_default=True)
+
+
+def _best_validation_time(root: Type[BaseModel]) -> float:
+    dump = root().model_dump()
+    return min(timeit.repeat(lambda: root(**dump), number=5, repeat=10)) / 5
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "bench_defaults.py").write_text(_CONFIG_MODULE)
+
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join([tmp, os.getcwd(), os.environ.get("PYTHONPATH", "")])}
+        env.pop("PYFIG_DEFER_DEFAULT_VALIDATION", None)
+        number = 10
+
+        eager = _best_import_time(env, number)
+        deferred = _best_import_time({**env, "PYFIG_DEFER_DEFAULT_VALIDATION": "1"}, number)
+
+    print(f"eager:    {eager * 1e3:8.1f} ms")
+    print(f"deferred: {deferred * 1e3:8.1f} ms")
+    print(f"saved:    {(eager - deferred) * 1e3:8.1f} ms")
+
+    pyfig_time, plain_time = _best_validation_time(_tree(Pyfig)), _best_validation_time(_tree(_Plain))
+    print(f"nested validation (deferral off): pyfig {pyfig_time * 1e3:.1f} ms, pydantic {plain_time * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
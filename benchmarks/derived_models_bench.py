@@ -0,0 +1,65 @@
+"""
+Benchmarks `load_configuration(..., allow_unused=False)` against a deep config class tree, with and without the
+derived class cache.
+
+Usage: python -m benchmarks.derived_models_bench
+"""
+import timeit
+from typing import List, Type
+
+from pydantic import BaseModel
+
+from pyfig import Pyfig, load_configuration
+from pyfig._loader import _clear_derived_model_cache
+
+
+def _build_deep_config(depth: int, width: int) -> Type[Pyfig]:
+    """
+    Builds a class tree `depth` levels deep, where every level has `width` scalar fields and a list of models.
+    """
+    class Leaf(BaseModel):
+        name: str = "leaf"
+        enabled: bool = True
+
+    child: Type[Pyfig] = type("Level0", (Pyfig,), {
+        "__annotations__": {f"field{i}": int for i in range(width)},
+        **{f"field{i}": i for i in range(width)},
+    })
+
+    for level in range(1, depth):
+        annotations = {f"field{i}": int for i in range(width)}
+        annotations["child"] = child
+        annotations["leaves"] = List[Leaf]
+        child = type(f"Level{level}", (Pyfig,), {
+            "__annotations__": annotations,
+            **{f"field{i}": i for i in range(width)},
+            "child": child(),
+            "leaves": [Leaf()],
+        })
+
+    return child
+
+
+def main() -> None:
+    root = _build_deep_config(depth=12, width=20)
+    override = {"field0": 100, "child": {"field1": 200}}
+    number = 50
+
+    def cold():
+        _clear_derived_model_cache()
+        load_configuration(root, [override], [], allow_unused=False)
+
+    def warm():
+        load_configuration(root, [override], [], allow_unused=False)
+
+    warm() # prime the cache
+    cold_seconds = min(timeit.repeat(cold, number=number, repeat=3)) / number
+    warm_seconds = min(timeit.repeat(warm, number=number, repeat=3)) / number
+
+    print(f"uncached: {cold_seconds * 1e3:8.3f} ms/load")
+    print(f"cached:   {warm_seconds * 1e3:8.3f} ms/load")
+    print(f"speedup:  {cold_seconds / warm_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmarks `evaluate_conf` on a large config with a few chained templates, against the previous implementation
+which re-scanned the whole tree until nothing changed.
+
+Usage: python -m benchmarks.evaluate_conf_bench
+"""
+import os
+import timeit
+from copy import deepcopy
+
+from pyfig import EnvironmentEvaluator, VariableEvaluator, evaluate_conf
+from pyfig._evaluate_conf import _evaluate_string
+
+
+def _fixpoint_evaluate_conf(conf, evaluators) -> None:
+    """
+    The previous `evaluate_conf` implementation, kept for comparison.
+    """
+    changes = 1
+    while changes > 0:
+        changes = 0
+        items = conf.items() if isinstance(conf, dict) else enumerate(conf)
+        for key, value in list(items):
+            if isinstance(value, str):
+                new = _evaluate_string(value, evaluators)
+                if new != value:
+                    conf[key] = new
+                    changes += 1
+            elif isinstance(value, (dict, list)):
+                _fixpoint_evaluate_conf(value, evaluators)
+
+
+def _build_conf(sections: int, leaves: int) -> dict:
+    """
+    Builds a config with `sections * leaves` string leaves. Each section holds one chained template.
+    """
+    conf = {}
+    for section in range(sections):
+        conf[f"section{section}"] = {
+            **{f"leaf{leaf}": f"plain value {leaf}" for leaf in range(leaves)},
+            "chained": "${{var.chain}}",
+        }
+    return conf
+
+
+def main() -> None:
+    os.environ["PYFIG_BENCH_VALUE"] = "resolved"
+    evaluators = [
+        VariableEvaluator(chain="${{var.link1}}", link1="${{var.link2}}", link2="${{env.PYFIG_BENCH_VALUE}}"),
+        EnvironmentEvaluator(),
+    ]
+    original = _build_conf(sections=200, leaves=100)
+    number = 5
+
+    def run(implementation):
+        def timed():
+            conf = deepcopy(original)
+            implementation(conf, evaluators)
+        deepcopy_seconds = min(timeit.repeat(lambda: deepcopy(original), number=number, repeat=3))
+        return (min(timeit.repeat(timed, number=number, repeat=3)) - deepcopy_seconds) / number
+
+    fixpoint_seconds = run(_fixpoint_evaluate_conf)
+    worklist_seconds = run(evaluate_conf)
+
+    print(f"fixpoint: {fixpoint_seconds * 1e3:8.3f} ms/conf")
+    print(f"worklist: {worklist_seconds * 1e3:8.3f} ms/conf")
+    print(f"speedup:  {fixpoint_seconds / worklist_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmarks evaluating n fields of one JSON file (with no document cache), one template at a time, compared with one
+`evaluate_many` batch per round.
+
+Usage: python -m benchmarks.evaluate_many_bench
+"""
+import json
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, List, Sequence
+
+from pyfig import JSONFileEvaluator, evaluate_conf
+
+
+class _OneAtATime(JSONFileEvaluator):
+    """
+    Evaluates each value separately (i.e., reads the file for every template), like evaluators without a batch hook.
+    """
+
+    def evaluate_many(self, values: Sequence[str]) -> List[Any]:
+        return [self.evaluate(value) for value in values]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "secrets.json"
+        path.write_text(json.dumps({f"service{i}": {"password": f"secret {i}", "port": i} for i in range(1_000)}))
+
+        print(f"{'n':>6} {'one at a time':>15} {'batched':>10} {'speedup':>8}")
+
+        for n in (10, 100, 1_000):
+            conf = {f"service{i}": f"${{{{jsonfile.service{i}:{path.as_posix()}}}}}" for i in range(n)}
+
+            def run(evaluator: JSONFileEvaluator) -> None:
+                evaluate_conf(dict(conf), [evaluator])
+
+            number = 3
+            single = min(timeit.repeat(lambda: run(_OneAtATime(document_cache=None)), number=number, repeat=3)) / number
+            batched = min(timeit.repeat(lambda: run(JSONFileEvaluator(document_cache=None)), number=number,
+                                        repeat=3)) / number
+
+            print(f"{n:>6} {single * 1e3:>12.2f} ms {batched * 1e3:>7.2f} ms {single / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
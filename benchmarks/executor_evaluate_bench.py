@@ -0,0 +1,51 @@
+"""
+Benchmarks evaluating 60 templates whose (blocking) evaluator takes 15 ms each, serially by `evaluate_conf`, compared
+with evaluating each round in a thread pool (`evaluate_conf(..., executor=...)`).
+
+Usage: python -m benchmarks.executor_evaluate_bench
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from pyfig import AbstractEvaluator, evaluate_conf
+
+
+_LATENCY = 0.015
+
+
+class _BlockingReads(AbstractEvaluator):
+    def name(self) -> str:
+        return "read"
+
+    def evaluate(self, value: str) -> Any:
+        time.sleep(_LATENCY) # e.g., a file on a network filesystem
+        return value.upper()
+
+
+def _build_conf() -> dict:
+    return {f"service{i}": {"certificate": f"${{{{read.service{i}.pem}}}}", "port": 8000 + i} for i in range(60)}
+
+
+def main() -> None:
+    expected = _build_conf()
+    start = time.perf_counter()
+    evaluate_conf(expected, [_BlockingReads()])
+    serial = time.perf_counter() - start
+
+    print(f"{'max_workers':>12} {'seconds':>8} {'speedup':>8}")
+    print(f"{'(serial)':>12} {serial:>8.3f} {1:>7.1f}x")
+
+    for max_workers in (4, 16, 64):
+        conf = _build_conf()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            start = time.perf_counter()
+            evaluate_conf(conf, [_BlockingReads()], executor=executor)
+            pooled = time.perf_counter() - start
+        assert conf == expected
+
+        print(f"{max_workers:>12} {pooled:>8.3f} {serial / pooled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmarks unifying n flat `a.b.c=value` overrides, built into one trie by `flat_overrides`, compared with converting
+each of them to a nested dict and unifying those.
+
+Usage: python -m benchmarks.flat_overrides_bench
+"""
+import timeit
+
+from pyfig._flat import flat_overrides
+from pyfig._override import unify_overrides
+
+
+def _nested_one_at_a_time(pairs: dict) -> dict:
+    overrides = []
+    for path, value in pairs.items():
+        override = value
+        for key in reversed(path.split(".")):
+            override = {key: override}
+        overrides.append(override)
+    return unify_overrides(*reversed(overrides))
+
+
+def main() -> None:
+    print(f"{'n':>7} {'nested':>12} {'trie':>10} {'speedup':>8}")
+
+    for n in (1_000, 10_000, 100_000):
+        pairs = {f"service{i % 100}.section{i // 100 % 10}.option{i}": str(i) for i in range(n)}
+        assert unify_overrides(flat_overrides(pairs)) == _nested_one_at_a_time(pairs)
+
+        number = 3
+        nested = min(timeit.repeat(lambda: _nested_one_at_a_time(pairs), number=number, repeat=3)) / number
+        trie = min(timeit.repeat(lambda: unify_overrides(flat_overrides(pairs)), number=number, repeat=3)) / number
+
+        print(f"{n:>7} {nested * 1e3:>9.2f} ms {trie * 1e3:>7.2f} ms {nested / trie:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
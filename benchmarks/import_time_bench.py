@@ -0,0 +1,49 @@
+"""
+Benchmarks `import pyfig` (which loads its submodules lazily) against also loading every public name, using
+`-X importtime`. Reported times are the best of several fresh interpreters.
+
+Usage: python -m benchmarks.import_time_bench
+"""
+import subprocess
+import sys
+
+
+def _import_time_us(code: str) -> int:
+    """
+    Returns the total import time (us) of the top-level imports made by `code` in a fresh interpreter.
+    """
+    command = [sys.executable, "-X", "importtime", "-c", code]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        if not module.startswith("  "): # a top-level import (nested imports are indented further)
+            total += int(cumulative_us)
+
+    return total
+
+
+def main() -> None:
+    number = 10
+    # lazily loaded modules are imported via importlib (not reported by -X importtime), so they're imported directly
+    everything = "import pyfig, pyfig._metaconf, pyfig._live, pyfig._debug, pyfig._snapshot, pyfig._incremental, " \
+        "pyfig._eval.jsonfile_evaluator, pyfig._eval.yamlfile_evaluator, pyfig._eval.cat_evaluator, " \
+        "pyfig._eval.environment_evaluator, pyfig._eval.variable_evaluator, pyfig._eval.string_evaluator, " \
+        "pyfig._eval.python_evaluator, pyfig._eval.sympy_evaluator"
+
+    # pydantic loads most of itself lazily, when the first model is defined (as pyfig does)
+    first_model = "from pydantic import BaseModel; type('M', (BaseModel,), {})"
+    pydantic = min(_import_time_us(first_model) for _ in range(number))
+    lazy = min(_import_time_us("import pyfig") for _ in range(number))
+    eager = min(_import_time_us(everything) for _ in range(number))
+
+    print(f"pydantic (first model):     {pydantic / 1e3:8.1f} ms")
+    print(f"import pyfig:               {lazy / 1e3:8.1f} ms")
+    print(f"import pyfig (everything):  {eager / 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmarks reloading a large (~50k field) config after a single value changes, with `load_configuration` and with
+`load_configuration_incremental`.
+
+Usage: python -m benchmarks.incremental_reload_bench
+"""
+import timeit
+from typing import Type
+
+from pyfig import Pyfig, VariableEvaluator, load_configuration, load_configuration_incremental
+
+
+def _build_wide_config(sections: int, fields: int) -> Type[Pyfig]:
+    """
+    Builds a root config with `sections` sub-models of `fields` string fields each.
+    """
+    section = type("Section", (Pyfig,), {
+        "__annotations__": {f"field{i}": str for i in range(fields)},
+        **{f"field{i}": f"value {i}" for i in range(fields)},
+    })
+
+    return type("Root", (Pyfig,), {
+        "__annotations__": {f"section{i}": section for i in range(sections)},
+        **{f"section{i}": section() for i in range(sections)},
+    })
+
+
+def main() -> None:
+    root = _build_wide_config(sections=500, fields=100)
+    # every tenth field is a template
+    base = {f"section{i}": {f"field{j}": "${{var.templated}}" for j in range(0, 100, 10)} for i in range(500)}
+    changed = {"section7": {"field3": "changed"}}
+    evaluators = [VariableEvaluator(templated="value")]
+    number = 5
+
+    previous = load_configuration_incremental(root, [base], evaluators)
+
+    def full():
+        load_configuration(root, [changed, base], evaluators)
+
+    def incremental():
+        load_configuration_incremental(root, [changed, base], evaluators, previous=previous)
+
+    full_seconds = min(timeit.repeat(full, number=number, repeat=3)) / number
+    incremental_seconds = min(timeit.repeat(incremental, number=number, repeat=3)) / number
+
+    print(f"load_configuration:             {full_seconds * 1e3:8.1f} ms/reload")
+    print(f"load_configuration_incremental: {incremental_seconds * 1e3:8.1f} ms/reload")
+    print(f"speedup:                        {full_seconds / incremental_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmarks extracting a few fields from a large JSON file with `JSONFileEvaluator`, comparing a full parse against
+`stream_above` (memory-mapped streaming extraction).
+
+Usage: python -m benchmarks.json_stream_bench [size in MB]
+"""
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pyfig import JSONFileEvaluator
+
+
+def _write_document(path: Path, megabytes: int) -> int:
+    """
+    Writes a feature-flag-dump-like document of roughly `megabytes` MB. Returns the number of flags written.
+    """
+    flags = 0
+    with path.open("w", encoding="utf-8") as file:
+        file.write('{"flags": {')
+        while file.tell() < megabytes * 1024 * 1024:
+            if flags:
+                file.write(",")
+            json.dump(f"flag_{flags}", file)
+            file.write(":")
+            json.dump({"enabled": flags % 2 == 0, "rollout": [flags % 100, "segment-a", "segment-b"]}, file)
+            flags += 1
+        file.write('}, "version": 42}')
+    return flags
+
+
+def _measure(evaluator: JSONFileEvaluator, accessors: list, path: Path):
+    """
+    Times the lookups, then repeats them under tracemalloc to find the peak memory use.
+    """
+    start = time.perf_counter()
+    results = [evaluator.evaluate(f"{accessor}:{path.as_posix()}") for accessor in accessors]
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    for accessor in accessors:
+        evaluator.evaluate(f"{accessor}:{path.as_posix()}")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return results, seconds, peak
+
+
+def main() -> None:
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "flags.json"
+        flags = _write_document(path, megabytes)
+        accessors = ["flags.flag_0.enabled", f"flags.flag_{flags // 2}.rollout", "version"]
+
+        full, full_seconds, full_peak = _measure(JSONFileEvaluator(document_cache=None), accessors, path)
+        streamed, stream_seconds, stream_peak = _measure(JSONFileEvaluator(stream_above=0), accessors, path)
+        assert full == streamed
+
+    print(f"document:    {megabytes} MB, {flags} flags, {len(accessors)} lookups")
+    print(f"full parse:  {full_seconds:8.3f} s, peak {full_peak / 2**20:8.1f} MiB")
+    print(f"streaming:   {stream_seconds:8.3f} s, peak {stream_peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmarks merging m items into an n-long `MergeBy` list, compared with finding each item's match by scanning the list.
+
+Usage: python -m benchmarks.keyed_merge_bench
+"""
+import timeit
+from typing import List
+
+from pydantic import BaseModel
+from typing_extensions import Annotated
+
+from pyfig import MergeBy, Pyfig
+from pyfig._override import unify_overrides
+
+
+class _Route(BaseModel):
+    name: str
+    weight: int = 0
+
+
+class _Routes(Pyfig):
+    routes: Annotated[List[_Route], MergeBy("name")] = []
+
+
+def _linear_scan(items: list, override: list) -> list:
+    items = list(items)
+    for element in override:
+        for i, item in enumerate(items):
+            if item["name"] == element["name"]:
+                items[i] = {**item, **element}
+                break
+        else:
+            items.append(element)
+    return items
+
+
+def main() -> None:
+    print(f"{'n':>7} {'m':>6} {'linear scan':>13} {'indexed':>10} {'speedup':>8}")
+
+    for n in (1_000, 10_000):
+        for m in (100, 1_000, 10_000):
+            conf = {"routes": [{"name": f"route {i}", "weight": i} for i in range(n)]}
+            # every other item matches an existing route (from the end of the list), the rest are appended
+            override = {"routes": [{"name": f"route {n - 1 - i if i % 2 else n + i}", "weight": -i} for i in range(m)]}
+            expected = _linear_scan(conf["routes"], override["routes"])
+            assert unify_overrides(override, conf, model=_Routes)["routes"] == expected
+
+            number = 3
+            naive = min(timeit.repeat(lambda: _linear_scan(conf["routes"], override["routes"]), number=number,
+                                      repeat=3)) / number
+            indexed = min(timeit.repeat(lambda: unify_overrides(override, conf, model=_Routes), number=number,
+                                        repeat=3)) / number
+
+            print(f"{n:>7} {m:>6} {naive * 1e3:>10.2f} ms {indexed * 1e3:>7.2f} ms {naive / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
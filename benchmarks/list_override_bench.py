@@ -0,0 +1,43 @@
+"""
+Benchmarks prepending (and appending) k items to an n-long list with a list override, compared with inserting the
+items one at a time (as list overrides used to).
+
+Usage: python -m benchmarks.list_override_bench
+"""
+import timeit
+
+from pyfig._override import unify_overrides
+
+
+def _one_at_a_time(items: list, override: dict) -> list:
+    items = list(items)
+    for key, value in override.items():
+        if key.startswith("<"):
+            items.insert(0, value)
+        else:
+            items.append(value)
+    return items
+
+
+def main() -> None:
+    print(f"{'n':>7} {'k':>6} {'one at a time':>15} {'batched':>10} {'speedup':>8}")
+
+    for n in (1_000, 10_000, 100_000):
+        for k in (100, 1_000, 10_000):
+            conf = {"routes": [{"name": f"route {i}"} for i in range(n)]}
+            override = {"routes": {
+                **{f"<{i}": {"name": f"prepended {i}"} for i in range(k)},
+                **{f">{i}": {"name": f"appended {i}"} for i in range(k // 10)},
+            }}
+            assert unify_overrides(override, conf)["routes"] == _one_at_a_time(conf["routes"], override["routes"])
+
+            number = 5
+            naive = min(timeit.repeat(lambda: _one_at_a_time(conf["routes"], override["routes"]), number=number,
+                                      repeat=3)) / number
+            batched = min(timeit.repeat(lambda: unify_overrides(override, conf), number=number, repeat=3)) / number
+
+            print(f"{n:>7} {k:>6} {naive * 1e3:>12.2f} ms {batched * 1e3:>7.2f} ms {naive / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmarks applying the same overrides to many base configs, by unifying the override dicts each time, and by applying
+a precompiled `OverridePatch`.
+
+Usage: python -m benchmarks.override_patch_bench
+"""
+import timeit
+
+from pyfig import OverridePatch
+from pyfig._override import unify_overrides
+
+
+SECTIONS = 50
+FIELDS = 20
+BASES = 200
+
+OVERRIDES = [
+    {
+        f"section{s}": {
+            **{f"field{i}": f"override {o}" for i in range(o, FIELDS, 3)},
+            "items": {"0": {"name": f"first {o}"}, str(o + 1): {"name": f"second {o}"}},
+        }
+        for s in range(SECTIONS)
+    }
+    for o in range(3)
+]
+
+BASE_CONFIGS = [
+    {
+        f"section{s}": {
+            **{f"field{i}": f"base {b}" for i in range(FIELDS)},
+            "items": [{"name": f"item {i}"} for i in range(5)],
+        }
+        for s in range(SECTIONS)
+    }
+    for b in range(BASES)
+]
+
+
+def main() -> None:
+    patch = OverridePatch.compile(*OVERRIDES)
+    assert all(patch.apply(base) == unify_overrides(*OVERRIDES, base) for base in BASE_CONFIGS)
+
+    compile_seconds = min(timeit.repeat(lambda: OverridePatch.compile(*OVERRIDES), number=10, repeat=3)) / 10
+    unify_seconds = min(timeit.repeat(
+        lambda: [unify_overrides(*OVERRIDES, base) for base in BASE_CONFIGS], number=1, repeat=3
+    ))
+    patch_seconds = min(timeit.repeat(lambda: [patch.apply(base) for base in BASE_CONFIGS], number=1, repeat=3))
+
+    print(f"compile once ({len(patch)} operations): {compile_seconds * 1e3:8.2f} ms")
+    print(f"unify_overrides x{BASES}:               {unify_seconds * 1e3:8.2f} ms")
+    print(f"OverridePatch.apply x{BASES}:           {patch_seconds * 1e3:8.2f} ms")
+    print(f"speedup:                              {unify_seconds / patch_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
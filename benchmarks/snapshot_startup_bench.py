@@ -0,0 +1,90 @@
+"""
+Benchmarks process startup (a fresh interpreter which loads a metaconf) with and without a `SnapshotCache`.
+
+The config has 200 sections of 50 fields, spread across 4 JSON override files, with an environment variable template
+in each section.
+
+Usage: python -m benchmarks.snapshot_startup_bench
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+
+SECTIONS = 200
+FIELDS = 50
+FILES = 4
+
+_CONFIG_MODULE = "\n".join([
+    "from pyfig import Pyfig",
+    "class Section(Pyfig):",
+    *(f"    field{i}: str = 'value {i}'" for i in range(FIELDS)),
+    "class Root(Pyfig):",
+    *(f"    section{i}: Section = Section()" for i in range(SECTIONS)),
+])
+
+_STARTUP = textwrap.dedent("""\
+    import sys
+    from pyfig import Metaconf, SnapshotCache, EnvironmentEvaluator
+    from bench_config import Root
+
+    if len(sys.argv) > 1:
+        snapshot = SnapshotCache(sys.argv[2]) if len(sys.argv) > 2 else None
+        metaconf = Metaconf(configs=sys.argv[1].split(","), evaluators=[EnvironmentEvaluator()])
+        metaconf.load_config(Root, snapshot=snapshot)
+""")
+
+
+def _time_startups(args: list, env: dict, number: int) -> float:
+    """
+    Returns the best wall-clock time (seconds) of `number` interpreter startups.
+    """
+    best = float("inf")
+    for _ in range(number):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", _STARTUP, *args], env=env, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        (directory / "bench_config.py").write_text(_CONFIG_MODULE)
+
+        configs = []
+        for f in range(FILES):
+            path = directory / f"override{f}.json"
+            path.write_text(json.dumps({
+                f"section{s}": {
+                    **{f"field{i}": f"file {f}" for i in range(FIELDS) if i % FILES == f},
+                    "field0": "${{env.BENCH_VALUE}}",
+                }
+                for s in range(SECTIONS)
+            }))
+            configs.append(path.as_posix())
+
+        env = {**os.environ, "BENCH_VALUE": "from env"}
+        env["PYTHONPATH"] = os.pathsep.join([tmp, os.getcwd(), env.get("PYTHONPATH", "")])
+        number = 10
+
+        baseline = _time_startups([], env, number)
+        without = _time_startups([",".join(configs)], env, number)
+
+        snapshots = (directory / "snapshots").as_posix()
+        _time_startups([",".join(configs), snapshots], env, 1) # store the snapshot
+        with_snapshot = _time_startups([",".join(configs), snapshots], env, number)
+
+    print(f"interpreter + imports only: {baseline * 1e3:8.1f} ms")
+    print(f"load_config:                {without * 1e3:8.1f} ms")
+    print(f"load_config (snapshot):     {with_snapshot * 1e3:8.1f} ms")
+    print(f"load time speedup:          {(without - baseline) / (with_snapshot - baseline):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
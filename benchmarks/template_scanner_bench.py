@@ -0,0 +1,47 @@
+"""
+Benchmarks finding the templates of strings with the (backtracking) template regular expression, compared with the
+linear-time template scanner, on ordinary strings and on worst-case values.
+
+Usage: python -m benchmarks.template_scanner_bench
+"""
+import timeit
+from typing import Callable, List
+
+from pyfig._evaluate_conf import _TEMPLATE_PATTERN
+from pyfig._template_scanner import _parse_cached
+
+
+def _with_pattern(string: str) -> List[str]:
+    return [patmatch.group("value") for patmatch in _TEMPLATE_PATTERN.finditer(string)]
+
+
+def _with_scanner(string: str) -> List[str]:
+    _parse_cached.cache_clear() # measures the scan itself, rather than the cached parse
+    return [template.value for template in _parse_cached(string).templates]
+
+
+def _time(parse: Callable[[str], List[str]], string: str) -> float:
+    number = 5
+    return min(timeit.repeat(lambda: parse(string), number=number, repeat=3)) / number
+
+
+def main() -> None:
+    cases = [
+        ("plain leaf", "${{env.HOME}}/data/${{var.name}}.json"),
+        ("certificate", "${{file." + "MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEA\\n" * 200 + "}}"),
+        ("20 backslashes", "${{a." + "\\" * 20),
+        ("24 backslashes", "${{a." + "\\" * 24),
+        ("100k backslashes", "${{a." + "\\" * 100_000),
+        ("50k '$}'", "${{a." + "$}" * 50_000),
+    ]
+
+    print(f"{'string':>18} {'regex (ms)':>12} {'scanner (ms)':>13}")
+    for name, string in cases:
+        # the regular expression takes exponential time on runs of backslashes, so only the short ones are timed
+        pattern = f"{_time(_with_pattern, string) * 1e3:12.3f}" if len(string) < 1_000 or "\\\\" not in string \
+            else f"{'(hours)':>12}"
+        print(f"{name:>18} {pattern} {_time(_with_scanner, string) * 1e3:13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmarks rebuilding a previously validated config (~10k fields in 11k models) with `Pyfig.from_trusted`, against
+validating it with `model_validate`. The config is rebuilt with plain fields, and with python validators and
+`DirectoryPath` fields (which check the file system) on its sub-models.
+
+Note: pydantic-core validates plain fields faster than models can be constructed in python, so `from_trusted` only
+pays off when validation does more than type checks.
+
+Usage: python -m benchmarks.trusted_construction_bench
+"""
+import timeit
+from pathlib import Path
+from typing import Dict, List
+
+from pydantic import BaseModel, DirectoryPath, field_validator, model_validator
+
+from pyfig import Pyfig
+
+
+class Endpoint(BaseModel):
+    path: str = "/"
+    method: str = "GET"
+    timeout: float = 1.0
+
+
+class CheckedEndpoint(Endpoint):
+    static_files: DirectoryPath = Path(".")
+
+    @model_validator(mode="after")
+    def check_timeout(self) -> "CheckedEndpoint":
+        if self.timeout <= 0:
+            raise ValueError("timeout must be positive")
+        return self
+
+
+def _build_root(endpoint: type, validated: bool) -> type:
+    namespace = {
+        "__annotations__": {"name": str, "port": int, "endpoints": List[endpoint], "labels": Dict[str, str]},
+        "name": "section",
+        "port": 8080,
+        "endpoints": [endpoint(path=f"/{i}") for i in range(10)],
+        "labels": {f"label{i}": str(i) for i in range(10)},
+    }
+    if validated:
+        namespace["lowercase"] = field_validator("name")(classmethod(lambda cls, value: value.lower()))
+
+    section = type("Section", (Pyfig,), namespace)
+    return type("Root", (Pyfig,), {
+        "__annotations__": {f"section{i}": section for i in range(200)},
+        **{f"section{i}": section() for i in range(200)},
+    })
+
+
+def main() -> None:
+    number = 20
+
+    for label, root in [
+        ("plain", _build_root(Endpoint, validated=False)),
+        ("with validators", _build_root(CheckedEndpoint, validated=True)),
+    ]:
+        data = root().model_dump()
+        fingerprint = root.schema_fingerprint()
+        assert root.from_trusted(data, fingerprint=fingerprint) == root.model_validate(data)
+
+        validating = min(timeit.repeat(lambda: root.model_validate(data), number=number, repeat=3)) / number
+        trusted = min(timeit.repeat(lambda: root.from_trusted(data, fingerprint=fingerprint), number=number, repeat=3))
+        trusted /= number
+
+        print(f"{label}:")
+        print(f"    model_validate: {validating * 1e3:8.2f} ms")
+        print(f"    from_trusted:   {trusted * 1e3:8.2f} ms")
+        print(f"    speedup:        {validating / trusted:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
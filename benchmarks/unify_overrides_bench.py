@@ -0,0 +1,65 @@
+"""
+Benchmarks unifying a few small overrides with a large (~50k value) defaults dict, and evaluating the result, when the
+defaults are copied defensively first (as loading used to) and when they are shared by the unified overrides.
+
+Usage: python -m benchmarks.unify_overrides_bench
+"""
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from pyfig import VariableEvaluator
+from pyfig._evaluate_conf import _evaluated_copy, evaluate_conf
+from pyfig._loader import _copy_dump
+from pyfig._override import unify_overrides
+
+
+SECTIONS = 500
+FIELDS = 100
+
+DEFAULTS = {
+    f"section{s}": {
+        **{f"field{i}": f"value {i}" for i in range(FIELDS)},
+        "items": [{"name": f"item {i}", "enabled": True} for i in range(5)],
+    }
+    for s in range(SECTIONS)
+}
+
+OVERRIDES = [
+    {"section1": {"field1": "${{var.name}}"}, "section2": {"items": {"0": {"enabled": False}}}},
+    {"section3": {"items": {">": {"name": "appended"}}}},
+    {"section1": {"field2": "override"}},
+]
+
+EVALUATORS = [VariableEvaluator(name="bench")]
+
+
+def copied() -> Dict[str, Any]:
+    conf = unify_overrides(*OVERRIDES, _copy_dump(DEFAULTS))
+    evaluate_conf(conf, EVALUATORS)
+    return conf
+
+
+def shared() -> Dict[str, Any]:
+    return _evaluated_copy(unify_overrides(*OVERRIDES, DEFAULTS), EVALUATORS)
+
+
+def _peak_kib(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    result = fn() # kept alive, so that the peak includes the result
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def main() -> None:
+    assert copied() == shared()
+
+    for name, fn in (("copied defaults", copied), ("shared defaults", shared)):
+        seconds = min(timeit.repeat(fn, number=10, repeat=3)) / 10
+        print(f"{name}: {seconds * 1e3:8.2f} ms/load, {_peak_kib(fn):10.1f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,73 @@
-from ._pyfig import Pyfig
-from ._eval import *
-from ._loader import load_configuration
-from ._metaconf import Metaconf
-from ._evaluate_conf import evaluate_conf
-from ._debug import PyfigDebug
+import importlib
+from typing import Any, Dict, List
+
+from ._pyfig import Pyfig, defer_default_validation, validate_all_defaults
+from ._eval import AbstractEvaluator, AbstractAsyncEvaluator, EvaluatorRegistry, EvaluationCache, \
+                   record_environment_read, record_file_read
+from ._loader import load_configuration, load_configuration_async
+from ._evaluate_conf import EvaluationError, EvaluationLimitError, EvaluationLimits, TemplateCycleError, \
+                            evaluate_conf, evaluate_conf_async
+
+
+# Everything else is only imported once it is first used, so that `import pyfig` stays fast. See: PEP 562
+_LAZY: Dict[str, str] = {
+    "DocumentCache": "._eval",
+    "VariableEvaluator": "._eval",
+    "EnvironmentEvaluator": "._eval",
+    "PythonEvaluator": "._eval",
+    "StringEvaluator": "._eval",
+    "CatEvaluator": "._eval",
+    "SympyEvaluator": "._eval",
+    "JSONFileEvaluator": "._eval",
+    "YamlFileEvaluator": "._eval",
+    "OverridePatch": "._override",
+    "MergeBy": "._override",
+    "flat_overrides": "._flat",
+    "parse_assignments": "._flat",
+    "environ_overrides": "._flat",
+    "LoadedConfiguration": "._incremental",
+    "load_configuration_incremental": "._incremental",
+    "Metaconf": "._metaconf",
+    "ConfigFileTiming": "._metaconf",
+    "LiveConfig": "._live",
+    "SnapshotCache": "._snapshot",
+    "PyfigDebug": "._debug",
+    "ParserBackend": "._parsers",
+    "get_parser_backend": "._parsers",
+    "set_parser_backend": "._parsers",
+    "parser_backends": "._parsers",
+}
+
+__all__ = [
+    "Pyfig",
+    "defer_default_validation",
+    "validate_all_defaults",
+    "AbstractEvaluator",
+    "AbstractAsyncEvaluator",
+    "EvaluatorRegistry",
+    "EvaluationCache",
+    "record_environment_read",
+    "record_file_read",
+    "load_configuration",
+    "load_configuration_async",
+    "evaluate_conf",
+    "evaluate_conf_async",
+    "EvaluationError",
+    "EvaluationLimits",
+    "EvaluationLimitError",
+    "TemplateCycleError",
+    *_LAZY,
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -1,9 +1,44 @@
-from .abstract_evaluator import AbstractEvaluator
-from .variable_evaluator import VariableEvaluator
-from .environment_evaluator import EnvironmentEvaluator
-from .python_evaluator import PythonEvaluator
-from .string_evaluator import StringEvaluator
-from .cat_evaluator import CatEvaluator
-from .sympy_evaluator import SympyEvaluator
-from .jsonfile_evaluator import JSONFileEvaluator
-from .yamlfile_evaluator import YamlFileEvaluator
+import importlib
+from typing import Any, Dict, List
+
+from .abstract_evaluator import AbstractAsyncEvaluator, AbstractEvaluator
+from .evaluator_registry import EvaluatorRegistry
+from .evaluation_cache import EvaluationCache
+from .dependencies import record_environment_read, record_file_read
+
+
+# The evaluators (and their dependencies) are only imported once they are first used. See: PEP 562
+_LAZY: Dict[str, str] = {
+    "DocumentCache": ".document_cache",
+    "VariableEvaluator": ".variable_evaluator",
+    "EnvironmentEvaluator": ".environment_evaluator",
+    "PythonEvaluator": ".python_evaluator",
+    "StringEvaluator": ".string_evaluator",
+    "CatEvaluator": ".cat_evaluator",
+    "SympyEvaluator": ".sympy_evaluator",
+    "JSONFileEvaluator": ".jsonfile_evaluator",
+    "YamlFileEvaluator": ".yamlfile_evaluator",
+}
+
+__all__ = [
+    "AbstractEvaluator",
+    "AbstractAsyncEvaluator",
+    "EvaluatorRegistry",
+    "EvaluationCache",
+    "record_environment_read",
+    "record_file_read",
+    *_LAZY,
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
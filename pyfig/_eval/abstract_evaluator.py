@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional, Sequence
 
 
 class AbstractEvaluator(ABC):
@@ -20,3 +20,69 @@ class AbstractEvaluator(ABC):
         Args:
             value: The value to evaluate (does not include the evaluator name or braces from the original string)
         """
+
+    def evaluate_many(self, values: Sequence[str]) -> List[Any]:
+        """
+        Evaluates several values at once. `evaluate_conf` gives each evaluator all of its templates of a round in one
+        call, so override this when a batch is cheaper than evaluating one value at a time (e.g., one bulk request, or
+        reading a file once for several fields). By default, each value is evaluated by `evaluate`.
+
+        Args:
+            values: the values to evaluate (see: `evaluate`)
+
+        Returns:
+            the evaluation of each value, in the same order
+        """
+        return [self.evaluate(value) for value in values]
+
+    def cacheable(self) -> bool:
+        """
+        Declares whether `evaluate` always returns the same result for the same value, i.e., whether its results
+        may be memoized by an `EvaluationCache`. Evaluators are not cacheable unless they opt-in.
+        """
+        return False
+
+    def fingerprint(self) -> Optional[str]:
+        """
+        Describes this evaluator's settings, such that equal fingerprints (of the same evaluator class) evaluate equal
+        values to equal results - provided that the environment variables and files it reads are unchanged. Those must
+        be reported with `record_environment_read` and `record_file_read` before they are read.
+
+        Used by `SnapshotCache` to detect stale snapshots. Returns None (the default) when the results can't be
+        reproduced this way, in which case configurations using the evaluator are never snapshotted.
+        """
+        return None
+
+
+class AbstractAsyncEvaluator(ABC):
+    """
+    Like `AbstractEvaluator`, but `evaluate` is a coroutine. Use it for evaluators which wait on I/O (e.g., fetching
+    secrets over the network), so that `evaluate_conf_async` can evaluate many templates concurrently.
+
+    Async evaluators can be mixed with (sync) `AbstractEvaluator`s, but only by `evaluate_conf_async` and
+    `load_configuration_async`.
+    """
+
+    @abstractmethod
+    def name(self) -> str:
+        """
+        Returns the name of the evaluator this class is responsible for.
+        """
+
+    @abstractmethod
+    async def evaluate(self, value: str) -> Any:
+        """
+        Evaluates the given value and returns a replacement value. See: `AbstractEvaluator.evaluate`.
+        """
+
+    def cacheable(self) -> bool:
+        """
+        See: `AbstractEvaluator.cacheable`.
+        """
+        return False
+
+    def fingerprint(self) -> Optional[str]:
+        """
+        See: `AbstractEvaluator.fingerprint`.
+        """
+        return None
@@ -1,6 +1,8 @@
 from pathlib import Path
+from typing import Optional
 
 from .abstract_evaluator import AbstractEvaluator
+from .dependencies import record_file_read
 
 
 class CatEvaluator(AbstractEvaluator):
@@ -19,11 +21,18 @@ class CatEvaluator(AbstractEvaluator):
     def name(self) -> str:
         return "cat"
 
+    def cacheable(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[str]:
+        return repr(self._trim)
+
     def evaluate(self, value: str) -> str:
         parts = value.split(":")
         path = Path(parts[0])
         encoding = parts[1] if len(parts) >= 2 else "utf-8"
 
+        record_file_read(path)
         content = path.read_text(encoding)
         if self._trim:
             content = content.strip()
@@ -0,0 +1,94 @@
+import hashlib
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+
+def file_digest(path: Union[str, Path]) -> Optional[str]:
+    """
+    Returns the sha256 of a file's content, or None if the file cannot be read.
+    """
+    hasher = hashlib.sha256()
+
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                hasher.update(chunk)
+    except OSError:
+        return None
+
+    return hasher.hexdigest()
+
+
+class Dependencies:
+    """
+    The external inputs (environment variables and files) which were read while loading a configuration, along with
+    their values at the time. See: `record_environment_read` and `record_file_read`.
+    """
+
+    def __init__(self) -> None:
+        self.environment: Dict[str, Optional[str]] = {}
+        """ environment variable name -> its value (None if unset) """
+
+        self.files: Dict[str, Optional[str]] = {}
+        """ absolute file path -> the sha256 of its content (None if unreadable) """
+
+    def add_environment(self, name: str) -> None:
+        self.environment.setdefault(name, os.environ.get(name))
+
+    def add_file(self, path: Union[str, Path]) -> None:
+        key = os.path.abspath(path)
+        if key not in self.files:
+            self.files[key] = file_digest(key)
+
+    def unchanged(self) -> bool:
+        """
+        Checks whether every recorded input still has the value it had when it was recorded.
+        """
+        for name, value in self.environment.items():
+            if os.environ.get(name) != value:
+                return False
+
+        for path, digest in self.files.items():
+            if file_digest(path) != digest:
+                return False
+
+        return True
+
+
+_RECORDING: ContextVar[Optional[Dependencies]] = ContextVar("pyfig_dependencies", default=None)
+
+
+@contextmanager
+def recording_dependencies() -> Iterator[Dependencies]:
+    """
+    Collects the inputs recorded (in this context) by evaluators until the `with` block exits.
+    """
+    dependencies = Dependencies()
+    token = _RECORDING.set(dependencies)
+    try:
+        yield dependencies
+    finally:
+        _RECORDING.reset(token)
+
+
+def record_environment_read(name: str) -> None:
+    """
+    Evaluators call this before reading an environment variable, so that cached results (see: `SnapshotCache`) which
+    depend on it are discarded when it changes.
+    """
+    dependencies = _RECORDING.get()
+    if dependencies is not None:
+        dependencies.add_environment(name)
+
+
+def record_file_read(path: Union[str, Path]) -> None:
+    """
+    Evaluators call this before reading a file, so that cached results (see: `SnapshotCache`) which depend on it
+    are discarded when its content changes.
+    """
+    dependencies = _RECORDING.get()
+    if dependencies is not None:
+        dependencies.add_file(path)
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from .dependencies import file_digest, record_environment_read, record_file_read, recording_dependencies
+
+
+def test__given_missing_file__when_file_digest__then_none(pytestdir: Path):
+    assert file_digest(pytestdir / "missing") is None
+
+
+def test__given_no_recording__when_record__then_nothing_happens(pytestdir: Path):
+    record_environment_read("PATH")
+    record_file_read(pytestdir / "missing")
+
+
+def test__given_recorded_inputs__when_unchanged__then_true(pytestdir: Path, monkeypatch: pytest.MonkeyPatch):
+    path = pytestdir / "file.txt"
+    path.write_text("content")
+    monkeypatch.setenv("PYFIG_DEPENDENCY", "value")
+
+    with recording_dependencies() as dependencies:
+        record_environment_read("PYFIG_DEPENDENCY")
+        record_environment_read("PYFIG_UNSET_DEPENDENCY")
+        record_file_read(path)
+
+    assert dependencies.environment == { "PYFIG_DEPENDENCY": "value", "PYFIG_UNSET_DEPENDENCY": None }
+    assert dependencies.files == { str(path.absolute()): file_digest(path) }
+    assert dependencies.unchanged()
+
+
+@pytest.mark.parametrize("change", ["set_env", "unset_env", "edit_file", "delete_file"])
+def test__given_recorded_inputs__when_input_changes__then_not_unchanged(
+    pytestdir: Path, monkeypatch: pytest.MonkeyPatch, change: str
+):
+    path = pytestdir / "file.txt"
+    path.write_text("content")
+    monkeypatch.setenv("PYFIG_DEPENDENCY", "value")
+    monkeypatch.delenv("PYFIG_UNSET_DEPENDENCY", raising=False)
+
+    with recording_dependencies() as dependencies:
+        record_environment_read("PYFIG_DEPENDENCY")
+        record_environment_read("PYFIG_UNSET_DEPENDENCY")
+        record_file_read(path)
+
+    if change == "set_env":
+        monkeypatch.setenv("PYFIG_UNSET_DEPENDENCY", "now set")
+    elif change == "unset_env":
+        monkeypatch.delenv("PYFIG_DEPENDENCY")
+    elif change == "edit_file":
+        path.write_text("contenT")
+    else:
+        path.unlink()
+
+    assert not dependencies.unchanged()
@@ -0,0 +1,141 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional, Tuple, Union
+
+
+_StatSignature = Tuple[int, int, int, int]
+
+
+def _stat_signature(path: Path) -> _StatSignature:
+    """
+    Summarizes a file's on-disk state. A change in any part means the file must be read again.
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_dev)
+
+
+class DocumentCache:
+    """
+    A size-bounded LRU of parsed files, keyed by path and file format. An entry is only reused while the file's
+    stat signature (modification time, size, and inode) is unchanged, so edited files are parsed again.
+
+    Used by the `jsonfile` and `pyyaml` evaluators so that many templates referencing the same file only parse it
+    once. Cached documents are shared: callers must copy anything they intend to modify.
+    """
+
+    _shared: Optional["DocumentCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, *, max_bytes: int=64 * 1024 * 1024) -> None:
+        """
+        Args:
+            max_bytes:  the total size (on disk) of the files that may be kept. Larger files are never cached
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[_StatSignature, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        """ the number of loads answered from the cache """
+        self.misses = 0
+        """ the number of loads that had to parse the file """
+
+    @classmethod
+    def shared(cls) -> "DocumentCache":
+        """
+        Returns the process-wide document cache, for sharing parsed files across evaluators and loads.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def resolve(spec: Union["DocumentCache", Literal["private", "shared"], None]) -> Optional["DocumentCache"]:
+        """
+        Interprets an evaluator's `document_cache` argument.
+
+        Args:
+            spec:   a cache to use, "private" for a new cache, "shared" for the process-wide cache,
+                    or None to disable caching
+
+        Returns:
+            the cache to use, or None when caching is disabled
+        """
+        if spec is None or isinstance(spec, DocumentCache):
+            return spec
+        if spec == "private":
+            return DocumentCache()
+        if spec == "shared":
+            return DocumentCache.shared()
+
+        raise ValueError(f"Unknown document cache: {spec!r}. Expected 'private', 'shared', None, or a DocumentCache")
+
+    def load(self, path: Union[str, Path], kind: str, parse: Callable[[Path], Any]) -> Any:
+        """
+        Gets the parsed contents of a file, only calling `parse` when the file isn't cached or has changed.
+
+        Args:
+            path:   the file to load
+            kind:   the file format (distinguishes the same file parsed in different ways)
+            parse:  parses the file at the given path
+
+        Returns:
+            the (shared) parsed document
+        """
+        path = Path(path)
+        key = (os.path.abspath(path), kind)
+        signature = _stat_signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+
+            self.misses += 1
+
+        document = parse(path)
+
+        with self._lock:
+            self._store(key, signature, document)
+
+        return document
+
+    def _store(self, key: Tuple[str, str], signature: _StatSignature, document: Any) -> None:
+        """
+        Stores a document, evicting the least recently used documents until the cache fits within `max_bytes`.
+        Must be called while holding the lock.
+        """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= previous[0][1]
+
+        size = signature[1]
+        if size > self._max_bytes:
+            return
+
+        self._entries[key] = (signature, document)
+        self._size += size
+
+        while self._size > self._max_bytes:
+            _, (evicted_signature, _) = self._entries.popitem(last=False)
+            self._size -= evicted_signature[1]
+
+    def clear(self) -> None:
+        """
+        Forgets every cached document. The hit and miss counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
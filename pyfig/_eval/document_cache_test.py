@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from .document_cache import DocumentCache
+
+
+def test__given_non_positive_max_bytes__when_construct__then_raises_value_error():
+    with pytest.raises(ValueError):
+        DocumentCache(max_bytes=0)
+
+def test__given_unchanged_file__when_load_twice__then_parsed_once(pytestdir: Path):
+    path = pytestdir / "doc.txt"
+    path.write_text("content")
+    parse = Mock(return_value={"parsed": True})
+    cache = DocumentCache()
+
+    first = cache.load(path, "txt", parse)
+    second = cache.load(path.as_posix(), "txt", parse)
+
+    assert first is second
+    parse.assert_called_once_with(path)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test__given_same_file_different_kind__when_load__then_parsed_per_kind(pytestdir: Path):
+    path = pytestdir / "doc.txt"
+    path.write_text("content")
+    parse = Mock(side_effect=lambda p: p.read_text())
+    cache = DocumentCache()
+
+    cache.load(path, "a", parse)
+    cache.load(path, "b", parse)
+
+    assert parse.call_count == 2
+
+@pytest.mark.parametrize("modify", [
+    lambda path: path.write_text("different length"),
+    lambda path: os.utime(path, ns=(0, 0)),
+])
+def test__given_modified_file__when_load__then_parsed_again(pytestdir: Path, modify):
+    path = pytestdir / "doc.txt"
+    path.write_text("content")
+    parse = Mock(side_effect=lambda p: p.read_text())
+    cache = DocumentCache()
+
+    cache.load(path, "txt", parse)
+    modify(path)
+    cache.load(path, "txt", parse)
+
+    assert parse.call_count == 2
+
+def test__given_missing_file__when_load__then_raises_file_not_found_error(pytestdir: Path):
+    with pytest.raises(FileNotFoundError):
+        DocumentCache().load(pytestdir / "dne.json", "json", Mock())
+
+def test__given_files_over_max_bytes__when_load__then_least_recently_used_evicted(pytestdir: Path):
+    paths = [pytestdir / f"doc{i}.txt" for i in range(3)]
+    for path in paths:
+        path.write_text("x" * 10)
+    parse = Mock(side_effect=lambda p: p.read_text())
+    cache = DocumentCache(max_bytes=25)
+
+    cache.load(paths[0], "txt", parse)
+    cache.load(paths[1], "txt", parse)
+    cache.load(paths[0], "txt", parse) # paths[1] is now least recently used
+    cache.load(paths[2], "txt", parse)
+
+    assert len(cache) == 2
+    cache.load(paths[0], "txt", parse)
+    assert parse.call_count == 3
+    cache.load(paths[1], "txt", parse)
+    assert parse.call_count == 4
+
+def test__given_file_larger_than_max_bytes__when_load__then_not_cached(pytestdir: Path):
+    path = pytestdir / "big.txt"
+    path.write_text("x" * 100)
+    cache = DocumentCache(max_bytes=10)
+
+    assert cache.load(path, "txt", lambda p: p.read_text()) == "x" * 100
+    assert len(cache) == 0
+
+def test__given_specs__when_resolve__then_returns_appropriate_cache():
+    specific = DocumentCache()
+
+    assert DocumentCache.resolve(None) is None
+    assert DocumentCache.resolve(specific) is specific
+    assert DocumentCache.resolve("shared") is DocumentCache.shared()
+    assert isinstance(DocumentCache.resolve("private"), DocumentCache)
+    assert DocumentCache.resolve("private") is not DocumentCache.resolve("private")
+    with pytest.raises(ValueError):
+        DocumentCache.resolve("unknown") # type: ignore
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import os
-from typing import Any
+from typing import Any, Optional
 
 from .abstract_evaluator import AbstractEvaluator
+from .dependencies import record_environment_read
 
 
 class _NotSpecified:
@@ -37,7 +38,11 @@ class EnvironmentEvaluator(AbstractEvaluator):
     def name(self) -> str:
         return "env"
 
+    def fingerprint(self) -> Optional[str]:
+        return repr((self._default, sorted(self._defaults.items())))
+
     def evaluate(self, value: str) -> Any:
+        record_environment_read(value)
         found = os.environ.get(value, None)
         if found is not None:
             return found
@@ -0,0 +1,207 @@
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from time import monotonic
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .abstract_evaluator import AbstractAsyncEvaluator, AbstractEvaluator
+
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+_Key = Tuple[Union[AbstractEvaluator, AbstractAsyncEvaluator], str]
+
+
+class EvaluationCache:
+    """
+    Memoizes the results of evaluators which declare themselves `cacheable()`. Results are keyed by the evaluator
+    (instance) and the value it was given.
+
+    Scopes:
+        - per-load:     the default. `evaluate_conf` uses a fresh, unbounded cache when none is given
+        - process-wide: construct one cache (e.g., `EvaluationCache(maxsize=1024)`) and pass it to every load.
+                        The least recently used results are evicted beyond `maxsize`
+        - TTL:          additionally pass `ttl` (seconds) so results are re-evaluated once they are too old
+
+    Cached results are copied on the way out, so in-place evaluation of a result never changes the cached value.
+    Exceptions are never cached.
+    """
+
+    def __init__(self, *, maxsize: Optional[int]=None, ttl: Optional[float]=None) -> None:
+        """
+        Args:
+            maxsize:    the maximum number of results to keep, or None for unbounded
+            ttl:        how many seconds a result stays valid, or None to keep it until evicted
+        """
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[_Key, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        """ the number of evaluations answered from the cache """
+        self.misses = 0
+        """ the number of evaluations that had to call the evaluator """
+
+    def evaluate(self, evaluator: AbstractEvaluator, value: str) -> Any:
+        """
+        Evaluates `value` with `evaluator`, consulting the cache when the evaluator is `cacheable()`.
+        """
+        if not evaluator.cacheable():
+            return evaluator.evaluate(value)
+
+        key = (evaluator, value)
+        found, result = self._lookup(key)
+        if found:
+            return result
+
+        # evaluated outside of the lock so that slow evaluators don't serialize other threads
+        return self._store(key, evaluator.evaluate(value))
+
+    def evaluate_many(self, evaluator: AbstractEvaluator, values: Sequence[str]) -> List[Any]:
+        """
+        Like `evaluate`, but evaluates several values at once. The values which aren't cached are evaluated by one
+        `evaluate_many` call (and a repeated value is only evaluated once).
+
+        Raises:
+            ValueError if the evaluator doesn't return one result per value
+        """
+        if not evaluator.cacheable():
+            return _evaluate_values(evaluator, values)
+
+        results: List[Any] = [None] * len(values)
+        missing: Dict[str, List[int]] = {}
+        """ each value which isn't cached -> its positions in `values` """
+
+        for position, value in enumerate(values):
+            if value in missing:
+                missing[value].append(position)
+                continue
+
+            found, result = self._lookup((evaluator, value))
+            if found:
+                results[position] = result
+            else:
+                missing[value] = [position]
+
+        if missing:
+            evaluated = _evaluate_values(evaluator, list(missing))
+            for (value, positions), result in zip(missing.items(), evaluated):
+                results[positions[0]] = self._store((evaluator, value), result)
+                for position in positions[1:]:
+                    results[position] = _copy(result)
+
+        return results
+
+    async def evaluate_async(self, evaluator: Union[AbstractEvaluator, AbstractAsyncEvaluator], value: str) -> Any:
+        """
+        Like `evaluate`, but also accepts an `AbstractAsyncEvaluator` (whose evaluation is awaited).
+        """
+        if not evaluator.cacheable():
+            return await _call_async(evaluator, value)
+
+        key = (evaluator, value)
+        found, result = self._lookup(key)
+        if found:
+            return result
+
+        return self._store(key, await _call_async(evaluator, value))
+
+    def _lookup(self, key: _Key) -> Tuple[bool, Any]:
+        """
+        Returns whether `key` has a (fresh) result, and a copy of it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > monotonic()):
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return True, _copy(entry[1])
+
+            self.misses += 1
+            return False, None
+
+    def _store(self, key: _Key, result: Any) -> Any:
+        """
+        Caches the result of `key`, evicting the least recently used results beyond `maxsize`.
+
+        Returns:
+            a copy of the result
+        """
+        expires_at = None if self._ttl is None else monotonic() + self._ttl
+
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            if self._maxsize is not None:
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+
+        return _copy(result)
+
+    def clear(self) -> None:
+        """
+        Forgets every cached result. The hit and miss counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(maxsize={self._maxsize}, ttl={self._ttl}, size={len(self)}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+def _copy(result: Any) -> Any:
+    """
+    Copies a (potentially mutable) result so the caller may modify it freely.
+    """
+    if isinstance(result, _IMMUTABLE_TYPES):
+        return result
+
+    return deepcopy(result)
+
+
+def batches(evaluator: AbstractEvaluator) -> bool:
+    """
+    Checks whether an evaluator overrides `evaluate_many` (rather than evaluating one value at a time).
+    """
+    evaluate_many = getattr(type(evaluator), "evaluate_many", None)
+    return evaluate_many is not None and evaluate_many is not AbstractEvaluator.evaluate_many
+
+
+def _evaluate_values(evaluator: AbstractEvaluator, values: Sequence[str]) -> List[Any]:
+    """
+    Evaluates the values with one `evaluate_many` call, or by calling `evaluate` for each value if the evaluator doesn't
+    override `evaluate_many` (which also supports evaluators that only implement `name` and `evaluate`).
+
+    Raises:
+        ValueError if `evaluate_many` doesn't return one result per value
+    """
+    if not batches(evaluator):
+        return [evaluator.evaluate(value) for value in values]
+
+    results = evaluator.evaluate_many(values)
+    if len(results) != len(values):
+        raise ValueError(
+            f"Evaluator '{evaluator.name()}' returned {len(results)} results from evaluate_many for {len(values)} values"
+        )
+    return results
+
+
+async def _call_async(evaluator: Union[AbstractEvaluator, AbstractAsyncEvaluator], value: str) -> Any:
+    """
+    Evaluates `value`, awaiting the evaluation of an async evaluator (a sync evaluator is simply called).
+    """
+    if isinstance(evaluator, AbstractAsyncEvaluator):
+        return await evaluator.evaluate(value)
+    return evaluator.evaluate(value)
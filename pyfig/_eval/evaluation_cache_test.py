@@ -0,0 +1,195 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from . import evaluation_cache
+from .abstract_evaluator import AbstractAsyncEvaluator, AbstractEvaluator
+from .evaluation_cache import EvaluationCache
+from .variable_evaluator import VariableEvaluator
+
+
+class CountingEvaluator(AbstractEvaluator):
+    def __init__(self, *, cacheable: bool=True):
+        self._cacheable = cacheable
+        self.calls = 0
+
+    def name(self) -> str:
+        return "count"
+
+    def cacheable(self) -> bool:
+        return self._cacheable
+
+    def evaluate(self, value: str) -> Any:
+        self.calls += 1
+        return {"value": value, "call": self.calls}
+
+
+@pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"maxsize": -1}, {"ttl": 0}, {"ttl": -1.0}])
+def test__given_non_positive_limits__when_construct_cache__then_raises_value_error(kwargs):
+    with pytest.raises(ValueError):
+        EvaluationCache(**kwargs)
+
+def test__given_builtin_evaluator__when_cacheable__then_not_cacheable_by_default():
+    assert VariableEvaluator().cacheable() is False
+
+def test__given_cacheable_evaluator__when_evaluate_same_value__then_evaluator_called_once():
+    evaluator = CountingEvaluator()
+    cache = EvaluationCache()
+
+    first = cache.evaluate(evaluator, "a")
+    second = cache.evaluate(evaluator, "a")
+    other = cache.evaluate(evaluator, "b")
+
+    assert first == second == {"value": "a", "call": 1}
+    assert other == {"value": "b", "call": 2}
+    assert evaluator.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test__given_non_cacheable_evaluator__when_evaluate__then_always_calls_evaluator():
+    evaluator = CountingEvaluator(cacheable=False)
+    cache = EvaluationCache()
+
+    cache.evaluate(evaluator, "a")
+    cache.evaluate(evaluator, "a")
+
+    assert evaluator.calls == 2
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+def test__given_cached_mutable_result__when_caller_mutates__then_cache_is_unaffected():
+    evaluator = CountingEvaluator()
+    cache = EvaluationCache()
+
+    cache.evaluate(evaluator, "a")["value"] = "mutated"
+
+    assert cache.evaluate(evaluator, "a") == {"value": "a", "call": 1}
+
+def test__given_maxsize__when_more_results_than_maxsize__then_least_recently_used_evicted():
+    evaluator = CountingEvaluator()
+    cache = EvaluationCache(maxsize=2)
+
+    cache.evaluate(evaluator, "a")
+    cache.evaluate(evaluator, "b")
+    cache.evaluate(evaluator, "a") # 'b' is now least recently used
+    cache.evaluate(evaluator, "c")
+
+    assert len(cache) == 2
+    cache.evaluate(evaluator, "a")
+    assert evaluator.calls == 3
+    cache.evaluate(evaluator, "b")
+    assert evaluator.calls == 4
+
+def test__given_ttl__when_result_expires__then_reevaluated(monkeypatch: pytest.MonkeyPatch):
+    now = [100.0]
+    monkeypatch.setattr(evaluation_cache, "monotonic", lambda: now[0])
+    evaluator = CountingEvaluator()
+    cache = EvaluationCache(ttl=10)
+
+    cache.evaluate(evaluator, "a")
+    now[0] += 9.9
+    cache.evaluate(evaluator, "a")
+    assert evaluator.calls == 1
+
+    now[0] += 0.1
+    assert cache.evaluate(evaluator, "a") == {"value": "a", "call": 2}
+
+def test__given_evaluator_raises__when_evaluate__then_error_not_cached():
+    class FailingOnceEvaluator(CountingEvaluator):
+        def evaluate(self, value: str) -> Any:
+            result = super().evaluate(value)
+            if self.calls == 1:
+                raise RuntimeError("first call fails")
+            return result
+
+    evaluator = FailingOnceEvaluator()
+    cache = EvaluationCache()
+
+    with pytest.raises(RuntimeError):
+        cache.evaluate(evaluator, "a")
+    assert cache.evaluate(evaluator, "a") == {"value": "a", "call": 2}
+
+def test__given_cache__when_clear__then_results_forgotten():
+    evaluator = CountingEvaluator()
+    cache = EvaluationCache()
+
+    cache.evaluate(evaluator, "a")
+    cache.clear()
+    cache.evaluate(evaluator, "a")
+
+    assert len(cache) == 1
+    assert evaluator.calls == 2
+
+class AsyncCountingEvaluator(AbstractAsyncEvaluator):
+    def __init__(self):
+        self.calls = 0
+
+    def name(self) -> str:
+        return "acount"
+
+    def cacheable(self) -> bool:
+        return True
+
+    async def evaluate(self, value: str) -> Any:
+        self.calls += 1
+        return {"value": value, "call": self.calls}
+
+@pytest.mark.parametrize("evaluator", [AsyncCountingEvaluator(), CountingEvaluator()])
+def test__given_sync_or_async_evaluator__when_evaluate_async__then_result_is_cached(evaluator):
+    cache = EvaluationCache()
+
+    first = asyncio.run(cache.evaluate_async(evaluator, "a"))
+    first["value"] = "mutated"
+    second = asyncio.run(cache.evaluate_async(evaluator, "a"))
+
+    assert second == {"value": "a", "call": 1}
+    assert cache.evaluate(evaluator, "a") == second
+    assert evaluator.calls == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+class BatchEvaluator(CountingEvaluator):
+    def __init__(self, *, cacheable: bool=True, extra: int=0):
+        super().__init__(cacheable=cacheable)
+        self.batches = []
+        self._extra = extra
+
+    def evaluate_many(self, values):
+        self.batches.append(list(values))
+        return [self.evaluate(value) for value in values] + [None] * self._extra
+
+def test__given_batching_evaluator__when_evaluate_many__then_uncached_values_evaluated_in_one_batch():
+    evaluator = BatchEvaluator()
+    cache = EvaluationCache()
+    cache.evaluate(evaluator, "a")
+
+    results = cache.evaluate_many(evaluator, ["a", "b", "c", "b"])
+    results[1]["value"] = "mutated"
+
+    assert results == [
+        {"value": "a", "call": 1},
+        {"value": "mutated", "call": 2},
+        {"value": "c", "call": 3},
+        {"value": "b", "call": 2},
+    ]
+    assert evaluator.batches == [["b", "c"]]
+    assert cache.evaluate_many(evaluator, ["b"]) == [{"value": "b", "call": 2}]
+    assert evaluator.batches == [["b", "c"]]
+
+def test__given_non_cacheable_batching_evaluator__when_evaluate_many__then_every_value_evaluated():
+    evaluator = BatchEvaluator(cacheable=False)
+
+    EvaluationCache().evaluate_many(evaluator, ["a", "a"])
+
+    assert evaluator.batches == [["a", "a"]]
+
+def test__given_evaluator_without_evaluate_many__when_evaluate_many__then_evaluate_called_for_each_value():
+    evaluator = CountingEvaluator(cacheable=False)
+
+    assert AbstractEvaluator.evaluate_many(evaluator, ["a", "b"]) == [{"value": "a", "call": 1}, {"value": "b", "call": 2}]
+    assert EvaluationCache().evaluate_many(evaluator, ["c"]) == [{"value": "c", "call": 3}]
+    assert not evaluation_cache.batches(evaluator)
+    assert evaluation_cache.batches(BatchEvaluator())
+
+@pytest.mark.parametrize("cacheable", [True, False])
+def test__given_evaluate_many_with_wrong_result_count__when_evaluate_many__then_raises_value_error(cacheable):
+    with pytest.raises(ValueError):
+        EvaluationCache().evaluate_many(BatchEvaluator(cacheable=cacheable, extra=1), ["a"])
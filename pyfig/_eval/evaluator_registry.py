@@ -0,0 +1,70 @@
+from typing import Collection, Dict, Iterable, Iterator, List, Any
+
+from .abstract_evaluator import AbstractEvaluator
+
+
+class EvaluatorRegistry(Collection[AbstractEvaluator]):
+    """
+    An immutable collection of evaluators which is indexed by evaluator name.
+
+    It can be given anywhere a collection of evaluators is accepted. Building a registry up-front (e.g., once per
+    application) means names are only resolved and checked for duplicates once, instead of on every load.
+    """
+
+    def __init__(self, evaluators: Iterable[AbstractEvaluator]=()) -> None:
+        """
+        Args:
+            evaluators: the evaluators to index
+
+        Raises:
+            ValueError if multiple evaluators share the same name
+        """
+        self._evaluators: List[AbstractEvaluator] = list(evaluators)
+        self._by_name: Dict[str, AbstractEvaluator] = {}
+
+        for evaluator in self._evaluators:
+            name = evaluator.name()
+            if name in self._by_name:
+                raise ValueError(f"Multiple evaluators found for name: '{name}'")
+
+            self._by_name[name] = evaluator
+
+    @staticmethod
+    def of(evaluators: Collection[AbstractEvaluator]) -> "EvaluatorRegistry":
+        """
+        Returns `evaluators` if it is already a registry, otherwise indexes them into a new registry.
+        """
+        if isinstance(evaluators, EvaluatorRegistry):
+            return evaluators
+
+        return EvaluatorRegistry(evaluators)
+
+    def find(self, name: str) -> AbstractEvaluator:
+        """
+        Finds an evaluator by name.
+
+        Raises:
+            ValueError if no evaluator has the given name
+        """
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(f"No evaluator found for name: '{name}'") from None
+
+    def names(self) -> List[str]:
+        """
+        Returns the names of all registered evaluators, in registration order.
+        """
+        return list(self._by_name)
+
+    def __iter__(self) -> Iterator[AbstractEvaluator]:
+        return iter(self._evaluators)
+
+    def __len__(self) -> int:
+        return len(self._evaluators)
+
+    def __contains__(self, item: Any) -> bool:
+        return any(item is evaluator for evaluator in self._evaluators)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._evaluators!r})"
@@ -0,0 +1,48 @@
+from unittest.mock import Mock
+
+import pytest
+
+from .abstract_evaluator import AbstractEvaluator
+from .evaluator_registry import EvaluatorRegistry
+from .variable_evaluator import VariableEvaluator
+from .environment_evaluator import EnvironmentEvaluator
+
+
+def test__given_evaluators_with_same_name__when_build_registry__then_raises_value_error():
+    with pytest.raises(ValueError):
+        EvaluatorRegistry([VariableEvaluator(), VariableEvaluator()])
+
+def test__given_registry__when_find_missing_name__then_raises_value_error():
+    registry = EvaluatorRegistry([VariableEvaluator()])
+    with pytest.raises(ValueError):
+        registry.find("missing")
+
+def test__given_registry__when_find__then_returns_evaluator_without_calling_name_again():
+    mock_evaluator = Mock(spec=AbstractEvaluator)
+    mock_evaluator.name.return_value = "mock"
+    registry = EvaluatorRegistry([VariableEvaluator(), mock_evaluator])
+
+    for _ in range(10):
+        assert registry.find("mock") is mock_evaluator
+
+    mock_evaluator.name.assert_called_once_with()
+
+def test__given_registry__when_used_as_collection__then_behaves_like_the_evaluators():
+    var, env = VariableEvaluator(), EnvironmentEvaluator()
+    registry = EvaluatorRegistry([var, env])
+
+    assert len(registry) == 2
+    assert list(registry) == [var, env]
+    assert var in registry
+    assert VariableEvaluator() not in registry
+    assert registry.names() == ["var", "env"]
+
+def test__given_registry__when_of__then_returns_same_registry():
+    registry = EvaluatorRegistry([VariableEvaluator()])
+    assert EvaluatorRegistry.of(registry) is registry
+
+def test__given_list__when_of__then_returns_new_registry():
+    var = VariableEvaluator()
+    registry = EvaluatorRegistry.of([var])
+    assert isinstance(registry, EvaluatorRegistry)
+    assert registry.find("var") is var
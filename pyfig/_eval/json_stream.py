@@ -0,0 +1,206 @@
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+
+_WS = rb"[ \t\n\r]*"
+_STR = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+
+def _value_pattern(max_depth: int) -> bytes:
+    """
+    Builds a lenient pattern for any JSON value nested at most `max_depth` containers deep. Written in the
+    "normal* (special normal*)*" form so that the regex engine never backtracks exponentially.
+    """
+    normal = rb'[^"\[\]{}]*'
+    nested = normal + rb"(?:" + _STR + normal + rb")*"
+    for _ in range(max_depth - 1):
+        nested = normal + rb"(?:(?:" + _STR + rb"|[\[{]" + nested + rb"[\]}])" + normal + rb")*"
+    return _STR + rb"|[\[{]" + nested + rb"[\]}]|[-+.0-9A-Za-z]+"
+
+
+_VALUE = _value_pattern(max_depth=8)
+
+_WHITESPACE = re.compile(_WS)
+_STRING = re.compile(_STR, re.DOTALL)
+_ANY_VALUE = re.compile(_VALUE, re.DOTALL)
+_MEMBER = re.compile(
+    _WS + rb"(?P<name>" + _STR + rb")" + _WS + rb":" + _WS + rb"(?P<value>" + _VALUE + rb")" + _WS +
+    rb"(?P<delimiter>[,}])",
+    re.DOTALL
+)
+_ELEMENT = re.compile(_WS + rb"(?P<value>" + _VALUE + rb")" + _WS + rb"(?P<delimiter>[,\]])", re.DOTALL)
+
+_WINDOW = 64 * 1024
+"""
+The fast-path patterns are only matched within this many bytes, which bounds the regex engine's memory use.
+Larger (or more deeply nested) values are walked one child at a time instead.
+"""
+
+_Buffer = Union[bytes, mmap.mmap]
+
+
+def _error(message: str, pos: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(f"{message} at byte {pos}", "", 0)
+
+
+def _skip_whitespace(buf: _Buffer, pos: int) -> int:
+    return _WHITESPACE.match(buf, pos).end() # type: ignore # always matches
+
+
+def _expect(buf: _Buffer, pos: int, char: bytes) -> int:
+    """
+    Skips whitespace, then the expected character. Returns the position after it (and any whitespace).
+    """
+    pos = _skip_whitespace(buf, pos)
+    if buf[pos:pos + 1] != char:
+        raise _error(f"Expecting '{char.decode()}' delimiter", pos)
+    return _skip_whitespace(buf, pos + 1)
+
+
+def _children(buf: _Buffer, pos: int) -> Iterator[Tuple[Optional[bytes], int]]:
+    """
+    Iterates over the children of the container starting at `pos`.
+
+    Yields:
+        the raw (still quoted and escaped) member name, or None for array elements, and the position of the value
+
+    Returns:
+        the position immediately after the container
+    """
+    is_object = buf[pos:pos + 1] == b"{"
+    closing = b"}" if is_object else b"]"
+    fast = _MEMBER if is_object else _ELEMENT
+
+    pos = _skip_whitespace(buf, pos + 1)
+    if buf[pos:pos + 1] == closing:
+        return pos + 1
+
+    while True:
+        child = fast.match(buf, pos, pos + _WINDOW)
+        if child is not None:
+            yield (child.group("name") if is_object else None), child.start("value")
+            delimiter = child.group("delimiter")
+            pos = child.end()
+
+        else:
+            # slow path for large, deeply nested, or malformed children
+            pos = _skip_whitespace(buf, pos)
+            name = None
+            if is_object:
+                name_match = _STRING.match(buf, pos)
+                if name_match is None:
+                    raise _error("Expecting property name enclosed in double quotes", pos)
+                name = name_match.group()
+                pos = _expect(buf, name_match.end(), b":")
+
+            yield name, pos
+            pos = _skip_whitespace(buf, _skip_value(buf, pos))
+            delimiter = buf[pos:pos + 1]
+            if delimiter not in (b",", closing):
+                raise _error("Expecting ',' delimiter", pos)
+            pos += 1
+
+        if delimiter == closing:
+            return pos
+
+
+def _skip_value(buf: _Buffer, pos: int) -> int:
+    """
+    Skips over the value starting at `pos`. Returns the position immediately after it.
+    """
+    value = _ANY_VALUE.match(buf, pos, pos + _WINDOW)
+    if value is not None:
+        return value.end()
+
+    first = buf[pos:pos + 1]
+
+    if first in (b"{", b"["):
+        children = _children(buf, pos)
+        while True:
+            try:
+                next(children)
+            except StopIteration as stop:
+                return stop.value
+
+    if first == b'"':
+        string = _STRING.match(buf, pos)
+        if string is None:
+            raise _error("Unterminated string", pos)
+        return string.end()
+
+    raise _error("Expecting value", pos)
+
+
+def _find_member(buf: _Buffer, pos: int, key: str) -> int:
+    """
+    Finds the value of `key` in the object starting at `pos`. Returns the position of the value.
+    """
+    quoted = json.dumps(key, ensure_ascii=False).encode("utf-8")
+
+    for name, value in _children(buf, pos):
+        if name == quoted or (name is not None and b"\\" in name and json.loads(name) == key):
+            return value
+
+    raise KeyError(key)
+
+
+def _find_element(buf: _Buffer, pos: int, index: int) -> int:
+    """
+    Finds the element at `index` in the array starting at `pos`. Returns the position of the element.
+    """
+    if index < 0:
+        index += sum(1 for _ in _children(buf, pos))
+
+    if index >= 0:
+        for i, (_, value) in enumerate(_children(buf, pos)):
+            if i == index:
+                return value
+
+    raise IndexError("list index out of range")
+
+
+def extract_value(buf: _Buffer, accessor: List[str]) -> Any:
+    """
+    Extracts the value at the `accessor` path (object keys and array indices) of the JSON document in `buf`.
+
+    Raises:
+        KeyError, IndexError, or json.JSONDecodeError in the same circumstances as indexing a fully parsed document
+    """
+    pos = _skip_whitespace(buf, 3 if buf[:3] == b"\xef\xbb\xbf" else 0)
+
+    for key in accessor:
+        first = buf[pos:pos + 1]
+        if first == b"{":
+            pos = _find_member(buf, pos, key)
+        elif first == b"[":
+            try:
+                index = int(key)
+            except ValueError as exc:
+                raise KeyError("Array index cannot be referenced by a string") from exc
+            pos = _find_element(buf, pos, index)
+        else:
+            # validates the value before complaining about it being indexed, like a full parse would
+            json.loads(buf[pos:_skip_value(buf, pos)])
+            raise KeyError("Unknown json data type. Expected dict or list.")
+
+    return json.loads(buf[pos:_skip_value(buf, pos)])
+
+
+def stream_json_value(path: Path, accessor: List[str]) -> Any:
+    """
+    Extracts the value at the `accessor` path of the JSON file at `path`, without parsing the entire document.
+
+    The file is memory-mapped and scanned with regular expressions, so skipped regions are never materialized as
+    Python objects, and memory use is bounded by the size of the extracted value. Only the extracted value is fully
+    validated: skipped regions are only loosely checked, content after the extracted value isn't read, and the first
+    of any duplicated object keys is used.
+    """
+    with path.open("rb") as file:
+        if path.stat().st_size == 0:
+            raise _error("Expecting value", 0)
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return extract_value(buf, accessor)
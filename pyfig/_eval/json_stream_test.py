@@ -0,0 +1,107 @@
+import json
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from . import json_stream
+from .json_stream import extract_value, stream_json_value
+
+
+_DOCUMENT = json.dumps({
+    "key": "value",
+    "tricky": "brackets } ] { [ and \"quotes\" \\ inside",
+    "escaped\"key": 1,
+    "unicode": "café 🚀",
+    "other": {
+        "data": [1, {"deeply": "nested"}, 3, [], {}],
+        "numbers": [-1.5e3, 0, 2.5, True, False, None],
+    },
+    "last": [[1, 2], [3, [4, 5]]],
+}, indent=2).encode("utf-8")
+
+
+@pytest.mark.parametrize("accessor", [
+    "key",
+    "tricky",
+    "escaped\"key",
+    "unicode",
+    "other",
+    "other.data",
+    "other.data.0",
+    "other.data.1",
+    "other.data.1.deeply",
+    "other.data.3",
+    "other.data.-1",
+    "other.data.-5",
+    "other.numbers.0",
+    "other.numbers.3",
+    "other.numbers.5",
+    "last.1.1.0",
+])
+@pytest.mark.parametrize("window", [1024 * 1024, 8])
+def test__given_accessor__when_extract_value__then_same_as_full_parse(
+        accessor: str, window: int, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(json_stream, "_WINDOW", window) # small windows force the slow path
+    expected: Any = json.loads(_DOCUMENT)
+    for key in accessor.split("."):
+        expected = expected[int(key) if isinstance(expected, list) else key]
+
+    assert extract_value(_DOCUMENT, accessor.split(".")) == expected
+
+@pytest.mark.parametrize("accessor,error", [
+    ("missing", KeyError),
+    ("key.not_recursive", KeyError),
+    ("other.data.its_an_array", KeyError),
+    ("other.data.5", IndexError),
+    ("other.data.-6", IndexError),
+    ("other.data.3.0", IndexError),
+    ("other.data.4.missing", KeyError),
+])
+@pytest.mark.parametrize("window", [1024 * 1024, 8])
+def test__given_bad_accessor__when_extract_value__then_raises_like_full_parse(
+        accessor: str, error: type, window: int, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(json_stream, "_WINDOW", window)
+    with pytest.raises(error):
+        extract_value(_DOCUMENT, accessor.split("."))
+
+@pytest.mark.parametrize("document", [
+    b"",
+    b"badjson: missing quotes",
+    b'{ "a": 1 "key": 2 }',
+    b'{ "a": [1, 2 }',
+    b'{ "a": "unterminated }',
+    b'{ key: 1 }',
+    b'{ "key" 1 }',
+    b'{ "key": tru }',
+])
+@pytest.mark.parametrize("window", [1024 * 1024, 8])
+def test__given_malformed_json__when_extract_value__then_raises_json_decode_error(
+        document: bytes, window: int, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(json_stream, "_WINDOW", window)
+    with pytest.raises(JSONDecodeError):
+        extract_value(document, ["key"])
+
+def test__given_deeply_nested_document__when_extract_value__then_skips_and_extracts():
+    deep: Any = "bottom"
+    for _ in range(20):
+        deep = {"a": [deep]}
+    document = json.dumps({"skipped": deep, "kept": deep}).encode("utf-8")
+
+    assert extract_value(document, ["kept"]) == deep
+    assert extract_value(document, ["kept", "a", "0", "a"]) == deep["a"][0]["a"]
+
+def test__given_utf8_bom__when_extract_value__then_skips_bom():
+    assert extract_value(b'\xef\xbb\xbf{ "key": "value" }', ["key"]) == "value"
+
+def test__given_file__when_stream_json_value__then_extracts_from_memory_map(pytestdir: Path):
+    path = pytestdir / "doc.json"
+    path.write_bytes(_DOCUMENT)
+    assert stream_json_value(path, ["other", "data", "1"]) == {"deeply": "nested"}
+
+def test__given_empty_file__when_stream_json_value__then_raises_json_decode_error(pytestdir: Path):
+    path = pytestdir / "empty.json"
+    path.touch()
+    with pytest.raises(JSONDecodeError):
+        stream_json_value(path, ["key"])
@@ -1,8 +1,20 @@
-import json
+from copy import deepcopy
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
+from .._parsers import get_parser_backend
 from .abstract_evaluator import AbstractEvaluator
+from .dependencies import record_file_read
+from .document_cache import DocumentCache
+from .json_stream import stream_json_value
+
+
+_STREAMED = object()
+""" marks a file which is too large to parse, so each field is streamed from it instead """
+
+
+def _parse_json(path: Path) -> Any:
+    return get_parser_backend("json").loads(path.read_bytes())
 
 
 class JSONFileEvaluator(AbstractEvaluator):
@@ -12,31 +24,91 @@ class JSONFileEvaluator(AbstractEvaluator):
     Syntax: "${{jsonfile.access.path.to.field:/path/to/file.json}}"
     """
 
+    def __init__(
+        self, *,
+        document_cache: Union[DocumentCache, Literal["private", "shared"], None]="private",
+        stream_above: Optional[int]=None
+    ) -> None:
+        """
+        Args:
+            document_cache: where parsed files are kept between templates. "private" to this evaluator, "shared"
+                            process-wide (reused across evaluators and loads), a specific `DocumentCache`, or None
+                            to parse the file for every template
+            stream_above:   files larger than this many bytes are never fully parsed (nor cached). Instead, only the
+                            requested field is extracted by scanning the memory-mapped file. None to always parse
+        """
+        self._documents = DocumentCache.resolve(document_cache)
+        self._stream_above = stream_above
+
     def name(self) -> str:
         return "jsonfile"
 
+    def cacheable(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[str]:
+        return ""
+
     def evaluate(self, value: str) -> Any:
-        colon = value.rfind(":")
-        if colon == -1:
-            raise ValueError("Invalid syntax for JSON file evaluator. Should follow '<access.path>.</disk/path.json>'")
-
-        accessor = value[:colon]
-        diskpath = value[colon + 1:]
-
-        with Path(diskpath).open("rb") as jsonfile:
-            jsondata = json.load(jsonfile)
-
-        for key in accessor.split("."):
-            if isinstance(jsondata, list):
-                try:
-                    key = int(key)
-                except ValueError as exc:
-                    raise KeyError("Array index cannot be referenced by a string") from exc
-
-                jsondata = jsondata[key]
-            elif isinstance(jsondata, dict):
-                jsondata = jsondata[key]
+        return self._evaluate_values([value])[0]
+
+    def evaluate_many(self, values: Sequence[str]) -> List[Any]:
+        """
+        Evaluates several values, reading (or looking up) each file once for all of the fields read from it.
+        """
+        return self._evaluate_values(values)
+
+    def _evaluate_values(self, values: Sequence[str]) -> List[Any]:
+        targets = [_split(value) for value in values]
+        documents: Dict[Path, Any] = {}
+        results = []
+
+        for accessor, diskpath in targets:
+            if diskpath not in documents:
+                record_file_read(diskpath)
+                if self._stream_above is not None and diskpath.stat().st_size > self._stream_above:
+                    documents[diskpath] = _STREAMED
+                elif self._documents is None:
+                    documents[diskpath] = _parse_json(diskpath)
+                else:
+                    documents[diskpath] = self._documents.load(diskpath, "json", _parse_json)
+
+            document = documents[diskpath]
+            if document is _STREAMED:
+                results.append(stream_json_value(diskpath, accessor.split(".")))
             else:
-                raise KeyError("Unknown json data type. Expected dict or list.")
+                # the parsed document may be shared, so the caller gets their own copy to modify
+                results.append(deepcopy(_access(document, accessor)))
+
+        return results
+
+
+def _split(value: str) -> Tuple[str, Path]:
+    """
+    Splits a value into its accessor and the path of its file.
+    """
+    colon = value.rfind(":")
+    if colon == -1:
+        raise ValueError("Invalid syntax for JSON file evaluator. Should follow '<access.path>.</disk/path.json>'")
+
+    return value[:colon], Path(value[colon + 1:])
+
+
+def _access(jsondata: Any, accessor: str) -> Any:
+    """
+    Reads the field at the (dot-separated) accessor of a parsed document.
+    """
+    for key in accessor.split("."):
+        if isinstance(jsondata, list):
+            try:
+                key = int(key)
+            except ValueError as exc:
+                raise KeyError("Array index cannot be referenced by a string") from exc
+
+            jsondata = jsondata[key]
+        elif isinstance(jsondata, dict):
+            jsondata = jsondata[key]
+        else:
+            raise KeyError("Unknown json data type. Expected dict or list.")
 
-        return jsondata
+    return jsondata
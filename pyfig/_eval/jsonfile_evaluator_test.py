@@ -1,9 +1,12 @@
+import json
 from json import JSONDecodeError
 from pathlib import Path
 from typing import Any
 
 import pytest
 
+from . import jsonfile_evaluator
+from .document_cache import DocumentCache
 from .jsonfile_evaluator import JSONFileEvaluator
 
 
@@ -67,3 +70,67 @@ def test__given_valid_json__when_json_evaluated__then_extracts_properly(accessor
     }''')
 
     assert JSONFileEvaluator().evaluate(f"{accessor}:{path.as_posix()}") == expected
+
+def test__given_many_templates_for_same_file__when_json_evaluated__then_file_parsed_once(pytestdir: Path):
+    path = pytestdir / "cached.json"
+    path.write_text('{ "a": { "list": [1, 2] }, "b": 2 }')
+    cache = DocumentCache()
+    evaluator = JSONFileEvaluator(document_cache=cache)
+
+    first = evaluator.evaluate(f"a:{path.as_posix()}")
+    first["list"].append(3)
+
+    assert evaluator.evaluate(f"a:{path.as_posix()}") == { "list": [1, 2] }
+    assert evaluator.evaluate(f"b:{path.as_posix()}") == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test__given_file_changes__when_json_evaluated_again__then_reads_new_content(pytestdir: Path):
+    path = pytestdir / "changing.json"
+    path.write_text('{ "key": "old" }')
+    evaluator = JSONFileEvaluator()
+    assert evaluator.evaluate(f"key:{path.as_posix()}") == "old"
+
+    path.write_text('{ "key": "newer" }')
+    assert evaluator.evaluate(f"key:{path.as_posix()}") == "newer"
+
+def test__given_no_document_cache__when_json_evaluated__then_still_extracts(pytestdir: Path):
+    path = pytestdir / "uncached.json"
+    path.write_text('{ "key": "value" }')
+    assert JSONFileEvaluator(document_cache=None).evaluate(f"key:{path.as_posix()}") == "value"
+
+def test__given_file_above_stream_threshold__when_json_evaluated__then_extracted_without_full_parse(pytestdir: Path):
+    path = pytestdir / "large.json"
+    path.write_text('{ "skipped": [1, 2, 3], "key": { "value": [true] } }')
+    cache = DocumentCache()
+    evaluator = JSONFileEvaluator(document_cache=cache, stream_above=10)
+
+    assert evaluator.evaluate(f"key.value.0:{path.as_posix()}") is True
+    with pytest.raises(KeyError):
+        evaluator.evaluate(f"missing:{path.as_posix()}")
+    assert len(cache) == 0
+
+def test__given_file_below_stream_threshold__when_json_evaluated__then_parsed_and_cached(pytestdir: Path):
+    path = pytestdir / "small.json"
+    path.write_text('{ "key": "value" }')
+    cache = DocumentCache()
+    evaluator = JSONFileEvaluator(document_cache=cache, stream_above=1024)
+
+    assert evaluator.evaluate(f"key:{path.as_posix()}") == "value"
+    assert len(cache) == 1
+
+@pytest.mark.parametrize("document_cache", [None, "private"])
+def test__given_many_values__when_json_evaluate_many__then_each_file_read_once(document_cache, pytestdir: Path,
+                                                                              monkeypatch: pytest.MonkeyPatch):
+    first, second = pytestdir / "first.json", pytestdir / "second.json"
+    first.write_text('{ "a": { "list": [1, 2] }, "b": 2 }')
+    second.write_text('[10, 20]')
+    parsed = []
+    monkeypatch.setattr(jsonfile_evaluator, "_parse_json", lambda path: parsed.append(path) or json.loads(path.read_bytes()))
+
+    evaluator = JSONFileEvaluator(document_cache=document_cache)
+    values = [f"a:{first.as_posix()}", f"1:{second.as_posix()}", f"b:{first.as_posix()}", f"a:{first.as_posix()}"]
+    results = evaluator.evaluate_many(values)
+
+    assert results == [{ "list": [1, 2] }, 20, 2, { "list": [1, 2] }]
+    assert results[0] is not results[3]
+    assert parsed == [first, second]
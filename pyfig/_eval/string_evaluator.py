@@ -1,6 +1,6 @@
 import re
 import ast
-from typing import Any
+from typing import Any, Optional
 
 from .abstract_evaluator import AbstractEvaluator
 
@@ -18,6 +18,12 @@ class StringEvaluator(AbstractEvaluator):
     def name(self) -> str:
         return "str"
 
+    def cacheable(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[str]:
+        return ""
+
     def evaluate(self, value: str) -> Any:
         patmatch = self._pattern.search(value)
         if patmatch is None:
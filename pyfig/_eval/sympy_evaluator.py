@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from .abstract_evaluator import AbstractEvaluator
 
@@ -22,6 +22,12 @@ class SympyEvaluator(AbstractEvaluator):
     def name(self) -> str:
         return "sympy"
 
+    def cacheable(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[str]:
+        return self._sympy.__version__
+
     def evaluate(self, value: str) -> Any:
         evaluated_float = self._sympy.sympify(value).evalf()
         if "." not in value:
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from .abstract_evaluator import AbstractEvaluator
 
@@ -15,5 +15,8 @@ class VariableEvaluator(AbstractEvaluator):
     def name(self) -> str:
         return "var"
 
+    def fingerprint(self) -> Optional[str]:
+        return repr(sorted(self._variables.items()))
+
     def evaluate(self, value: str) -> Any:
         return self._variables[value]
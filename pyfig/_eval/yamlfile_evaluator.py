@@ -1,7 +1,15 @@
+from copy import deepcopy
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal, Optional, Union
 
+from .._parsers import get_parser_backend
 from .abstract_evaluator import AbstractEvaluator
+from .dependencies import record_file_read
+from .document_cache import DocumentCache
+
+
+def _parse_yaml(path: Path) -> Any:
+    return get_parser_backend("yaml").loads(path.read_bytes())
 
 
 class YamlFileEvaluator(AbstractEvaluator):
@@ -11,27 +19,42 @@ class YamlFileEvaluator(AbstractEvaluator):
     Syntax: "${{pyyaml.access.path.to.field:/path/to/file.yaml}}"
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, document_cache: Union[DocumentCache, Literal["private", "shared"], None]="private") -> None:
+        """
+        Args:
+            document_cache: where parsed files are kept between templates. "private" to this evaluator, "shared"
+                            process-wide (reused across evaluators and loads), a specific `DocumentCache`, or None
+                            to parse the file for every template
+        """
         try:
-            import yaml
+            get_parser_backend("yaml")
         except ImportError as exc:
             raise ImportError("The pyyaml module is required to use the pyyaml evaluator") from exc
 
-        self._yaml = yaml
+        self._documents = DocumentCache.resolve(document_cache)
 
     def name(self) -> str:
         return "pyyaml"
 
+    def cacheable(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[str]:
+        return ""
+
     def evaluate(self, value: str) -> Any:
         colon = value.rfind(":")
         if colon == -1:
             raise ValueError("Invalid syntax for yaml file evaluator. Should follow '<access.path>.</disk/path.yaml>'")
 
         accessor = value[:colon]
-        diskpath = value[colon + 1:]
+        diskpath = Path(value[colon + 1:])
+        record_file_read(diskpath)
 
-        with Path(diskpath).open("rb") as file:
-            yamldata = self._yaml.safe_load(file)
+        if self._documents is None:
+            yamldata = _parse_yaml(diskpath)
+        else:
+            yamldata = self._documents.load(diskpath, "yaml", _parse_yaml)
 
         for key in accessor.split("."):
             if isinstance(yamldata, list):
@@ -46,4 +69,5 @@ class YamlFileEvaluator(AbstractEvaluator):
             else:
                 raise KeyError("Unknown json data type. Expected dict or list.")
 
-        return yamldata
+        # the parsed document may be shared, so the caller gets their own copy to modify
+        return deepcopy(yamldata)
@@ -5,6 +5,7 @@ from textwrap import dedent
 import yaml
 import pytest
 
+from .document_cache import DocumentCache
 from .yamlfile_evaluator import YamlFileEvaluator
 
 
@@ -73,3 +74,18 @@ def test__given_valid_yaml__when_yaml_evaluated__then_extracts_properly(accessor
     """))
 
     assert YamlFileEvaluator().evaluate(f"{accessor}:{path.as_posix()}") == expected
+
+def test__given_shared_document_cache__when_yaml_evaluated_by_many_evaluators__then_file_parsed_once(pytestdir: Path):
+    path = pytestdir / "shared.yaml"
+    path.write_text("a:\n  b: [1, 2]\n")
+    cache = DocumentCache()
+
+    for _ in range(3):
+        assert YamlFileEvaluator(document_cache=cache).evaluate(f"a.b:{path.as_posix()}") == [1, 2]
+
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test__given_no_document_cache__when_yaml_evaluated__then_still_extracts(pytestdir: Path):
+    path = pytestdir / "uncached.yaml"
+    path.write_text("key: value\n")
+    assert YamlFileEvaluator(document_cache=None).evaluate(f"key:{path.as_posix()}") == "value"
@@ -1,7 +1,15 @@
+import asyncio
+import contextvars
 import re
-from typing import Any, Optional, Collection, Union
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, NamedTuple, Optional, Sequence, Union, List, Tuple
 
-from ._eval import AbstractEvaluator
+from ._eval import AbstractAsyncEvaluator, AbstractEvaluator, EvaluationCache, EvaluatorRegistry
+from ._eval import evaluation_cache
+from ._eval.evaluation_cache import _copy
+from ._template_scanner import ParsedString as _ParsedString, parse_templates
 
 
 def _find_evaluator(name: str, evaluators: Collection[AbstractEvaluator]) -> AbstractEvaluator:
@@ -10,7 +18,7 @@ def _find_evaluator(name: str, evaluators: Collection[AbstractEvaluator]) -> Abs
 
     Args:
         name:       the name of the evaluator to find
-        evaluators: the collection of evaluators to search through
+        evaluators: the collection of evaluators to search through (ideally, an `EvaluatorRegistry`)
 
     Returns:
         The evaluator with the given name.
@@ -18,19 +26,7 @@ def _find_evaluator(name: str, evaluators: Collection[AbstractEvaluator]) -> Abs
     Raises:
         ValueError if no evaluator is found or if multiple evaluators are found with the same name.
     """
-    candidate: Optional[AbstractEvaluator] = None
-
-    for evaluator in evaluators:
-        if evaluator.name() == name:
-            if candidate is not None:
-                raise ValueError(f"Multiple evaluators found for name: '{name}'")
-
-            candidate = evaluator
-
-    if candidate is None:
-        raise ValueError(f"No evaluator found for name: '{name}'")
-    else:
-        return candidate
+    return EvaluatorRegistry.of(evaluators).find(name)
 
 
 #
@@ -97,41 +93,298 @@ E.g.,
     "some ${{eval.val}} string" -> { "evaluator": "eval", "value": "val" }
 
 Note: if escaped - i.e., \\${{...}} - then there is no match.
+
+This is the reference grammar of templates: `_parse_string` accepts exactly the same templates, but it doesn't use this
+pattern, since its backtracking takes exponential time on some values (e.g., a long run of backslashes).
 """
 
 
-def _evaluate_string(string: str, evaluators: Collection[AbstractEvaluator]) -> Any:
+def _parse_string(string: str) -> _ParsedString:
+    """
+    Finds the templates of a string (see: `parse_templates`).
+    """
+    return parse_templates(string)
+
+
+def _substitute(parsed: _ParsedString, results: Sequence[Any]) -> Any:
+    """
+    Replaces the templates of a parsed string with their evaluations.
+
+    Returns:
+        the evaluation itself if the entire string is a template, otherwise the string with each template replaced
+    """
+    if parsed.whole:
+        return results[0]
+
+    parts = [parsed.literals[0]]
+    for result, literal in zip(results, parsed.literals[1:]):
+        parts.append(str(result))
+        parts.append(literal)
+    return "".join(parts)
+
+
+def _evaluate_string(
+    string: str,
+    evaluators: Collection[AbstractEvaluator],
+    cache: Optional[EvaluationCache]=None
+) -> Any:
     """
-    Given a string, evaluates all templates in the string using the provided evaluators.
+    Given a string, evaluates all templates in the string using the provided evaluators (once, i.e., the templates
+    produced by the evaluations are kept as they are).
+
+    Note: `evaluate_conf` doesn't use this, since it evaluates all of the templates of a config in rounds. This is kept
+    as a helper for the tests, and for the previous implementation in `benchmarks/evaluate_conf_bench.py`.
 
     Args:
         string:      the string to evaluate
         evaluators:  the collection of evaluators to use
+        cache:       if given, memoizes the results of cacheable evaluators
 
     Returns:
         the modified string with all templates evaluated
         if the template is the entire string, then the type of the evaluator's return value is kept
+
+    Raises:
+        TypeError if an evaluator is async
+    """
+    evaluators = EvaluatorRegistry.of(evaluators)
+    parsed = _parse_string(string)
+    if not parsed.templates:
+        return string
+
+    results = []
+    for template in parsed.templates:
+        evaluator = _find_evaluator(template.evaluator, evaluators)
+        if isinstance(evaluator, AbstractAsyncEvaluator):
+            raise TypeError(f"Evaluator '{evaluator.name()}' is async. Use evaluate_conf_async instead")
+        value = template.value
+        results.append(evaluator.evaluate(value) if cache is None else cache.evaluate(evaluator, value))
+
+    return _substitute(parsed, results)
+
+
+def _template_text(evaluator: str, value: str) -> str:
+    """
+    Returns the text of a template, e.g., `${{var.name}}`.
+    """
+    return f"${{{{{evaluator}.{value}}}}}" if value else f"${{{{{evaluator}}}}}"
+
+
+class EvaluationError(Exception):
+    """
+    Raised when several evaluations (of the same round) failed. See: the `executor` of `evaluate_conf`.
+    """
+
+    def __init__(self, errors: List[Tuple[str, Exception]]):
+        """
+        Args:
+            errors: each template which failed, and its error (in document order). When a batch of templates (see:
+                    `AbstractEvaluator.evaluate_many`) failed, but none of them fails on its own, the batch is listed
+                    once under the evaluator's name
+        """
+        self.errors = errors
+        """ each template (or failed batch) and its error (in document order) """
+
+        details = "".join(f"\n  {template}: {type(error).__name__}: {error}" for template, error in errors)
+        super().__init__(f"{len(errors)} template(s) failed to evaluate:{details}")
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.errors,)
+
+
+@dataclass(frozen=True)
+class EvaluationLimits:
+    """
+    Bounds how far the evaluation of templates may go, so that evaluators which keep producing templates (e.g., a
+    `VariableEvaluator` whose variables refer to each other) fail with an `EvaluationLimitError` rather than looping
+    forever.
+
+    Each leaf of the config has a chain: the strings it was evaluated through, e.g., `${{var.a}}` -> `${{var.b}}`. The
+    templates within a subtree that an evaluation produced continue the chain of the leaf it replaced. A chain which
+    repeats a string is a cycle, and raises a `TemplateCycleError` regardless of these limits.
+    """
+
+    max_depth: Optional[int] = 64
+    """ the maximum length of a chain, or None for no limit """
+
+    max_evaluations: Optional[int] = None
+    """ the maximum number of evaluations (i.e., evaluator calls, excluding cache hits within a round) """
+
+    timeout: Optional[float] = None
+    """ the maximum number of seconds to spend evaluating (checked between rounds, so an evaluation isn't cut short) """
+
+
+class EvaluationLimitError(Exception):
+    """
+    Raised when the evaluation of templates exceeds one of its `EvaluationLimits`.
+    """
+
+    def __init__(self, reason: str, chain: Sequence[str]):
+        """
+        Args:
+            reason: the limit which was exceeded
+            chain:  the strings that a leaf was evaluated through, in order
+        """
+        self.reason = reason
+        """ the limit which was exceeded """
+
+        self.chain = list(chain)
+        """ the strings that a leaf was evaluated through (in order), e.g., `["${{var.a}}", "${{var.b}}"]` """
+
+        lines = [f"{'-> ' if index else ''}{_shortened(value)}" for index, value in enumerate(chain)]
+        if len(lines) > 12:
+            lines[4:-6] = [f"... ({len(lines) - 10} more)"]
+        details = "".join(f"\n  {line}" for line in lines)
+        super().__init__(f"{reason}. The chain of templates:{details}")
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.reason, self.chain)
+
+
+class TemplateCycleError(EvaluationLimitError):
+    """
+    Raised when a template evaluates (perhaps through other templates) back to itself. The chain ends with the
+    repeated string.
+    """
+
+
+def _shortened(value: str, length: int=100) -> str:
     """
-    # if the entire string is a template, evaluate it and keep the type
-    if full_match := _TEMPLATE_PATTERN.fullmatch(string):
-        evaluator = _find_evaluator(full_match.group("evaluator"), evaluators)
-        return evaluator.evaluate(full_match.group("value") or "")
+    Returns the repr of a string, truncated to about `length` characters.
+    """
+    return repr(value) if len(value) <= length else repr(value[:length - 3]) + "..."
+
+
+class _Budget:
+    """
+    Enforces the `EvaluationLimits` of one evaluation.
+    """
+
+    def __init__(self, limits: Optional[EvaluationLimits]):
+        self.limits = EvaluationLimits() if limits is None else limits
+        self.evaluations = 0
+        self.deadline = None if self.limits.timeout is None else time.monotonic() + self.limits.timeout
+
+    def check_chain(self, chain: Tuple[str, ...]) -> None:
+        """
+        Checks the chain of a leaf which is about to be evaluated (ending with its current string).
+
+        Raises:
+            TemplateCycleError if the chain repeats a string
+            EvaluationLimitError if the chain is too long
+        """
+        if chain[-1] in chain[:-1]:
+            raise TemplateCycleError("A template evaluated back to itself", chain)
+
+        max_depth = self.limits.max_depth
+        if max_depth is not None and len(chain) > max_depth:
+            raise EvaluationLimitError(f"A template was evaluated more than max_depth={max_depth} times deep", chain)
+
+    def spend(self, pending: List["_Pending"], evaluations: int) -> None:
+        """
+        Checks that a round (of `pending`) with this many evaluations may start.
+
+        Raises:
+            EvaluationLimitError if the evaluations or the time are exhausted, with the longest chain of the round
+        """
+        self.evaluations += evaluations
+
+        max_evaluations = self.limits.max_evaluations
+        if max_evaluations is not None and self.evaluations > max_evaluations:
+            raise EvaluationLimitError(
+                f"More than max_evaluations={max_evaluations} evaluations were needed", _longest_chain(pending)
+            )
+
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise EvaluationLimitError(
+                f"Evaluation took longer than timeout={self.limits.timeout} seconds", _longest_chain(pending)
+            )
+
+
+def _longest_chain(pending: List["_Pending"]) -> Tuple[str, ...]:
+    """
+    Returns the longest chain of a round (the first, if several are equally long).
+    """
+    return max((entry.chain for entry in pending), key=len, default=())
+
+
+def _has_template(string: str) -> bool:
+    """
+    Checks whether a string contains at least one (unescaped) template.
+    """
+    return "${{" in string and bool(parse_templates(string).templates)
 
-    def replace_substring(patmatch: re.Match) -> str:
-        evaluator = _find_evaluator(patmatch.group("evaluator"), evaluators)
-        value = patmatch.group("value") or ""
-        replacement = str(evaluator.evaluate(value))
-        return patmatch.group("nonesc") + replacement
 
-    # otherwise, replace only the relevant substring(s)
-    return re.sub(
-        _TEMPLATE_PATTERN,
-        replace_substring,
-        string
-    )
+_Location = Tuple[Union[list, dict], Any]
+"""
+The container and key (or index) at which a template-bearing string is stored.
+"""
 
 
-def evaluate_conf(conf: Union[list, dict], evaluators: Collection[AbstractEvaluator]) -> None:
+def _find_templates(conf: Union[list, dict], found: List[_Location]) -> List[_Location]:
+    """
+    Recursively searches `conf` for strings containing templates, in document order.
+
+    Args:
+        conf:   the configuration to search
+        found:  the list that discovered locations are appended to
+
+    Returns:
+        `found`, for convenience
+    """
+    items = conf.items() if isinstance(conf, dict) else enumerate(conf)
+
+    for key, value in items:
+        if isinstance(value, str):
+            if _has_template(value):
+                found.append((conf, key))
+
+        elif isinstance(value, (dict, list)):
+            _find_templates(value, found)
+
+    return found
+
+
+def _find_templates_copy_on_write(conf: Union[list, dict], found: List[_Location]) -> Union[list, dict]:
+    """
+    Like `_find_templates`, but `conf` is never modified: each container on the way to a template is shallow-copied,
+    and the locations found are within the copies. Everything else is shared with `conf`.
+
+    Args:
+        conf:   the configuration to search
+        found:  the list that discovered locations are appended to
+
+    Returns:
+        `conf` itself if it contains no templates, otherwise its copy
+    """
+    items = conf.items() if isinstance(conf, dict) else enumerate(conf)
+    copy: Any = None
+
+    for key, value in items:
+        if isinstance(value, str):
+            if _has_template(value):
+                if copy is None:
+                    copy = dict(conf) if isinstance(conf, dict) else list(conf)
+                found.append((copy, key))
+
+        elif isinstance(value, (dict, list)):
+            new = _find_templates_copy_on_write(value, found)
+            if new is not value:
+                if copy is None:
+                    copy = dict(conf) if isinstance(conf, dict) else list(conf)
+                copy[key] = new
+
+    return conf if copy is None else copy
+
+
+def evaluate_conf(
+    conf: Union[list, dict],
+    evaluators: Collection[AbstractEvaluator],
+    *,
+    cache: Optional[EvaluationCache]=None,
+    executor: Union[Executor, bool, None]=None,
+    limits: Optional[EvaluationLimits]=None
+) -> None:
     """
     Recursively evaluates all (present+future) templates in `conf` using the provided `evaluators`
 
@@ -139,39 +392,431 @@ def evaluate_conf(conf: Union[list, dict], evaluators: Collection[AbstractEvalua
     `${{evaluator.value}}` are replaced with the evaluator's evaluation. This is done repeatedly
     until no more templates exist, which means templates can exist within templates.
 
+    The tree is only searched once. Afterwards, only the strings whose evaluation still contains a template (or
+    the subtrees an evaluation produced) are revisited. The templates are evaluated in rounds: each evaluator is given
+    all of its templates of a round in one `evaluate_many` call, and then the next round evaluates the templates
+    which those evaluations produced.
+
     Args:
         conf:        the configuration to search and evaluate templates
         evaluators:  the collection of evaluators to use (i.e., how to evaluate the templates)
+        cache:       memoizes the results of cacheable evaluators. Pass a shared `EvaluationCache` to reuse results
+                     across loads. By default, results are only cached for the duration of this call
+        executor:    if given, the evaluators' batches of each round are evaluated concurrently by this (thread pool)
+                     executor. Pass True to use a `ThreadPoolExecutor` for the duration of this call. The evaluators
+                     must then be thread-safe
+        limits:      bounds the evaluation (see: `EvaluationLimits`). By default, chains of templates are limited to a
+                     depth of 64
 
     Returns:
         None (conf is modified in-place)
+
+    Raises:
+        ValueError if multiple evaluators share a name, or if a template names an evaluator that isn't given
+        EvaluationError (with an executor) listing every template of the round whose evaluation failed
+        EvaluationLimitError if a template evaluates back to itself (`TemplateCycleError`), or a limit is exceeded
     """
-    changes = 1
+    if not isinstance(conf, (dict, list)):
+        raise TypeError(f"Cannot evaluate conf of unknown type: {type(conf)}")
 
-    while changes > 0:
-        changes = 0
+    _evaluate_locations(_find_templates(conf, []), evaluators, cache, executor, limits)
 
-        if isinstance(conf, dict):
-            for key, value in conf.items():
-                if isinstance(value, str):
-                    new = _evaluate_string(value, evaluators)
-                    if new != value:
-                        conf[key] = new
-                        changes += 1
 
-                elif isinstance(value, (dict, list)):
-                    evaluate_conf(value, evaluators)
+def _evaluated_copy(
+    value: Any,
+    evaluators: Collection[AbstractEvaluator],
+    *,
+    cache: Optional[EvaluationCache]=None,
+    executor: Union[Executor, bool, None]=None,
+    limits: Optional[EvaluationLimits]=None
+) -> Any:
+    """
+    Like `evaluate_conf`, but returns the evaluated value rather than modifying it in-place. Only the dicts and lists on
+    the way to a template are copied, so the result shares every template-free subtree with `value`.
 
-        elif isinstance(conf, list):
-            for i, item in enumerate(conf):
-                if isinstance(item, (dict, list)):
-                    evaluate_conf(item, evaluators)
+    Args:
+        value:       the value to evaluate (any type; e.g., a configuration dict or a single string)
+        evaluators:  the collection of evaluators to use
+        cache:       see `evaluate_conf`
+        executor:    see `evaluate_conf`
+        limits:      see `evaluate_conf`
 
-                elif isinstance(item, str):
-                    new = _evaluate_string(item, evaluators)
-                    if new != item:
-                        conf[i] = new
-                        changes += 1
+    Returns:
+        the evaluated value (`value` itself if it contains no templates)
+    """
+    found: List[_Location] = []
+    holder = _find_templates_copy_on_write([value], found) # wrapped so that a template string can be replaced
+    _evaluate_locations(found, evaluators, cache, executor, limits)
+    return holder[0]
+
+
+def _evaluate_locations(
+    locations: List[_Location],
+    evaluators: Collection[AbstractEvaluator],
+    cache: Optional[EvaluationCache],
+    executor: Union[Executor, bool, None]=None,
+    limits: Optional[EvaluationLimits]=None
+) -> None:
+    """
+    Evaluates the templates at the given locations (in order), along with the templates their evaluations produce.
+    """
+    evaluators = EvaluatorRegistry.of(evaluators)
+    cache = EvaluationCache() if cache is None else cache
+
+    if executor is True:
+        with ThreadPoolExecutor() as pool:
+            _evaluate_rounds(locations, evaluators, cache, pool, limits)
+    else:
+        _evaluate_rounds(locations, evaluators, cache, executor or None, limits)
+
+
+class _Pending(NamedTuple):
+    """
+    A template-bearing string which is evaluated in the current round.
+    """
+
+    container: Union[list, dict]
+    key: Any
+    parsed: _ParsedString
+    evaluators: List[Any]
+    """ the evaluator of each template """
+
+    chain: Tuple[str, ...]
+    """ the strings this leaf was evaluated through, ending with its current string """
+
+
+_Chains = Dict[Tuple[int, Any], Tuple[str, ...]]
+"""
+(id(container), key) -> the strings a location was evaluated through before (see: `EvaluationLimits`).
+"""
+
+
+def _start_round(
+    locations: List[_Location],
+    evaluators: EvaluatorRegistry,
+    chains: _Chains,
+    budget: _Budget
+) -> List[_Pending]:
+    """
+    Parses the strings at the given locations, skipping repeated locations and values which are no longer strings.
+
+    Raises:
+        ValueError if a template names an evaluator that isn't given
+        EvaluationLimitError if the chain of a location is a cycle, or is too long
+    """
+    pending: List[_Pending] = []
+    seen = set()
+    found: Dict[str, Any] = {}
+
+    for container, key in locations:
+        # the same container might be reachable (and evaluated) through another location
+        location = (id(container), key)
+        if location in seen:
+            continue
+        seen.add(location)
+
+        value = container[key]
+        if not isinstance(value, str):
+            continue
+
+        parsed = _parse_string(value)
+        if parsed.templates:
+            for template in parsed.templates:
+                if template.evaluator not in found:
+                    found[template.evaluator] = _find_evaluator(template.evaluator, evaluators)
+            chain = chains.get(location, ()) + (value,)
+            budget.check_chain(chain)
+            pending.append(
+                _Pending(container, key, parsed, [found[template.evaluator] for template in parsed.templates], chain)
+            )
+
+    return pending
+
+
+def _finish_round(pending: List[_Pending], results: Sequence[Any]) -> Tuple[List[_Location], _Chains]:
+    """
+    Writes the evaluations of a round back (in order). `results` holds the evaluation of every template of `pending`,
+    in order.
+
+    Returns:
+        the locations to evaluate in the next round, i.e., the strings which still contain a template and the
+        templates within the evaluated subtrees, and their chains
+    """
+    locations: List[_Location] = []
+    chains: _Chains = {}
+    position = 0
+
+    for container, key, parsed, _, chain in pending:
+        count = len(parsed.templates)
+        new = _substitute(parsed, results[position:position + count])
+        position += count
+
+        value = container[key]
+        if new == value:
+            continue
+
+        container[key] = new
+
+        if isinstance(new, str):
+            if _has_template(new):
+                locations.append((container, key))
+                chains[(id(container), key)] = chain
+
+        elif isinstance(new, (dict, list)):
+            first = len(locations)
+            _find_templates(new, locations)
+            for location in locations[first:]:
+                chains[(id(location[0]), location[1])] = chain
+
+    return locations, chains
+
+
+def _round_calls(pending: List[_Pending]) -> Tuple[List[Tuple[Any, str]], List[int]]:
+    """
+    Lists the evaluations of a round. A cacheable evaluation which is repeated within the round is only listed once.
+
+    Returns:
+        the (evaluator, value) of each evaluation, and the index of the evaluation of each template of `pending`
+    """
+    calls: List[Tuple[Any, str]] = []
+    sources: List[int] = []
+    firsts: Dict[Tuple[Any, str], int] = {}
+    cacheable: Dict[int, bool] = {}
+
+    for entry in pending:
+        for evaluator, template in zip(entry.evaluators, entry.parsed.templates):
+            call = (evaluator, template.value)
+            if id(evaluator) not in cacheable:
+                cacheable[id(evaluator)] = evaluator.cacheable()
+
+            if cacheable[id(evaluator)]:
+                if call in firsts:
+                    sources.append(firsts[call])
+                    continue
+                firsts[call] = len(calls)
+
+            sources.append(len(calls))
+            calls.append(call)
+
+    return calls, sources
+
+
+def _round_results(outcomes: List[Any], sources: List[int]) -> List[Any]:
+    """
+    Returns the result of each template of a round, given the outcomes of its `_round_calls`. A result used by several
+    templates is copied for all but the first, so that evaluating one of them in-place doesn't change the others.
+    """
+    results: List[Any] = []
+    used = [False] * len(outcomes)
+
+    for source in sources:
+        results.append(_copy(outcomes[source]) if used[source] else outcomes[source])
+        used[source] = True
+
+    return results
+
+
+def _evaluate_rounds(
+    locations: List[_Location],
+    evaluators: EvaluatorRegistry,
+    cache: EvaluationCache,
+    executor: Optional[Executor],
+    limits: Optional[EvaluationLimits]
+) -> None:
+    """
+    Evaluates in rounds: all of the templates found in a round are evaluated (with one `evaluate_many` call per
+    evaluator), and their evaluations are written back (in order) before the templates they produce are evaluated.
+    With an executor, the batches of a round (and the values of evaluators which don't batch) are evaluated
+    concurrently.
+    """
+    budget = _Budget(limits)
+    chains: _Chains = {}
+
+    while locations:
+        pending = _start_round(locations, evaluators, chains, budget)
+        calls, sources = _round_calls(pending)
+        budget.spend(pending, len(calls))
+
+        batches: Dict[int, Tuple[AbstractEvaluator, List[int]]] = {}
+        """ id(evaluator) -> the evaluator, and the indices of its calls """
+        for index, (evaluator, _) in enumerate(calls):
+            batches.setdefault(id(evaluator), (evaluator, []))[1].append(index)
+
+        outcomes: List[Any] = [None] * len(calls)
+
+        if executor is None:
+            for evaluator, indices in batches.values():
+                results = _evaluate_batch(evaluator, [calls[index][1] for index in indices], cache)
+                for index, result in zip(indices, results):
+                    outcomes[index] = result
 
         else:
-            raise TypeError(f"Cannot evaluate conf of unknown type: {type(conf)}")
+            # each task runs in a copy of this context, so that it records its dependencies (see: `SnapshotCache`).
+            # An evaluator which doesn't batch has a task for each value, so that its values are evaluated concurrently
+            tasks: List[List[int]] = []
+            for evaluator, indices in batches.values():
+                if evaluation_cache.batches(evaluator):
+                    tasks.append(indices)
+                else:
+                    tasks.extend([index] for index in indices)
+
+            futures = [
+                (indices, executor.submit(
+                    contextvars.copy_context().run,
+                    _evaluate_batch, calls[indices[0]][0], [calls[index][1] for index in indices], cache
+                ))
+                for indices in tasks
+            ]
+
+            failed: List[Tuple[int, str, Exception]] = []
+            for indices, future in futures:
+                try:
+                    for index, result in zip(indices, future.result()):
+                        outcomes[index] = result
+                except Exception as error: # pylint: disable=broad-exception-caught
+                    failed.extend(_batch_failures(calls, indices, error, cache))
+
+            if failed:
+                failed.sort(key=lambda failure: failure[0])
+                raise EvaluationError([(template, error) for _, template, error in failed])
+
+        locations, chains = _finish_round(pending, _round_results(outcomes, sources))
+
+
+def _batch_failures(
+    calls: List[Tuple[AbstractEvaluator, str]],
+    indices: List[int],
+    error: Exception,
+    cache: EvaluationCache
+) -> List[Tuple[int, str, Exception]]:
+    """
+    Finds which templates of a failed batch (the calls at `indices`, all of the same evaluator) failed, by evaluating
+    their values one at a time. If none of them fails on its own, the batch failed as a whole, and its error is
+    reported once, under the evaluator's name.
+
+    Returns:
+        the index of each failed call, its template, and its error
+    """
+    evaluator = calls[indices[0]][0]
+    if len(indices) == 1:
+        return [(indices[0], _template_text(evaluator.name(), calls[indices[0]][1]), error)]
+
+    failures: List[Tuple[int, str, Exception]] = []
+    if not isinstance(evaluator, AbstractAsyncEvaluator):
+        for index in indices:
+            try:
+                cache.evaluate(evaluator, calls[index][1])
+            except Exception as value_error: # pylint: disable=broad-exception-caught
+                failures.append((index, _template_text(evaluator.name(), calls[index][1]), value_error))
+
+    return failures or [(indices[0], evaluator.name(), error)]
+
+
+def _evaluate_batch(evaluator: AbstractEvaluator, values: List[str], cache: EvaluationCache) -> List[Any]:
+    """
+    Evaluates the values of a single evaluator (through `cache`).
+
+    Raises:
+        TypeError if the evaluator is async
+    """
+    if isinstance(evaluator, AbstractAsyncEvaluator):
+        raise TypeError(f"Evaluator '{evaluator.name()}' is async. Use evaluate_conf_async instead")
+    return cache.evaluate_many(evaluator, values)
+
+
+async def _evaluate_locations_async(
+    locations: List[_Location],
+    evaluators: Collection[Union[AbstractEvaluator, AbstractAsyncEvaluator]],
+    cache: Optional[EvaluationCache],
+    max_concurrency: Optional[int],
+    limits: Optional[EvaluationLimits]=None
+) -> None:
+    """
+    Like `_evaluate_locations`, but evaluates in rounds: every template found in a round is evaluated concurrently,
+    and their evaluations are written back (in order) before the templates they produce are evaluated.
+    """
+    if max_concurrency is not None and max_concurrency <= 0:
+        raise ValueError(f"max_concurrency must be positive, got {max_concurrency}")
+
+    evaluators = EvaluatorRegistry.of(evaluators) # type: ignore
+    cache = EvaluationCache() if cache is None else cache
+    semaphore = None if max_concurrency is None else asyncio.Semaphore(max_concurrency)
+
+    async def call(evaluator: Any, value: str) -> Tuple[bool, Any]:
+        try:
+            if semaphore is None:
+                return True, await cache.evaluate_async(evaluator, value)
+            async with semaphore:
+                return True, await cache.evaluate_async(evaluator, value)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            return False, error
+
+    budget = _Budget(limits)
+    chains: _Chains = {}
+
+    while locations:
+        pending = _start_round(locations, evaluators, chains, budget) # type: ignore
+
+        calls, sources = _round_calls(pending)
+        budget.spend(pending, len(calls))
+        outcomes = await asyncio.gather(*(call(evaluator, value) for evaluator, value in calls))
+
+        # the first error (in document order) is raised once every evaluation of the round has finished
+        for succeeded, outcome in outcomes:
+            if not succeeded:
+                raise outcome
+
+        results = _round_results([outcome for _, outcome in outcomes], sources)
+        locations, chains = _finish_round(pending, results)
+
+
+async def evaluate_conf_async(
+    conf: Union[list, dict],
+    evaluators: Collection[Union[AbstractEvaluator, AbstractAsyncEvaluator]],
+    *,
+    cache: Optional[EvaluationCache]=None,
+    max_concurrency: Optional[int]=None,
+    limits: Optional[EvaluationLimits]=None
+) -> None:
+    """
+    Like `evaluate_conf`, but also accepts `AbstractAsyncEvaluator`s, and evaluates the templates concurrently.
+
+    The templates are evaluated in rounds. All of the templates found in a round are evaluated concurrently, and then
+    their evaluations are written back in order. The next round evaluates the templates which those evaluations
+    produced. (Sync evaluators are called directly, and so they block the event loop while they evaluate.)
+
+    Args:
+        conf:               the configuration to search and evaluate templates
+        evaluators:         the collection of (sync and async) evaluators to use
+        cache:              see `evaluate_conf`
+        max_concurrency:    the maximum number of evaluations to await at once, or None for no limit
+        limits:             see `evaluate_conf`
+
+    Returns:
+        None (conf is modified in-place)
+
+    Raises:
+        ValueError if multiple evaluators share a name, or if a template names an evaluator that isn't given
+        EvaluationLimitError if a template evaluates back to itself (`TemplateCycleError`), or a limit is exceeded
+    """
+    if not isinstance(conf, (dict, list)):
+        raise TypeError(f"Cannot evaluate conf of unknown type: {type(conf)}")
+
+    await _evaluate_locations_async(_find_templates(conf, []), evaluators, cache, max_concurrency, limits)
+
+
+async def _evaluated_copy_async(
+    value: Any,
+    evaluators: Collection[Union[AbstractEvaluator, AbstractAsyncEvaluator]],
+    *,
+    cache: Optional[EvaluationCache]=None,
+    max_concurrency: Optional[int]=None,
+    limits: Optional[EvaluationLimits]=None
+) -> Any:
+    """
+    Like `_evaluated_copy`, but evaluates like `evaluate_conf_async`.
+    """
+    found: List[_Location] = []
+    holder = _find_templates_copy_on_write([value], found)
+    await _evaluate_locations_async(found, evaluators, cache, max_concurrency, limits)
+    return holder[0]
@@ -1,10 +1,21 @@
+import asyncio
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from unittest.mock import Mock
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock, patch
 
 import pytest
 
-from ._eval import AbstractEvaluator, VariableEvaluator
-from ._evaluate_conf import _TEMPLATE_PATTERN, _find_evaluator, _evaluate_string, evaluate_conf
+from ._eval import AbstractAsyncEvaluator, AbstractEvaluator, EnvironmentEvaluator, EvaluationCache, VariableEvaluator
+from ._eval import JSONFileEvaluator
+from ._eval.dependencies import recording_dependencies
+from ._evaluate_conf import _TEMPLATE_PATTERN, _find_evaluator, _evaluate_string, _find_templates, evaluate_conf, \
+                             _evaluated_copy, _evaluated_copy_async, evaluate_conf_async, EvaluationError, _parse_string
+from ._evaluate_conf import EvaluationLimitError, EvaluationLimits, TemplateCycleError
 
 
 @pytest.mark.parametrize("string", [
@@ -89,6 +100,10 @@ def test__given_same_template__when_evaluate_string__then_substitutes_each():
     mock_evaluator = VariableEvaluator(name="tester")
     assert _evaluate_string("${{var.name}} ${{var.name}} ${{var.name}}", [mock_evaluator]) == "tester tester tester"
 
+def test__given_one_character_before_template__when_evaluate_string__then_keeps_character():
+    mock_evaluator = VariableEvaluator(port=8080)
+    assert _evaluate_string(":${{var.port}}", [mock_evaluator]) == ":8080"
+
 @pytest.mark.parametrize("replacement", [
     False,
     None,
@@ -257,3 +272,457 @@ def test__given_recursive_array_templating__when_evaluate_conf__then_substitutes
             [ 3.14 ]
         ]
     }
+
+def test__given_nested_conf__when_find_templates__then_returns_template_locations_in_document_order():
+    conf = {
+        "plain": "no template",
+        "first": "${{var.a}}",
+        "nested": { "list": ["${{var.b}}", 1, "\\${{escaped}}", ["${{var.c}}"]] },
+        "last": "x ${{var.d}} y",
+    }
+    locations = _find_templates(conf, [])
+    assert [container[key] for container, key in locations] == [
+        "${{var.a}}", "${{var.b}}", "${{var.c}}", "x ${{var.d}} y"
+    ]
+
+def test__given_non_container__when_evaluate_conf__then_raises_type_error():
+    with pytest.raises(TypeError):
+        evaluate_conf("${{var.a}}", [VariableEvaluator(a=1)]) # type: ignore
+
+def test__given_one_chained_template_in_large_conf__when_evaluate_conf__then_only_revisits_that_leaf():
+    evaluator = VariableEvaluator(start="${{var.middle}}", middle="${{var.end}}", end="done", leaf="value")
+    conf = {
+        "chained": "${{var.start}}",
+        "leaves": [f"${{{{var.leaf}}}}-{i}" for i in range(100)],
+        "plain": ["no templates here"] * 100,
+    }
+
+    with patch("pyfig._evaluate_conf._parse_string", wraps=_parse_string) as parse_string:
+        evaluate_conf(conf, [evaluator])
+
+    assert conf["chained"] == "done"
+    assert conf["leaves"] == [f"value-{i}" for i in range(100)]
+    assert parse_string.call_count == 3 + 100
+
+def test__given_shared_subtree__when_evaluate_conf__then_evaluates_each_location_once():
+    shared = { "key": "${{var.name}}" }
+    mock_evaluator = Mock(spec=AbstractEvaluator)
+    mock_evaluator.name.return_value = "mock"
+    mock_evaluator.evaluate.return_value = shared
+    conf = { "a": "${{mock}}", "b": "${{mock}}" }
+
+    evaluate_conf(conf, [mock_evaluator, VariableEvaluator(name="tester")])
+
+    assert conf == { "a": { "key": "tester" }, "b": { "key": "tester" } }
+
+def test__given_repeated_cacheable_template__when_evaluate_conf__then_evaluated_once_per_load():
+    mock_evaluator = Mock(spec=AbstractEvaluator)
+    mock_evaluator.name.return_value = "mock"
+    mock_evaluator.cacheable.return_value = True
+    mock_evaluator.evaluate.return_value = { "nested": "${{var.name}}" }
+    conf = { "items": ["${{mock.same}}"] * 50 }
+    second_load = deepcopy(conf)
+
+    evaluate_conf(conf, [mock_evaluator, VariableEvaluator(name="tester")])
+    assert conf == { "items": [{ "nested": "tester" }] * 50 }
+    mock_evaluator.evaluate.assert_called_once_with("same")
+
+    evaluate_conf(second_load, [mock_evaluator, VariableEvaluator(name="tester")])
+    assert mock_evaluator.evaluate.call_count == 2
+
+def test__given_shared_cache__when_evaluate_conf_repeatedly__then_reuses_results_across_calls():
+    mock_evaluator = Mock(spec=AbstractEvaluator)
+    mock_evaluator.name.return_value = "mock"
+    mock_evaluator.cacheable.return_value = True
+    mock_evaluator.evaluate.return_value = "mocked"
+    cache = EvaluationCache(maxsize=10)
+
+    for _ in range(3):
+        conf = { "key": "${{mock.value}}" }
+        evaluate_conf(conf, [mock_evaluator], cache=cache)
+        assert conf == { "key": "mocked" }
+
+    mock_evaluator.evaluate.assert_called_once_with("value")
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test__given_conf__when_evaluated_copy__then_conf_is_unchanged_and_template_free_subtrees_are_shared():
+    conf = {
+        "name": "${{var.name}}",
+        "nested": { "greeting": "hello ${{var.name}}", "plain": { "a": [1, 2] } },
+        "items": ["${{var.name}}", { "b": 3 }],
+        "untouched": { "c": ["d"] },
+    }
+    original = deepcopy(conf)
+
+    evaluated = _evaluated_copy(conf, [VariableEvaluator(name="tester")])
+
+    assert conf == original
+    assert evaluated == {
+        "name": "tester",
+        "nested": { "greeting": "hello tester", "plain": { "a": [1, 2] } },
+        "items": ["tester", { "b": 3 }],
+        "untouched": { "c": ["d"] },
+    }
+    assert evaluated["untouched"] is conf["untouched"]
+    assert evaluated["nested"]["plain"] is conf["nested"]["plain"]
+    assert evaluated["items"][1] is conf["items"][1]
+
+@pytest.mark.parametrize("value, expected", [
+    ("${{var.name}}", "tester"),
+    ("plain", "plain"),
+    (5, 5),
+    (["${{var.name}}"], ["tester"]),
+])
+def test__given_any_value__when_evaluated_copy__then_returns_evaluated_value(value, expected):
+    assert _evaluated_copy(value, [VariableEvaluator(name="tester")]) == expected
+
+
+class _StubServer:
+    """
+    A local server which answers each line it receives with the line reversed, after a delay. It counts the requests
+    it handles at once.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.port = 0
+
+    async def __aenter__(self) -> "_StubServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        line = await reader.readline()
+        await asyncio.sleep(self.delay)
+        writer.write(line.strip()[::-1] + b"\n")
+        await writer.drain()
+        writer.close()
+        self.active -= 1
+
+
+class _FetchEvaluator(AbstractAsyncEvaluator):
+    def __init__(self, port: int, *, cacheable: bool=False):
+        self._port = port
+        self._cacheable = cacheable
+        self.calls = 0
+
+    def name(self) -> str:
+        return "fetch"
+
+    def cacheable(self) -> bool:
+        return self._cacheable
+
+    async def evaluate(self, value: str) -> Any:
+        self.calls += 1
+        if value == "fail":
+            raise KeyError(value)
+        reader, writer = await asyncio.open_connection("127.0.0.1", self._port)
+        writer.write(value.encode() + b"\n")
+        await writer.drain()
+        answer = await reader.readline()
+        writer.close()
+        return answer.decode().strip()
+
+@pytest.mark.parametrize("max_concurrency, peak", [(None, 20), (3, 3), (1, 1)])
+def test__given_async_evaluator__when_evaluate_conf_async__then_round_is_evaluated_concurrently(max_concurrency, peak):
+    async def run() -> None:
+        async with _StubServer(delay=0.05) as server:
+            conf = { "secrets": [f"${{{{fetch.secret{i}}}}}" for i in range(20)], "plain": "value" }
+            start = time.monotonic()
+
+            await evaluate_conf_async(conf, [_FetchEvaluator(server.port)], max_concurrency=max_concurrency)
+
+            assert conf == { "secrets": [f"secret{i}"[::-1] for i in range(20)], "plain": "value" }
+            assert server.peak == peak
+            if max_concurrency is None:
+                assert time.monotonic() - start < 20 * 0.05 / 2
+
+    asyncio.run(run())
+
+def test__given_mixed_sync_and_async_evaluators__when_evaluate_conf_async__then_templates_chain_across_them():
+    async def run() -> None:
+        async with _StubServer(delay=0) as server:
+            conf = {
+                "chained": "${{var.start}}",
+                "nested": "${{fetch.${{var.name}}}} and ${{var.name}}",
+                "subtree": "${{var.tree}}",
+            }
+            evaluators = [
+                _FetchEvaluator(server.port),
+                VariableEvaluator(start="${{fetch.olleh}}", name="abc", tree={ "inner": "${{fetch.xyz}}" }),
+            ]
+
+            await evaluate_conf_async(conf, evaluators)
+
+            assert conf == { "chained": "hello", "nested": "cba and abc", "subtree": { "inner": "zyx" } }
+
+    asyncio.run(run())
+
+def test__given_repeated_cacheable_async_template__when_evaluate_conf_async__then_awaited_once():
+    async def run() -> None:
+        async with _StubServer(delay=0) as server:
+            evaluator = _FetchEvaluator(server.port, cacheable=True)
+            conf = { "items": ["${{fetch.same}}"] * 10, "other": "${{fetch.other}}" }
+
+            await evaluate_conf_async(conf, [evaluator])
+
+            assert conf == { "items": ["emas"] * 10, "other": "rehto" }
+            assert evaluator.calls == 2
+
+    asyncio.run(run())
+
+def test__given_failing_evaluations__when_evaluate_conf_async__then_raises_first_error_after_round_finishes():
+    def evaluate(value: str) -> str:
+        if value == "fail":
+            raise ValueError(value)
+        return value
+
+    evaluator = Mock(spec=AbstractEvaluator)
+    evaluator.name.return_value = "mock"
+    evaluator.evaluate.side_effect = evaluate
+    conf = { "first": "${{fetch.fail}}", "second": "${{mock.fail}}", "third": "${{mock.ok}}" }
+
+    with pytest.raises(KeyError):
+        asyncio.run(evaluate_conf_async(conf, [_FetchEvaluator(0), evaluator]))
+
+    assert [call.args for call in evaluator.evaluate.call_args_list] == [("fail",), ("ok",)]
+
+def test__given_async_evaluator__when_evaluate_conf__then_raises_typeerror():
+    with pytest.raises(TypeError):
+        evaluate_conf({ "key": "${{fetch.value}}" }, [_FetchEvaluator(0)])
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test__given_non_positive_max_concurrency__when_evaluate_conf_async__then_raises_valueerror(max_concurrency):
+    with pytest.raises(ValueError):
+        asyncio.run(evaluate_conf_async({}, [], max_concurrency=max_concurrency))
+
+def test__given_conf__when_evaluated_copy_async__then_conf_is_unchanged():
+    conf = { "name": "${{var.name}}", "untouched": { "a": 1 } }
+    original = deepcopy(conf)
+
+    evaluated = asyncio.run(_evaluated_copy_async(conf, [VariableEvaluator(name="tester")]))
+
+    assert conf == original
+    assert evaluated == { "name": "tester", "untouched": { "a": 1 } }
+    assert evaluated["untouched"] is conf["untouched"]
+
+
+class _SlowEvaluator(AbstractEvaluator):
+    def __init__(self, delay: float):
+        self._delay = delay
+        self.threads = set()
+
+    def name(self) -> str:
+        return "slow"
+
+    def evaluate(self, value: str) -> Any:
+        self.threads.add(threading.get_ident())
+        time.sleep(self._delay)
+        if value.startswith("fail"):
+            raise KeyError(value)
+        return value.upper()
+
+def test__given_executor__when_evaluate_conf__then_round_is_evaluated_concurrently_and_written_in_order():
+    evaluator = _SlowEvaluator(delay=0.05)
+    conf = {
+        "items": [f"${{{{slow.item{i}}}}}" for i in range(8)],
+        "chained": "${{var.chain}}",
+        "joined": "${{slow.a}}-${{var.b}}",
+    }
+    expected = deepcopy(conf)
+    evaluate_conf(expected, [_SlowEvaluator(delay=0), VariableEvaluator(chain="${{slow.end}}", b="b")])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        start = time.monotonic()
+        evaluate_conf(conf, [evaluator, VariableEvaluator(chain="${{slow.end}}", b="b")], executor=executor)
+        elapsed = time.monotonic() - start
+
+        assert executor.submit(lambda: "still usable").result() == "still usable"
+
+    assert conf == expected == { "items": [f"ITEM{i}" for i in range(8)], "chained": "END", "joined": "A-b" }
+    assert len(evaluator.threads) > 1
+    assert elapsed < 9 * 0.05
+
+def test__given_executor_true__when_evaluate_conf__then_uses_thread_pool():
+    evaluator = _SlowEvaluator(delay=0)
+    conf = { "key": "${{slow.value}}" }
+
+    evaluate_conf(conf, [evaluator], executor=True)
+
+    assert conf == { "key": "VALUE" }
+    assert evaluator.threads != { threading.get_ident() }
+
+def test__given_failing_evaluations__when_evaluate_conf_with_executor__then_errors_are_aggregated():
+    evaluator = Mock(spec=AbstractEvaluator)
+    evaluator.name.return_value = "mock"
+    evaluator.evaluate.return_value = "ok"
+    conf = { "a": "${{slow.fail1}}", "b": "${{mock.value}}", "c": ["${{slow.fail2}}", "${{slow}}"] }
+
+    with pytest.raises(EvaluationError) as raised:
+        evaluate_conf(conf, [_SlowEvaluator(delay=0), evaluator], executor=True)
+
+    assert [(template, type(error)) for template, error in raised.value.errors] == [
+        ("${{slow.fail1}}", KeyError),
+        ("${{slow.fail2}}", KeyError),
+    ]
+    assert "${{slow.fail2}}: KeyError" in str(raised.value)
+    evaluator.evaluate.assert_called_once_with("value")
+    assert pickle.loads(pickle.dumps(raised.value)).errors[0][0] == "${{slow.fail1}}"
+
+def test__given_executor__when_evaluate_conf_while_recording__then_dependencies_of_every_thread_are_recorded(monkeypatch):
+    monkeypatch.setenv("PYFIG_EXECUTOR_TEST_A", "a")
+    monkeypatch.setenv("PYFIG_EXECUTOR_TEST_B", "b")
+    conf = { "a": "${{env.PYFIG_EXECUTOR_TEST_A}}", "b": "${{env.PYFIG_EXECUTOR_TEST_B}}" }
+
+    with recording_dependencies() as dependencies:
+        evaluate_conf(conf, [EnvironmentEvaluator()], executor=True)
+
+    assert conf == { "a": "a", "b": "b" }
+    assert dependencies.environment == { "PYFIG_EXECUTOR_TEST_A": "a", "PYFIG_EXECUTOR_TEST_B": "b" }
+
+def test__given_repeated_cacheable_template__when_evaluate_conf_with_executor__then_evaluated_once_with_copies():
+    mock_evaluator = Mock(spec=AbstractEvaluator)
+    mock_evaluator.name.return_value = "mock"
+    mock_evaluator.cacheable.return_value = True
+    mock_evaluator.evaluate.return_value = { "nested": "${{var.name}}" }
+    conf = { "items": ["${{mock.same}}"] * 20 }
+
+    evaluate_conf(conf, [mock_evaluator, VariableEvaluator(name="tester")], executor=True)
+
+    assert conf == { "items": [{ "nested": "tester" }] * 20 }
+    assert len({ id(item) for item in conf["items"] }) == 20
+    mock_evaluator.evaluate.assert_called_once_with("same")
+
+
+class _BulkEvaluator(AbstractEvaluator):
+    def __init__(self):
+        self.batches = []
+
+    def name(self) -> str:
+        return "bulk"
+
+    def evaluate(self, value: str) -> Any:
+        raise AssertionError("evaluate_many should be used")
+
+    def evaluate_many(self, values):
+        self.batches.append(list(values))
+        if "fail" in values:
+            raise KeyError("fail")
+        return [value.upper() for value in values]
+
+@pytest.mark.parametrize("executor", [None, True])
+def test__given_batching_evaluator__when_evaluate_conf__then_called_once_per_round(executor):
+    evaluator = _BulkEvaluator()
+    conf = {
+        "a": "${{bulk.a}}",
+        "nested": ["${{bulk.b}} and ${{bulk.c}}", "${{var.next}}"],
+        "plain": "value",
+    }
+
+    evaluate_conf(conf, [evaluator, VariableEvaluator(next="${{bulk.d}}")], executor=executor)
+
+    assert conf == { "a": "A", "nested": ["B and C", "D"], "plain": "value" }
+    assert evaluator.batches == [["a", "b", "c"], ["d"]]
+
+def test__given_failing_template_in_batch__when_evaluate_conf_with_executor__then_only_it_is_reported(pytestdir: Path):
+    path = pytestdir / "data.json"
+    path.write_text('{ "a": 1 }', encoding="utf-8")
+    conf = { "a": f"${{{{jsonfile.a:{path}}}}}", "b": "${{var.x}}", "c": f"${{{{jsonfile.missing:{path}}}}}" }
+
+    with pytest.raises(EvaluationError) as raised:
+        evaluate_conf(conf, [JSONFileEvaluator(), VariableEvaluator(x=1)], executor=True)
+
+    assert [(template, type(error)) for template, error in raised.value.errors] == [(conf["c"], KeyError)]
+
+class _BulkOnlyFailingEvaluator(_BulkEvaluator):
+    def evaluate(self, value: str) -> Any:
+        return value.upper()
+
+    def evaluate_many(self, values):
+        raise ConnectionError("bulk fetch failed")
+
+def test__given_batch_failing_as_a_whole__when_evaluate_conf_with_executor__then_reported_once_for_evaluator():
+    conf = { "a": "${{bulk.a}}", "b": "${{var.x}}", "c": "${{bulk.c}}" }
+
+    with pytest.raises(EvaluationError) as raised:
+        evaluate_conf(conf, [_BulkOnlyFailingEvaluator(), VariableEvaluator(x=1)], executor=True)
+
+    assert [(template, str(error)) for template, error in raised.value.errors] == [("bulk", "bulk fetch failed")]
+
+@pytest.mark.parametrize("executor", [None, True])
+def test__given_templates_referring_to_each_other__when_evaluate_conf__then_raises_cycle_error_with_chain(executor):
+    evaluator = VariableEvaluator(a="${{var.b}}", b="${{var.a}}")
+
+    with pytest.raises(TemplateCycleError) as raised:
+        evaluate_conf({ "x": "${{var.a}}" }, [evaluator], executor=executor)
+
+    assert raised.value.chain == ["${{var.a}}", "${{var.b}}", "${{var.a}}"]
+    assert "'${{var.a}}'\n  -> '${{var.b}}'\n  -> '${{var.a}}'" in str(raised.value)
+
+def test__given_template_evaluating_to_subtree_containing_itself__when_evaluate_conf__then_raises_cycle_error():
+    evaluator = VariableEvaluator(tree={ "child": ["${{var.tree}}"] })
+
+    with pytest.raises(TemplateCycleError) as raised:
+        evaluate_conf({ "x": "${{var.tree}}" }, [evaluator])
+
+    assert raised.value.chain == ["${{var.tree}}", "${{var.tree}}"]
+
+def test__given_ever_growing_template__when_evaluate_conf__then_raises_limit_error_at_max_depth():
+    evaluator = VariableEvaluator(grow="${{var.grow}}!")
+
+    with pytest.raises(EvaluationLimitError) as raised:
+        evaluate_conf({ "x": "${{var.grow}}" }, [evaluator], limits=EvaluationLimits(max_depth=5))
+
+    assert not isinstance(raised.value, TemplateCycleError)
+    assert raised.value.chain == ["${{var.grow}}" + "!" * i for i in range(6)]
+
+def test__given_chain_within_max_depth__when_evaluate_conf__then_evaluates():
+    evaluator = VariableEvaluator(**{ f"v{i}": f"${{{{var.v{i + 1}}}}}" for i in range(10) }, v10="done")
+    conf = { "x": "${{var.v0}}" }
+
+    evaluate_conf(conf, [evaluator], limits=EvaluationLimits(max_depth=11))
+
+    assert conf == { "x": "done" }
+
+def test__given_max_evaluations__when_evaluate_conf__then_limits_evaluator_calls():
+    conf = { "x": [f"${{{{var.v{i}}}}}" for i in range(5)], "y": "${{var.chain}}" }
+    evaluator = VariableEvaluator(**{ f"v{i}": i for i in range(5) }, chain="${{var.v0}}")
+
+    evaluate_conf(deepcopy(conf), [evaluator], limits=EvaluationLimits(max_evaluations=7))
+    with pytest.raises(EvaluationLimitError) as raised:
+        evaluate_conf(deepcopy(conf), [evaluator], limits=EvaluationLimits(max_evaluations=6))
+
+    assert raised.value.chain == ["${{var.chain}}", "${{var.v0}}"]
+
+def test__given_timeout__when_evaluate_conf__then_raises_before_next_round():
+    conf = { "x": "${{slow.a}}", "y": "${{var.next}}" }
+    evaluators = [_SlowEvaluator(delay=0.05), VariableEvaluator(next="${{slow.b}}")]
+
+    with pytest.raises(EvaluationLimitError) as raised:
+        evaluate_conf(conf, evaluators, limits=EvaluationLimits(timeout=0.01))
+
+    assert "timeout=0.01" in str(raised.value)
+    assert conf == { "x": "A", "y": "${{slow.b}}" }
+
+def test__given_limit_error__when_pickled__then_keeps_chain():
+    error = TemplateCycleError("cycle", ["${{var.a}}", "${{var.a}}"])
+
+    copy = pickle.loads(pickle.dumps(error))
+
+    assert type(copy) is TemplateCycleError
+    assert (copy.reason, copy.chain, str(copy)) == (error.reason, error.chain, str(error))
+
+def test__given_cycle__when_evaluate_conf_async__then_raises_cycle_error():
+    evaluator = VariableEvaluator(a="${{var.b}}", b="${{var.a}}")
+
+    with pytest.raises(TemplateCycleError):
+        asyncio.run(evaluate_conf_async({ "x": "${{var.a}}" }, [evaluator], limits=EvaluationLimits(max_depth=None)))
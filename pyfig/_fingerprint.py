@@ -0,0 +1,85 @@
+import functools
+import hashlib
+import re
+import sys
+import typing
+from typing import Any, Iterator, Type
+
+import pydantic
+from pydantic import BaseModel
+
+from ._eval.dependencies import file_digest
+
+
+_ADDRESS_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def stable_repr(obj: Any) -> str:
+    """
+    `repr(obj)`, without the memory addresses found in the default repr of objects (which vary between processes).
+    """
+    return _ADDRESS_PATTERN.sub("", repr(obj))
+
+
+def digest(*parts: Any) -> str:
+    """
+    Hashes the `stable_repr` of the given parts.
+    """
+    return hashlib.sha256(stable_repr(parts).encode()).hexdigest()
+
+
+def _module_digest(module_name: str) -> str:
+    """
+    Hashes the source file of a module, so that any change to the code defining a model (e.g., a validator's body)
+    changes the fingerprint. Empty if the module has no source file.
+    """
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    return (file_digest(path) or "") if path else ""
+
+
+def models_in(annotation: Any) -> Iterator[Type[BaseModel]]:
+    """
+    Yields the models referenced by a field annotation, e.g., `X` and `Y` for `Dict[str, Union[X, List[Y]]]`.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        yield annotation
+
+    for arg in typing.get_args(annotation):
+        yield from models_in(arg)
+
+
+@functools.lru_cache(maxsize=None)
+def schema_fingerprint(model: Type[BaseModel]) -> str:
+    """
+    Fingerprints a model class tree: every (nested) model's fields, defaults and config, the source of the modules
+    defining them, and the pydantic and python versions. Any change to the schema changes the fingerprint.
+
+    Returns:
+        a hex digest which is stable across processes
+    """
+    hasher = hashlib.sha256(stable_repr((pydantic.VERSION, sys.version)).encode())
+
+    seen = set()
+    pending = [model]
+
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+
+        config = sorted(current.model_config.items(), key=lambda item: item[0])
+        modules = [base.__module__ for base in current.__mro__ if issubclass(base, BaseModel)]
+        hasher.update(stable_repr((
+            current.__module__,
+            current.__qualname__,
+            config,
+            [_module_digest(module) for module in modules],
+        )).encode())
+
+        for name, field in current.model_fields.items():
+            described = (name, field.annotation, field.default, field.default_factory, field.alias)
+            hasher.update(stable_repr(described).encode())
+            pending.extend(models_in(field.annotation))
+
+    return hasher.hexdigest()
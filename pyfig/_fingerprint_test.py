@@ -0,0 +1,38 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ._fingerprint import digest, schema_fingerprint, stable_repr
+
+
+class Leaf(BaseModel):
+    value: int = 1
+
+
+class Root(BaseModel):
+    leaves: Dict[str, List[Optional[Leaf]]] = {}
+
+
+def test__given_object_with_default_repr__when_stable_repr__then_address_is_removed():
+    assert stable_repr([object()]) == "[<object object>]"
+
+
+def test__given_same_parts__when_digest__then_equal():
+    assert digest("a", [1, 2], {"b": None}) == digest("a", [1, 2], {"b": None})
+    assert digest("a", [1, 2]) != digest("a", [2, 1])
+
+
+def test__given_same_model__when_schema_fingerprint__then_stable():
+    assert schema_fingerprint(Root) == schema_fingerprint(Root)
+
+
+def test__given_nested_model_changes__when_schema_fingerprint__then_differs():
+    class ChangedLeaf(BaseModel):
+        value: int = 2
+
+    class ChangedRoot(BaseModel):
+        leaves: Dict[str, List[Optional[ChangedLeaf]]] = {}
+
+    ChangedLeaf.__qualname__, ChangedRoot.__qualname__ = Leaf.__qualname__, Root.__qualname__
+
+    assert schema_fingerprint(ChangedRoot) != schema_fingerprint(Root)
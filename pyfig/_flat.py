@@ -0,0 +1,135 @@
+import os
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Set, Tuple, Union
+
+
+_MISSING = object()
+
+
+def flat_overrides(
+    pairs: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+    *,
+    separator: str=".",
+    parse: Optional[Callable[[Any], Any]]=None
+) -> Dict:
+    """
+    Builds an override dict from flat `path -> value` pairs, e.g., `{ "db.host": "localhost", "tasks.0.retries": 3 }`.
+
+    Each path is split into keys by `separator`, and the pairs are inserted into a trie of nested dicts, which is the
+    override itself. So building it takes time linear in the total length of the paths, and its subtrees are shared
+    (not copied) when it is unified with other overrides.
+
+    The keys have the same meaning as in nested overrides: within a list, an integer key overrides an item by index,
+    a `>` (or `<`) prefixed key appends (or prepends) an item, and `field=value` overrides the item with that value.
+    E.g., `{ "tasks.>new.name": "backup", "tasks.>new.enabled": False }` appends one task.
+
+    Args:
+        pairs:      the paths and their values, in order (a later pair for the same path takes precedence)
+        separator:  the separator between the keys of a path
+        parse:      converts each value before it is inserted, e.g., `json.loads`
+
+    Returns:
+        the override dictionary
+
+    Raises:
+        ValueError if a path has an empty key, or if a path is both assigned a value and has other paths below it
+        (e.g., `db` and `db.host`)
+    """
+    root: Dict = {}
+    nodes: Set[int] = {id(root)}
+    """ the ids of the dicts of the trie, as opposed to dict values of the pairs """
+
+    items = pairs.items() if isinstance(pairs, Mapping) else pairs
+    for path, value in items:
+        keys = path.split(separator)
+        if not all(keys):
+            raise ValueError(f"Error parsing override path '{path}'. It has an empty key")
+
+        node = root
+        for depth, key in enumerate(keys[:-1]):
+            child = node.get(key, _MISSING)
+            if child is _MISSING:
+                child = node[key] = {}
+                nodes.add(id(child))
+            elif id(child) not in nodes:
+                raise ValueError(
+                    f"Error parsing override path '{path}'. "
+                    f"'{separator.join(keys[:depth + 1])}' is also assigned a value"
+                )
+            node = child
+
+        if id(node.get(keys[-1])) in nodes:
+            raise ValueError(f"Error parsing override path '{path}'. It is also the prefix of another path")
+
+        node[keys[-1]] = value if parse is None else parse(value)
+
+    return root
+
+
+def parse_assignments(
+    assignments: Iterable[str],
+    *,
+    separator: str=".",
+    parse: Optional[Callable[[str], Any]]=None
+) -> Dict:
+    """
+    Builds an override dict from `path=value` assignments, e.g., `["db.host=localhost", "tasks.0.retries=3"]` (as given
+    on a command line). Each assignment is split at its first `=`, so values may contain `=`, but paths may not (i.e.,
+    `field=value` list keys aren't supported here). See: `flat_overrides`.
+
+    Args:
+        assignments:    the `path=value` strings, in order
+        separator:      the separator between the keys of a path
+        parse:          converts each value (a string) before it is inserted, e.g., `json.loads`
+
+    Returns:
+        the override dictionary
+
+    Raises:
+        ValueError if an assignment has no `=`, or for the reasons of `flat_overrides`
+    """
+    def split(assignment: str) -> Tuple[str, str]:
+        path, equals, value = assignment.partition("=")
+        if not equals:
+            raise ValueError(f"Error parsing override assignment '{assignment}'. Expected 'path=value'")
+        return path, value
+
+    return flat_overrides(map(split, assignments), separator=separator, parse=parse)
+
+
+def environ_overrides(
+    prefix: str,
+    *,
+    separator: str="__",
+    case_sensitive: bool=False,
+    parse: Optional[Callable[[str], Any]]=None,
+    environ: Optional[Mapping[str, str]]=None
+) -> Dict:
+    """
+    Builds an override dict from the environment variables starting with `prefix`, e.g., with the prefix `APP__`, the
+    variable `APP__DB__HOST=localhost` overrides `{ "db": { "host": "localhost" } }`. See: `flat_overrides`.
+
+    Args:
+        prefix:         only the variables starting with this prefix are used (and it is removed from their names)
+        separator:      the separator between the keys of a variable name
+        case_sensitive: if False, the keys are lowercased (e.g., `DB` overrides the field `db`)
+        parse:          converts each value (a string) before it is inserted, e.g., `json.loads`
+        environ:        the variables to use instead of `os.environ`
+
+    Returns:
+        the override dictionary, in the (sorted) order of the variable names
+
+    Raises:
+        ValueError for the reasons of `flat_overrides`
+    """
+    variables = os.environ if environ is None else environ
+    if not case_sensitive:
+        prefix = prefix.upper()
+
+    # sorted, since the order of the environment is arbitrary, and it decides the order of appended list items
+    pairs = sorted(
+        (name[len(prefix):] if case_sensitive else name[len(prefix):].lower(), value)
+        for name, value in variables.items()
+        if (name if case_sensitive else name.upper()).startswith(prefix)
+    )
+
+    return flat_overrides(pairs, separator=separator, parse=parse)
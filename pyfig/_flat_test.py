@@ -0,0 +1,108 @@
+import json
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from ._flat import environ_overrides, flat_overrides, parse_assignments
+from ._loader import load_configuration
+from ._override import unify_overrides
+from ._pyfig import Pyfig
+
+
+def test__given_dotted_paths__when_flat_overrides__then_returns_nested_override():
+    override = flat_overrides({ "db.host": "localhost", "db.port": 5432, "name": "app", "db.pool.size": 4 })
+
+    assert override == { "db": { "host": "localhost", "port": 5432, "pool": { "size": 4 } }, "name": "app" }
+
+def test__given_pairs_with_repeated_path__when_flat_overrides__then_last_pair_wins():
+    assert flat_overrides([("a.b", 1), ("a.b", 2)]) == { "a": { "b": 2 } }
+
+def test__given_dict_value__when_flat_overrides__then_value_is_kept_whole():
+    value = { "x": 1 }
+
+    override = flat_overrides({ "a.b": value, "a.c": 2 })
+
+    assert override == { "a": { "b": { "x": 1 }, "c": 2 } }
+    assert override["a"]["b"] is value
+
+@pytest.mark.parametrize("pairs", [
+    [("db", "x"), ("db.host", "y")],
+    [("db.host", "y"), ("db", "x")],
+    [("db", { "host": "x" }), ("db.port", 1)],
+    [("db", None), ("db.host", "y")],
+    [("a..b", 1)],
+    [(".a", 1)],
+    [("a.", 1)],
+])
+def test__given_conflicting_or_empty_paths__when_flat_overrides__then_raises_valueerror(pairs):
+    with pytest.raises(ValueError):
+        flat_overrides(pairs)
+
+def test__given_separator_and_parse__when_flat_overrides__then_used():
+    override = flat_overrides({ "a/b": "[1, 2]", "c": "true" }, separator="/", parse=json.loads)
+
+    assert override == { "a": { "b": [1, 2] }, "c": True }
+
+@pytest.mark.parametrize("pairs, expected", [
+    ({ "tasks.1.enabled": False }, [{ "name": "a" }, { "name": "b", "enabled": False }]),
+    ({ "tasks.-1.name": "z" }, [{ "name": "a" }, { "name": "z" }]),
+    ({ "tasks.>new.name": "c", "tasks.<first.name": "0" }, [{ "name": "0" }, { "name": "a" }, { "name": "b" }, { "name": "c" }]),
+    ({ "tasks.name=b.enabled": False }, [{ "name": "a" }, { "name": "b", "enabled": False }]),
+])
+def test__given_list_keys__when_unify_flat_overrides__then_same_semantics_as_nested_overrides(pairs, expected):
+    base = { "tasks": [{ "name": "a" }, { "name": "b" }] }
+
+    assert unify_overrides(flat_overrides(pairs), base)["tasks"] == expected
+
+def test__given_assignments__when_parse_assignments__then_split_at_first_equals():
+    override = parse_assignments(["db.url=postgres://h/db?ssl=true", "db.port=5432"])
+
+    assert override == { "db": { "url": "postgres://h/db?ssl=true", "port": "5432" } }
+
+def test__given_assignment_without_equals__when_parse_assignments__then_raises_valueerror():
+    with pytest.raises(ValueError):
+        parse_assignments(["db.host"])
+
+def test__given_environment__when_environ_overrides__then_uses_prefixed_variables():
+    environ = {
+        "APP__DB__HOST": "localhost",
+        "APP__TASKS__>2__NAME": "second",
+        "APP__TASKS__>1__NAME": "first",
+        "app__name": "lowercase",
+        "OTHER__DB__HOST": "ignored",
+        "APPLICATION": "ignored",
+    }
+
+    override = environ_overrides("APP__", environ=environ)
+
+    assert override == { "db": { "host": "localhost" }, "tasks": { ">1": { "name": "first" }, ">2": { "name": "second" } },
+                         "name": "lowercase" }
+    assert list(override["tasks"]) == [">1", ">2"]
+
+def test__given_case_sensitive__when_environ_overrides__then_names_are_unchanged():
+    environ = { "APP_Db_Host": "localhost", "app_db_host": "ignored" }
+
+    assert environ_overrides("APP_", separator="_", case_sensitive=True, environ=environ) == { "Db": { "Host": "localhost" } }
+
+def test__given_os_environ__when_environ_overrides__then_reads_it(monkeypatch):
+    monkeypatch.setenv("PYFIG_FLAT_TEST__A__B", "1")
+
+    assert environ_overrides("PYFIG_FLAT_TEST__") == { "a": { "b": "1" } }
+
+
+class _Task(BaseModel):
+    name: str
+    retries: int = 0
+
+class _FlatConfig(Pyfig):
+    host: str = "localhost"
+    port: int = 80
+    tasks: List[_Task] = [_Task(name="fetch")]
+
+def test__given_environ_overrides__when_load_configuration__then_values_are_validated():
+    environ = { "APP__PORT": "8080", "APP__TASKS__0__RETRIES": "3", "APP__TASKS__>__NAME": "report" }
+
+    conf = load_configuration(_FlatConfig, [environ_overrides("APP__", environ=environ)], [])
+
+    assert conf == _FlatConfig(port=8080, tasks=[_Task(name="fetch", retries=3), _Task(name="report")])
@@ -0,0 +1,221 @@
+import typing
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Generic, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+from ._eval import AbstractEvaluator, EvaluationCache, EvaluatorRegistry
+from ._evaluate_conf import _evaluated_copy
+from ._loader import _apply_model_config_recursively, _copy_dump, _issubclass_safe, _load_defaults_copying
+from ._override import unify_overrides
+from ._pyfig import Pyfig
+
+
+T = TypeVar("T", bound=Pyfig)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class LoadedConfiguration(Generic[T]):
+    """
+    The result of `load_configuration_incremental`: the loaded configuration, and what it was built from.
+
+    Pass it back in as `previous` to reload the configuration incrementally.
+    """
+
+    config: T
+    """ the loaded configuration """
+
+    unified: Dict[str, Any]
+    """ the defaults unified with every override, before any template was evaluated """
+
+    evaluated: Dict[str, Any]
+    """ `unified` with every template evaluated, i.e., the data the configuration was validated from """
+
+
+def _model_type(annotation: Any) -> Optional[Type[BaseModel]]:
+    """
+    Returns the annotation if it is a plain model class (i.e., not a union, generic, etc.), otherwise None.
+    """
+    return annotation if _issubclass_safe(annotation, BaseModel) else None
+
+
+def _list_item_model_type(annotation: Any) -> Optional[Type[BaseModel]]:
+    """
+    Returns `X` for an annotation like `List[X]`, where `X` is a plain model class, otherwise None.
+    """
+    if typing.get_origin(annotation) is not list:
+        return None
+
+    args = typing.get_args(annotation)
+    return _model_type(args[0]) if len(args) == 1 else None
+
+
+def _rebuild_list(
+    item_type: Type[BaseModel],
+    raw: list,
+    previous: list,
+    previous_raw: list,
+    previous_evaluated: list,
+    evaluate: Callable[[Any], Any],
+    keep: Callable[[Any], Any]
+) -> Tuple[list, list]:
+    """
+    Rebuilds a list of models element-wise. Elements whose raw value is unchanged keep their previous instance.
+
+    Returns:
+        the items, and the data they were built from (with templates evaluated)
+    """
+    items, evaluated = [], []
+    reusable = min(len(previous), len(previous_raw), len(previous_evaluated))
+
+    for i, value in enumerate(raw):
+        if i < reusable and isinstance(previous[i], item_type):
+            if isinstance(value, dict) and isinstance(previous_raw[i], dict) \
+                    and isinstance(previous_evaluated[i], dict):
+                item, item_evaluated = _rebuild_model(
+                    type(previous[i]), value, previous[i], previous_raw[i], previous_evaluated[i], evaluate, keep
+                )
+                items.append(item)
+                evaluated.append(item_evaluated)
+                continue
+
+            if value == previous_raw[i]:
+                items.append(previous[i])
+                evaluated.append(previous_evaluated[i])
+                continue
+
+        item_evaluated = evaluate(value)
+        items.append(keep(item_evaluated))
+        evaluated.append(item_evaluated)
+
+    return items, evaluated
+
+
+def _rebuild_model(
+    model: Type[BaseModel],
+    raw: Dict[str, Any],
+    previous: BaseModel,
+    previous_raw: Dict[str, Any],
+    previous_evaluated: Dict[str, Any],
+    evaluate: Callable[[Any], Any],
+    keep: Callable[[Any], Any]
+) -> Tuple[BaseModel, Dict[str, Any]]:
+    """
+    Builds `model` from the (unevaluated) `raw` data, reusing the parts of `previous` whose raw data is unchanged.
+
+    Since pydantic does not re-validate model instances by default, unchanged sub-models are passed as their previous
+    instance (so they are kept by identity), and only the changed fields are evaluated and validated. Any other
+    unchanged field is passed as the data it was previously validated from (not its validated value), so the model is
+    validated from exactly the same data as a full load, and its field and model validators see the new data.
+
+    Args:
+        model:              the class to build
+        raw:                the new data, whose templates are not yet evaluated
+        previous:           the previously built instance
+        previous_raw:       the data `previous` was built from
+        previous_evaluated: `previous_raw`, with its templates evaluated
+        evaluate:           evaluates the templates in a (copy of a) raw value
+        keep:               returns the value to give the model for an evaluated value, e.g., a copy when the model
+                            may keep a reference to it
+
+    Returns:
+        the instance (`previous` itself if nothing changed), and the data it was built from (with templates evaluated)
+    """
+    if raw is previous_raw or raw == previous_raw:
+        return previous, previous_evaluated
+
+    fields = model.model_fields
+    kwargs, evaluated = {}, {}
+
+    for key, value in raw.items():
+        field = fields.get(key)
+        old = previous_raw.get(key, _MISSING)
+        old_evaluated = previous_evaluated.get(key, _MISSING)
+        current = getattr(previous, key, _MISSING)
+
+        if field is None or old is _MISSING or old_evaluated is _MISSING or current is _MISSING:
+            evaluated[key] = evaluate(value)
+            kwargs[key] = keep(evaluated[key])
+        elif (sub_model := _model_type(field.annotation)) is not None and isinstance(current, sub_model) \
+                and isinstance(value, dict) and isinstance(old, dict) and isinstance(old_evaluated, dict):
+            kwargs[key], evaluated[key] = _rebuild_model(
+                type(current), value, current, old, old_evaluated, evaluate, keep
+            )
+        elif (item_model := _list_item_model_type(field.annotation)) is not None and isinstance(current, list) \
+                and isinstance(value, list) and isinstance(old, list) and isinstance(old_evaluated, list):
+            kwargs[key], evaluated[key] = _rebuild_list(
+                item_model, value, current, old, old_evaluated, evaluate, keep
+            )
+        elif value == old:
+            evaluated[key] = old_evaluated
+            kwargs[key] = current if isinstance(current, BaseModel) else keep(old_evaluated)
+        else:
+            evaluated[key] = evaluate(value)
+            kwargs[key] = keep(evaluated[key])
+
+    return model(**kwargs), evaluated
+
+
+def load_configuration_incremental(
+    default: Type[T],
+    overrides: Collection[Dict],
+    evaluators: Collection[AbstractEvaluator],
+    *,
+    previous: Optional[LoadedConfiguration[T]]=None,
+    allow_unused: bool=True,
+    cache: Optional[EvaluationCache]=None
+) -> LoadedConfiguration[T]:
+    """
+    Like `load_configuration`, but reuses a `previous` load for the parts of the configuration that didn't change.
+
+    The new overrides are unified as usual, and then compared against `previous.unified`. Only the templates and
+    sub-models within changed subtrees are evaluated and validated again. Unchanged nested models are the very same
+    instances as in `previous.config`, so they can be compared by identity to detect what changed.
+
+    Note: a template whose text is unchanged is not evaluated again, even if its evaluator would now give a different
+    result (e.g., an environment variable has changed). Do a full load (without `previous`) in that case.
+
+    Note: `unified` shares structure with the given overrides, so pass new override dicts on each call rather than
+    modifying the previous ones in-place (otherwise the change may go unnoticed).
+
+    Args:
+        default:        the default configuration type
+        overrides:      the configuration overrides (descending priority)
+        evaluators:     the evaluators to consult (optionally, a prebuilt `EvaluatorRegistry`)
+        previous:       the result of a previous call with the same `default` and `allow_unused`. When not given,
+                        the whole configuration is loaded
+        allow_unused:   see `load_configuration`
+        cache:          see `load_configuration`
+
+    Returns:
+        the loaded configuration, which can be passed as `previous` to the next call
+
+    Raises:
+        when the configuration cannot be built
+    """
+    defaults, copies = _load_defaults_copying(default, read_only=True)
+    unified = unify_overrides(*overrides, defaults, model=default)
+
+    evaluators = EvaluatorRegistry.of(evaluators)
+    cache = EvaluationCache() if cache is None else cache
+
+    def evaluate(value: Any) -> Any:
+        return _evaluated_copy(value, evaluators, cache=cache)
+
+    if not allow_unused:
+        default = _apply_model_config_recursively(default, ConfigDict(extra="forbid")) # type: ignore
+
+    # the evaluated data is kept for the next reload, so the configuration mustn't share (mutable) values with it
+    keep = (lambda value: value) if copies else _copy_dump
+
+    if previous is None or type(previous.config) is not default:
+        evaluated = evaluate(unified)
+        config = default(**keep(evaluated))
+    else:
+        config, evaluated = _rebuild_model(
+            default, unified, previous.config, previous.unified, previous.evaluated, evaluate, keep
+        )
+
+    return LoadedConfiguration(config, unified, evaluated) # type: ignore
@@ -0,0 +1,198 @@
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+
+from ._eval import AbstractEvaluator
+from ._pyfig import Pyfig
+from ._loader import load_configuration
+from ._incremental import LoadedConfiguration, load_configuration_incremental
+
+
+class CountingEvaluator(AbstractEvaluator):
+
+    def __init__(self):
+        self.calls = []
+
+    def name(self) -> str:
+        return "count"
+
+    def evaluate(self, value: str) -> str:
+        self.calls.append(value)
+        return value.upper()
+
+
+class Endpoint(BaseModel):
+    path: str
+    enabled: bool = True
+
+
+class Database(Pyfig):
+    host: str = "localhost"
+    port: int = 5432
+
+
+class Server(Pyfig):
+    name: str = "server"
+    database: Database = Database()
+    endpoints: List[Endpoint] = [Endpoint(path="/"), Endpoint(path="/health")]
+
+
+class Config(Pyfig):
+    server: Server = Server()
+    cache: Database = Database(port=6379)
+    tags: List[str] = ["a"]
+
+
+def test__given_no_previous__when_load_configuration_incremental__then_same_as_load_configuration():
+    overrides = [{ "server": { "name": "${{count.api}}" } }, { "tags": ["b"] }]
+
+    loaded = load_configuration_incremental(Config, overrides, [CountingEvaluator()])
+
+    assert isinstance(loaded, LoadedConfiguration)
+    assert loaded.config == load_configuration(Config, overrides, [CountingEvaluator()])
+    assert loaded.unified["server"]["name"] == "${{count.api}}"
+
+
+def test__given_unchanged_overrides__when_reload__then_returns_previous_instance():
+    previous = load_configuration_incremental(Config, [{ "tags": ["b"] }], [])
+
+    loaded = load_configuration_incremental(Config, [{ "tags": ["b"] }], [], previous=previous)
+
+    assert loaded.config is previous.config
+
+
+def test__given_changed_subtree__when_reload__then_only_changed_models_are_rebuilt():
+    previous = load_configuration_incremental(Config, [{ "server": { "database": { "port": 1 } } }], [])
+
+    loaded = load_configuration_incremental(Config, [{ "server": { "database": { "port": 2 } } }], [], previous=previous)
+
+    assert loaded.config.server.database.port == 2
+    assert loaded.config is not previous.config
+    assert loaded.config.server is not previous.config.server
+    assert loaded.config.server.database is not previous.config.server.database
+    assert loaded.config.cache is previous.config.cache
+    assert loaded.config.server.endpoints[0] is previous.config.server.endpoints[0]
+    assert loaded.config == load_configuration(Config, [{ "server": { "database": { "port": 2 } } }], [])
+
+
+def test__given_changed_list_element__when_reload__then_other_elements_are_reused():
+    previous = load_configuration_incremental(Config, [], [])
+
+    override = { "server": { "endpoints": { 1: { "enabled": False } } } }
+    loaded = load_configuration_incremental(Config, [override], [], previous=previous)
+
+    old_endpoints, new_endpoints = previous.config.server.endpoints, loaded.config.server.endpoints
+    assert new_endpoints[0] is old_endpoints[0]
+    assert new_endpoints[1] is not old_endpoints[1]
+    assert new_endpoints[1] == Endpoint(path="/health", enabled=False)
+
+
+def test__given_templates__when_reload__then_only_changed_templates_are_evaluated():
+    evaluator = CountingEvaluator()
+    previous = load_configuration_incremental(Config, [{
+        "server": { "name": "${{count.api}}" },
+        "cache": { "host": "${{count.redis}}" },
+    }], [evaluator])
+    assert sorted(evaluator.calls) == ["api", "redis"]
+
+    evaluator.calls.clear()
+    loaded = load_configuration_incremental(Config, [{
+        "server": { "name": "${{count.web}}" },
+        "cache": { "host": "${{count.redis}}" },
+    }], [evaluator], previous=previous)
+
+    assert evaluator.calls == ["web"]
+    assert loaded.config.server.name == "WEB"
+    assert loaded.config.cache is previous.config.cache
+
+
+def test__given_template_for_entire_submodel__when_reload__then_evaluated():
+    class DictEvaluator(AbstractEvaluator):
+        def name(self) -> str:
+            return "db"
+
+        def evaluate(self, value: str) -> dict:
+            return { "host": value, "port": 1 }
+
+    previous = load_configuration_incremental(Config, [], [DictEvaluator()])
+    loaded = load_configuration_incremental(Config, [{ "cache": "${{db.remote}}" }], [DictEvaluator()], previous=previous)
+
+    assert loaded.config.cache == Database(host="remote", port=1)
+    assert loaded.config.server is previous.config.server
+
+
+def test__given_model_validator__when_nested_field_changes__then_parent_is_revalidated():
+    class Bounded(Pyfig):
+        database: Database = Database()
+
+        @model_validator(mode="after")
+        def check_port(self):
+            if self.database.port > 9000:
+                raise ValueError("port too high")
+            return self
+
+    previous = load_configuration_incremental(Bounded, [], [])
+
+    with pytest.raises(ValidationError):
+        load_configuration_incremental(Bounded, [{ "database": { "port": 9001 } }], [], previous=previous)
+
+
+def test__given_disallow_unused__when_reload_with_unused_key__then_raises():
+    previous = load_configuration_incremental(Config, [], [], allow_unused=False)
+
+    loaded = load_configuration_incremental(Config, [], [], previous=previous, allow_unused=False)
+    assert loaded.config is previous.config
+
+    with pytest.raises(ValidationError):
+        load_configuration_incremental(Config, [{ "cache": { "nope": 1 } }], [], previous=previous, allow_unused=False)
+
+
+def test__given_previous_of_different_type__when_reload__then_loads_everything():
+    previous = load_configuration_incremental(Config, [], [])
+
+    loaded = load_configuration_incremental(Config, [], [], previous=previous, allow_unused=False)
+
+    assert loaded.config.model_dump() == previous.config.model_dump()
+    assert loaded.config.cache is not previous.config.cache
+
+
+def test__given_reload__when_new_override_dicts__then_previous_unified_is_unaffected():
+    previous = load_configuration_incremental(Config, [{ "server": { "name": "first" } }], [])
+
+    loaded = load_configuration_incremental(Config, [{ "server": { "name": "second" } }], [], previous=previous)
+
+    assert previous.unified["server"]["name"] == "first"
+    assert loaded.unified["server"]["name"] == "second"
+    assert loaded.config.server.name == "second"
+
+
+class Service(Pyfig):
+    url: str = "example.com"
+    port: int = 80
+    extra: Dict[str, Any] = { "retries": [1, 2] }
+
+    @field_validator("url")
+    @classmethod
+    def add_scheme(cls, url: str) -> str:
+        return "https://" + url
+
+
+def test__given_non_idempotent_validator__when_other_field_changes__then_same_as_load_configuration():
+    previous = load_configuration_incremental(Service, [{ "port": 1 }], [])
+    loaded = load_configuration_incremental(Service, [{ "port": 2 }], [], previous=previous)
+    loaded = load_configuration_incremental(Service, [{ "port": 3 }], [], previous=loaded)
+
+    assert loaded.config == load_configuration(Service, [{ "port": 3 }], [])
+    assert loaded.config.url == previous.config.url
+
+
+def test__given_loaded_config_modified__when_reload__then_reload_is_unaffected():
+    previous = load_configuration_incremental(Service, [], [])
+    previous.config.extra["retries"].append(3)
+
+    loaded = load_configuration_incremental(Service, [{ "port": 2 }], [], previous=previous)
+    loaded.config.extra["retries"].append(4)
+
+    assert load_configuration_incremental(Service, [{ "port": 3 }], [], previous=loaded).config \
+        == load_configuration(Service, [{ "port": 3 }], [])
@@ -0,0 +1,337 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Set, Tuple, Type, TypeVar, Union
+
+from ._eval.document_cache import _stat_signature, _StatSignature
+from ._metaconf import Metaconf
+from ._pyfig import Pyfig
+
+
+T = TypeVar("T", bound=Pyfig)
+
+
+def _signatures(paths: List[Path]) -> Dict[Path, Optional[_StatSignature]]:
+    """
+    Gets the stat signature of each path. Missing files have a signature of None.
+    """
+    signatures: Dict[Path, Optional[_StatSignature]] = {}
+    for path in paths:
+        try:
+            signatures[path] = _stat_signature(path)
+        except OSError:
+            signatures[path] = None
+    return signatures
+
+
+class _PollingWatcher:
+    """
+    Detects changes to files by periodically comparing their stat signatures.
+    """
+
+    def __init__(self) -> None:
+        self._paths: List[Path] = []
+        self._signatures: Dict[Path, Optional[_StatSignature]] = {}
+        self._wake = threading.Event()
+
+    def watch(self, signatures: Dict[Path, Optional[_StatSignature]]) -> None:
+        """
+        Replaces the watched files, treating the given signatures as their unchanged state.
+
+        Args:
+            signatures: the signatures (see `_signatures`) of the files to watch, taken *before* they were read, so
+                        that a write while they were being read is still noticed by the next check
+        """
+        self._paths = list(signatures)
+        self._signatures = dict(signatures)
+
+    def wait(self, timeout: float) -> None:
+        """
+        Blocks for up to `timeout` seconds, or until there may be a change to check for.
+        """
+        self._wake.wait(timeout)
+
+    def changed(self) -> bool:
+        """
+        Checks whether any watched file changed since the last check.
+        """
+        signatures = _signatures(self._paths)
+        changed = signatures != self._signatures
+        self._signatures = signatures
+        return changed
+
+    def wake(self) -> None:
+        """
+        Interrupts `wait`, e.g., when stopping.
+        """
+        self._wake.set()
+
+    def close(self) -> None:
+        """
+        Releases any resources. Must not be called while another thread is waiting.
+        """
+
+
+class _InotifyWatcher(_PollingWatcher):
+    """
+    Sleeps until inotify reports activity in a directory containing a watched file, rather than polling.
+
+    Directories are watched (rather than the files) so that files replaced by a rename or a symlink swap are still
+    noticed. Activity only wakes the watcher: stat signatures still decide whether a watched file actually changed.
+    """
+
+    _EVENTS = (
+        0x002 # IN_MODIFY
+        | 0x004 # IN_ATTRIB
+        | 0x008 # IN_CLOSE_WRITE
+        | 0x040 # IN_MOVED_FROM
+        | 0x080 # IN_MOVED_TO
+        | 0x100 # IN_CREATE
+        | 0x200 # IN_DELETE
+    )
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+
+    def __init__(self) -> None:
+        super().__init__()
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._wake_read, self._wake_write = os.pipe()
+        self._directories: Dict[Path, int] = {}
+
+    def watch(self, signatures: Dict[Path, Optional[_StatSignature]]) -> None:
+        directories: Set[Path] = {path.absolute().parent for path in signatures}
+
+        for directory in directories - set(self._directories):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._EVENTS)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch directory: {directory}")
+            self._directories[directory] = wd
+
+        for directory in set(self._directories) - directories:
+            self._libc.inotify_rm_watch(self._fd, self._directories.pop(directory))
+
+        super().watch(signatures)
+
+    def wait(self, timeout: float) -> None:
+        readable, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._fd in readable:
+            self._drain()
+
+    def _drain(self) -> None:
+        """
+        Discards all pending events. They're only used to wake up.
+        """
+        while True:
+            try:
+                if not os.read(self._fd, 64 * 1024):
+                    return
+            except BlockingIOError:
+                return
+
+    def wake(self) -> None:
+        os.write(self._wake_write, b"\0")
+
+    def close(self) -> None:
+        os.close(self._fd)
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+
+class LiveConfig(Generic[T]):
+    """
+    Holds a configuration which is reloaded (in a background thread) whenever its metaconf, or any of the config
+    files it lists, change on disk.
+
+    Readers always see a complete, validated configuration: a reload builds an entirely new configuration object and
+    only then replaces the old one. If a reload fails, the last good configuration is kept.
+
+    Usage:
+        >>> with LiveConfig("metaconf.yaml", MyConfig, on_change=print) as live:
+        ...     serve(lambda: live.config)
+    """
+
+    def __init__(
+        self,
+        metaconf: Union[str, Path, Metaconf],
+        target: Type[T],
+        *,
+        relative_to: Union[str, Path, None]=None,
+        on_change: Optional[Callable[[T], Any]]=None,
+        on_error: Optional[Callable[[Exception], Any]]=None,
+        debounce: float=0.2,
+        poll_interval: float=1.0,
+        use_inotify: Optional[bool]=None,
+        **kwargs
+    ) -> None:
+        """
+        Loads the configuration. Call `start()` (or use as a context manager) to begin watching for changes.
+
+        Args:
+            metaconf:       the path to a metaconf file, or a `Metaconf` (in which case only its configs are watched)
+            target:         the config class to build
+            relative_to:    see `Metaconf.from_path`
+            on_change:      called with each newly loaded configuration
+            on_error:       called with the exception when a reload fails
+            debounce:       how long (seconds) the files must be unchanged before reloading. Avoids loading a
+                            partially written set of files
+            poll_interval:  how often (seconds) files are checked for changes without inotify
+            use_inotify:    True to require inotify, False to always poll, None to use inotify if available
+
+        Kwargs:
+            Any additional keyword arguments to pass into `load_configuration`.
+
+        Raises:
+            when the initial configuration cannot be loaded
+        """
+        self._source = metaconf
+        self._relative_to = relative_to
+        self._target = target
+        self._on_change = on_change
+        self._on_error = on_error
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+        self._load_kwargs = kwargs
+
+        self._reload_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.last_error: Optional[Exception] = None
+        """ the exception raised by the most recent reload (or its `on_change`), or None if it succeeded """
+
+        self._metaconf, self._config, signatures = self._load(None)
+        self._watcher = self._create_watcher(use_inotify)
+        self._watcher.watch(signatures)
+
+    @staticmethod
+    def _create_watcher(use_inotify: Optional[bool]) -> _PollingWatcher:
+        if use_inotify is False:
+            return _PollingWatcher()
+
+        try:
+            return _InotifyWatcher()
+        except (OSError, AttributeError):
+            if use_inotify:
+                raise
+            return _PollingWatcher()
+
+    @property
+    def config(self) -> T:
+        """
+        The most recently (successfully) loaded configuration.
+        """
+        return self._config
+
+    def _load(self, previous: Optional[Metaconf]) -> Tuple[Metaconf, T, Dict[Path, Optional[_StatSignature]]]:
+        """
+        Loads the metaconf and the configuration.
+
+        Returns:
+            the metaconf, the configuration, and the signatures of the files to watch. Each signature is taken just
+            before its file is read: otherwise, a write during the load would become the unchanged state, and be lost
+        """
+        if isinstance(self._source, Metaconf):
+            metaconf = self._source
+            signatures: Dict[Path, Optional[_StatSignature]] = {}
+        else:
+            signatures = _signatures([Path(self._source)])
+            metaconf = Metaconf.from_path(self._source, relative_to=self._relative_to)
+            if previous is not None:
+                # unchanged config files don't need to be parsed again
+                metaconf._documents = previous._documents # pylint: disable=protected-access
+
+        # the metaconf may list different config files than it did before
+        signatures = {**_signatures([Path(config) for config in metaconf.configs]), **signatures}
+        return metaconf, metaconf.load_config(self._target, **self._load_kwargs), signatures
+
+    def reload(self) -> bool:
+        """
+        Loads the configuration again, replacing the current configuration if successful.
+
+        An exception raised by `on_change` is reported like a failed reload (to `on_error`, and as `last_error`), but
+        the configuration is still replaced.
+
+        Returns:
+            whether the reload succeeded
+        """
+        with self._reload_lock:
+            try:
+                metaconf, config, signatures = self._load(self._metaconf)
+            except Exception as exc: # pylint: disable=broad-exception-caught
+                self._report(exc)
+                return False
+
+            self._metaconf = metaconf
+            self._config = config
+            self.last_error = None
+            self._watcher.watch(signatures)
+
+        if self._on_change is not None:
+            try:
+                self._on_change(config)
+            except Exception as exc: # pylint: disable=broad-exception-caught
+                self._report(exc)
+        return True
+
+    def _report(self, exc: Exception) -> None:
+        self.last_error = exc
+        if self._on_error is not None:
+            self._on_error(exc)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._watcher.wait(self._poll_interval)
+            if self._stopped.is_set() or not self._watcher.changed():
+                continue
+
+            # wait for a burst of writes to finish
+            while not self._stopped.wait(self._debounce):
+                self._watcher.wait(0)
+                if not self._watcher.changed():
+                    break
+
+            if not self._stopped.is_set():
+                try:
+                    self.reload()
+                except Exception: # pylint: disable=broad-exception-caught
+                    # i.e., `on_error` raised: reported like any uncaught exception, but watching continues
+                    sys.excepthook(*sys.exc_info())
+
+    def start(self) -> "LiveConfig[T]":
+        """
+        Starts watching for changes in a background (daemon) thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="pyfig-live-config", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops watching for changes. The current configuration remains available.
+        """
+        if self._stopped.is_set():
+            return
+
+        self._stopped.set()
+        self._watcher.wake()
+        if self._thread is not None:
+            self._thread.join()
+        self._watcher.close()
+
+    def __enter__(self) -> "LiveConfig[T]":
+        return self.start()
+
+    def __exit__(self, *_exc_info) -> None:
+        self.stop()
@@ -0,0 +1,210 @@
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from pydantic import ValidationError
+
+from ._live import LiveConfig, _InotifyWatcher
+from ._metaconf import Metaconf
+from ._pyfig import Pyfig
+
+
+class LiveTarget(Pyfig):
+    name: str = "default"
+    port: int = 80
+
+
+def _inotify_available() -> bool:
+    try:
+        _InotifyWatcher().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+watcher_modes = pytest.mark.parametrize("use_inotify", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not _inotify_available(), reason="inotify is unavailable")),
+])
+
+
+def _wait_until(predicate: Callable[[], bool], timeout: float=5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("condition was not met in time")
+        time.sleep(0.01)
+
+
+def _write_metaconf(path: Path, *configs: Path) -> None:
+    listed = "\n".join(f"    - {config.as_posix()}" for config in configs)
+    path.write_text(f"configs:\n{listed}\n", encoding="utf-8")
+
+
+@watcher_modes
+def test__given_live_config__when_config_file_changes__then_reloads(pytestdir: Path, use_inotify: bool):
+    override = pytestdir / "override.yaml"
+    override.write_text("name: first\n", encoding="utf-8")
+    metaconf = pytestdir / "metaconf.yaml"
+    _write_metaconf(metaconf, override)
+    changes: List[LiveTarget] = []
+
+    with LiveConfig(metaconf, LiveTarget, on_change=changes.append, debounce=0.05, poll_interval=0.05,
+                    use_inotify=use_inotify) as live:
+        original = live.config
+        assert original.name == "first"
+
+        override.write_text("name: second-version\n", encoding="utf-8")
+        _wait_until(lambda: live.config.name == "second-version")
+
+    assert changes == [live.config]
+    assert original.name == "first"
+
+@watcher_modes
+def test__given_live_config__when_metaconf_lists_new_file__then_reloads_and_watches_it(
+        pytestdir: Path, use_inotify: bool):
+    first = pytestdir / "first.yaml"
+    first.write_text("name: first\n", encoding="utf-8")
+    (pytestdir / "nested").mkdir()
+    second = pytestdir / "nested" / "second.yaml"
+    second.write_text("port: 8080\n", encoding="utf-8")
+    metaconf = pytestdir / "metaconf.yaml"
+    _write_metaconf(metaconf, first)
+
+    with LiveConfig(metaconf, LiveTarget, debounce=0.05, poll_interval=0.05, use_inotify=use_inotify) as live:
+        _write_metaconf(metaconf, first, second)
+        _wait_until(lambda: live.config.port == 8080)
+
+        second.write_text("port: 443\n", encoding="utf-8")
+        _wait_until(lambda: live.config.port == 443)
+
+    assert live.config.name == "first"
+
+@watcher_modes
+def test__given_live_config__when_change_is_invalid__then_keeps_last_good_config(pytestdir: Path, use_inotify: bool):
+    override = pytestdir / "override.json"
+    override.write_text('{ "port": 1 }', encoding="utf-8")
+    errors: List[Exception] = []
+
+    with Metaconf(configs=[override.as_posix()]).watch(
+            LiveTarget, on_error=errors.append, debounce=0.05, poll_interval=0.05, use_inotify=use_inotify) as live:
+        good = live.config
+
+        override.write_text('{ "port": "not a port" }', encoding="utf-8")
+        _wait_until(lambda: len(errors) > 0)
+        assert live.config is good
+        assert isinstance(live.last_error, ValidationError)
+
+        override.write_text('{ "port": 2 }', encoding="utf-8")
+        _wait_until(lambda: live.config.port == 2)
+        assert live.last_error is None
+
+def test__given_burst_of_writes__when_watching__then_reloads_once_after_quiet_period(pytestdir: Path):
+    override = pytestdir / "override.yaml"
+    override.write_text("port: 0\n", encoding="utf-8")
+    changes: List[LiveTarget] = []
+
+    with LiveConfig(Metaconf(configs=[override.as_posix()]), LiveTarget, on_change=changes.append,
+                    debounce=0.5, poll_interval=0.02, use_inotify=False) as live:
+        for port in range(1, 6):
+            override.write_text(f"port: {port * 1111}\n", encoding="utf-8")
+            time.sleep(0.05)
+
+        _wait_until(lambda: live.config.port == 5555)
+
+    assert [change.port for change in changes] == [5555]
+
+def test__given_invalid_initial_config__when_construct_live_config__then_raises(pytestdir: Path):
+    override = pytestdir / "override.yaml"
+    override.write_text("port: not a port\n", encoding="utf-8")
+
+    with pytest.raises(ValidationError):
+        LiveConfig(Metaconf(configs=[override.as_posix()]), LiveTarget)
+
+def test__given_live_config__when_reload_manually__then_returns_whether_successful(pytestdir: Path):
+    override = pytestdir / "override.yaml"
+    override.write_text("port: 1\n", encoding="utf-8")
+    live = LiveConfig(Metaconf(configs=[override.as_posix()]), LiveTarget, use_inotify=False)
+
+    override.write_text("port: 22\n", encoding="utf-8")
+    assert live.reload() is True
+    assert live.config.port == 22
+
+    override.unlink()
+    assert live.reload() is False
+    assert isinstance(live.last_error, FileNotFoundError)
+    assert live.config.port == 22
+
+    live.stop()
+
+@pytest.mark.parametrize("slow_load", [0, 1])
+def test__given_write_during_slow_load__when_watching__then_reloads_again(
+        pytestdir: Path, monkeypatch: pytest.MonkeyPatch, slow_load: int):
+    override = pytestdir / "override.yaml"
+    override.write_text("port: 1\n", encoding="utf-8")
+    metaconf = pytestdir / "metaconf.yaml"
+    _write_metaconf(metaconf, override)
+    loads: List[int] = []
+    load_config = Metaconf.load_config
+
+    def slow_load_config(self: Metaconf, *args, **kwargs):
+        config = load_config(self, *args, **kwargs)
+        loads.append(config.port)
+        if len(loads) - 1 == slow_load:
+            # the file changes after it was read, but before the load finished
+            time.sleep(0.05)
+            override.write_text("port: 4444\n", encoding="utf-8")
+        return config
+
+    monkeypatch.setattr(Metaconf, "load_config", slow_load_config)
+    live = LiveConfig(metaconf, LiveTarget, debounce=0.05, poll_interval=0.05, use_inotify=False)
+    if slow_load == 1:
+        override.write_text("port: 22\n", encoding="utf-8")
+        assert live.reload() is True
+        assert live.config.port == 22
+
+    with live:
+        _wait_until(lambda: live.config.port == 4444)
+
+def test__given_on_change_raises__when_config_changes_again__then_still_reloads(pytestdir: Path):
+    override = pytestdir / "override.yaml"
+    override.write_text("port: 1\n", encoding="utf-8")
+    errors: List[Exception] = []
+
+    def on_change(config: LiveTarget) -> None:
+        if config.port == 22:
+            raise RuntimeError("callback failed")
+
+    with LiveConfig(Metaconf(configs=[override.as_posix()]), LiveTarget, on_change=on_change, on_error=errors.append,
+                    debounce=0.05, poll_interval=0.05, use_inotify=False) as live:
+        override.write_text("port: 22\n", encoding="utf-8")
+        _wait_until(lambda: len(errors) == 1)
+        assert live.config.port == 22
+        assert live.last_error is errors[0]
+
+        override.write_text("port: 333\n", encoding="utf-8")
+        _wait_until(lambda: live.config.port == 333)
+        assert live.last_error is None
+        assert [str(error) for error in errors] == ["callback failed"]
+
+def test__given_on_error_raises__when_config_changes_again__then_still_reloads(
+        pytestdir: Path, monkeypatch: pytest.MonkeyPatch):
+    override = pytestdir / "override.yaml"
+    override.write_text("port: 1\n", encoding="utf-8")
+    uncaught: List[BaseException] = []
+    monkeypatch.setattr(sys, "excepthook", lambda _type, exc, _tb: uncaught.append(exc))
+
+    def on_error(exc: Exception) -> None:
+        raise RuntimeError("error callback failed") from exc
+
+    with LiveConfig(Metaconf(configs=[override.as_posix()]), LiveTarget, on_error=on_error,
+                    debounce=0.05, poll_interval=0.05, use_inotify=False) as live:
+        override.write_text("port: invalid\n", encoding="utf-8")
+        _wait_until(lambda: len(uncaught) == 1)
+
+        override.write_text("port: 333\n", encoding="utf-8")
+        _wait_until(lambda: live.config.port == 333)
+
+    assert [str(exc) for exc in uncaught] == ["error callback failed"]
@@ -1,14 +1,26 @@
+import threading
 import typing
-from typing import Type, TypeVar, Dict, Collection, Any
-from collections import deque, defaultdict
+import weakref
+from datetime import date, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from uuid import UUID
+from typing import TYPE_CHECKING, Type, TypeVar, Dict, Collection, Any, Hashable, List, Literal, Optional, Tuple, Union
+from collections import OrderedDict, deque, defaultdict
+from concurrent.futures import Executor
 from copy import deepcopy
 
 from pydantic import BaseModel, ConfigDict
 
 from ._pyfig import Pyfig
 from ._override import unify_overrides
-from ._eval import AbstractEvaluator
-from ._evaluate_conf import evaluate_conf
+from ._eval import AbstractAsyncEvaluator, AbstractEvaluator, EvaluationCache
+from ._evaluate_conf import EvaluationLimits, _evaluated_copy, _evaluated_copy_async
+from ._fingerprint import models_in
+
+if TYPE_CHECKING:
+    from ._snapshot import SnapshotCache
 
 
 def _is_generic_type(t: Any) -> bool:
@@ -83,12 +95,61 @@ def _apply_model_config_generic_recursively(generic: Type, new_model_config: Con
         raise TypeError(f"Could not reconstruct generic type {generic}") from exc
 
 
+_DERIVED_MODEL_CACHE_MAXSIZE = 256
+"""
+The maximum number of derived classes kept by `_apply_model_config_recursively`. Each nested model is an entry.
+"""
+
+_DERIVED_MODEL_CACHE: "OrderedDict[Tuple[Type[BaseModel], Hashable], Type[BaseModel]]" = OrderedDict()
+_DERIVED_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _clear_derived_model_cache() -> None:
+    """
+    Forgets every derived class built by `_apply_model_config_recursively`.
+    """
+    with _DERIVED_MODEL_CACHE_LOCK:
+        _DERIVED_MODEL_CACHE.clear()
+
+
 def _apply_model_config_recursively(model: Type[BaseModel], new_model_config: ConfigDict) -> Type[BaseModel]:
     """
     Creates a distinct class tree which mirrors `model`, but with a particular `model_config`
     applied to each (sub)class.
 
     If a model already has a config, then the `new_model_config` will be applied as override(s).
+
+    Derived classes are memoized (LRU) by `(model, new_model_config)`, so repeatedly deriving the same tree reuses
+    the classes (and pydantic schemas) that were built the first time. Configs with unhashable values are not cached.
+    """
+    try:
+        key = (model, tuple(sorted(new_model_config.items())))
+        hash(key)
+    except TypeError:
+        return _derive_model_with_config(model, new_model_config)
+
+    with _DERIVED_MODEL_CACHE_LOCK:
+        derived = _DERIVED_MODEL_CACHE.get(key)
+        if derived is not None:
+            _DERIVED_MODEL_CACHE.move_to_end(key)
+            return derived
+
+    # built outside of the lock: nested models recurse back into this function, and building is slow.
+    # if two threads race, the first class to be stored wins so every caller observes the same class.
+    derived = _derive_model_with_config(model, new_model_config)
+
+    with _DERIVED_MODEL_CACHE_LOCK:
+        derived = _DERIVED_MODEL_CACHE.setdefault(key, derived)
+        _DERIVED_MODEL_CACHE.move_to_end(key)
+        while len(_DERIVED_MODEL_CACHE) > _DERIVED_MODEL_CACHE_MAXSIZE:
+            _DERIVED_MODEL_CACHE.popitem(last=False)
+
+    return derived
+
+
+def _derive_model_with_config(model: Type[BaseModel], new_model_config: ConfigDict) -> Type[BaseModel]:
+    """
+    Uncached implementation of `_apply_model_config_recursively`.
     """
     overrides = {
         "model_config": {**model.model_config, **new_model_config},
@@ -112,6 +173,149 @@ def _apply_model_config_recursively(model: Type[BaseModel], new_model_config: Co
     return type(f"Derived{model.__class__.__name__}", (model,), overrides)
 
 
+_STATIC_DEFAULT_FACTORIES = (list, dict, set, frozenset, tuple)
+"""
+Default factories which always produce the same value.
+"""
+
+_DEFAULTS_CACHE: "weakref.WeakKeyDictionary[Type[BaseModel], Tuple[Tuple[Any, ...], Dict[str, Any], bool]]" = \
+    weakref.WeakKeyDictionary()
+""" class -> (the validators it was built with, its defaults dump, whether the dump can be shared read-only) """
+_DEFAULTS_CACHE_LOCK = threading.Lock()
+
+_IMMUTABLE_LEAVES = (str, int, float, bool, type(None), bytes, Enum)
+
+
+def _clear_defaults_cache() -> None:
+    """
+    Forgets every defaults dump cached by `_load_defaults`.
+    """
+    with _DEFAULTS_CACHE_LOCK:
+        _DEFAULTS_CACHE.clear()
+
+
+def _reachable_models(model: Type[BaseModel]) -> List[Type[BaseModel]]:
+    """
+    Returns `model` and every model class referenced by its (nested) fields.
+    """
+    found = [model]
+    for current in found:
+        for field in current.model_fields.values():
+            found.extend(nested for nested in models_in(field.annotation) if nested not in found)
+    return found
+
+
+def _has_static_defaults(models: List[Type[BaseModel]]) -> bool:
+    """
+    Checks that no field uses a default factory which might produce a different value each time (e.g., a timestamp).
+    """
+    return all(
+        field.default_factory is None
+        or field.default_factory in _STATIC_DEFAULT_FACTORIES
+        or _issubclass_safe(field.default_factory, BaseModel)
+        for model in models
+        for field in model.model_fields.values()
+    )
+
+
+_VALUE_TYPES = (str, int, float, bytes, type(None), Enum, PurePath, date, time, timedelta, Decimal, UUID)
+"""
+Field types whose validated values never contain a mutable container.
+"""
+
+
+def _validation_copies(annotation: Any) -> bool:
+    """
+    Checks that validating a value for the annotation never keeps (a part of) the given value by reference, i.e., that
+    every dict and list within the value is rebuilt. Not the case for `Any`, bare `dict`/`list`, arbitrary classes, etc.
+    """
+    if hasattr(annotation, "__metadata__"): # Annotated[X, ...]
+        return _validation_copies(typing.get_args(annotation)[0])
+
+    origin = typing.get_origin(annotation)
+    if origin is Literal:
+        return True
+    if origin is not None:
+        args = [arg for arg in typing.get_args(annotation) if arg is not Ellipsis]
+        return origin in (list, dict, set, frozenset, tuple, typing.Union) \
+            and len(args) > 0 and all(_validation_copies(arg) for arg in args)
+
+    return _issubclass_safe(annotation, BaseModel) or _issubclass_safe(annotation, _VALUE_TYPES)
+
+
+def _validation_copies_defaults(models: List[Type[BaseModel]]) -> bool:
+    """
+    Checks that instances of the models never share a (mutable) value with the data they were validated from.
+    """
+    return all(
+        model.model_config.get("extra") != "allow"
+        and all(_validation_copies(field.annotation) for field in model.model_fields.values())
+        # plain and wrap validators may skip the type's validation (and return their input as-is)
+        and all(
+            decorator.info.mode not in ("plain", "wrap")
+            for decorator in model.__pydantic_decorators__.field_validators.values()
+        )
+        for model in models
+    )
+
+
+def _copy_dump(value: Any) -> Any:
+    """
+    Copies a `model_dump()` (or a parsed document). Much faster than `deepcopy`, since immutable leaves are shared rather than copied.
+    """
+    value_type = type(value)
+
+    if value_type is dict:
+        return {k: v if type(v) in _IMMUTABLE_LEAVES else _copy_dump(v) for k, v in value.items()}
+    if value_type is list:
+        return [v if type(v) in _IMMUTABLE_LEAVES else _copy_dump(v) for v in value]
+    if isinstance(value, _IMMUTABLE_LEAVES):
+        return value
+
+    return deepcopy(value)
+
+
+def _load_defaults(default: Type[BaseModel], *, read_only: bool=False) -> Dict[str, Any]:
+    """
+    Returns `default().model_dump()`. Unless `read_only`, the caller is free to modify it.
+
+    The dump is cached per class, so the default tree is only built, validated and serialized once. The cache entry is
+    rebuilt if any class in the tree is rebuilt (e.g., by `model_rebuild`). Classes with a dynamic default factory
+    (anything but a container type or model class) are never cached, since their defaults may change between calls.
+
+    Args:
+        default:    the class whose defaults to load
+        read_only:  if the caller never modifies the dump, the cached dump itself is returned (rather than a copy)
+                    when that's safe: i.e., instances of the class can't end up sharing a value with the cache
+    """
+    return _load_defaults_copying(default, read_only=read_only)[0]
+
+
+def _load_defaults_copying(default: Type[BaseModel], *, read_only: bool=False) -> Tuple[Dict[str, Any], bool]:
+    """
+    Like `_load_defaults`, but also returns whether validating the class always copies the given data (see:
+    `_validation_copies_defaults`), which is cached along with the dump.
+    """
+    models = _reachable_models(default)
+    signature = tuple(model.__pydantic_validator__ for model in models)
+
+    with _DEFAULTS_CACHE_LOCK:
+        cached = _DEFAULTS_CACHE.get(default)
+
+    if cached is None or cached[0] != signature:
+        dump = default().model_dump()
+        if not _has_static_defaults(models):
+            return dump, _validation_copies_defaults(models)
+
+        with _DEFAULTS_CACHE_LOCK:
+            _DEFAULTS_CACHE[default] = cached = (signature, dump, _validation_copies_defaults(models))
+
+    if read_only and cached[2]:
+        return cached[1], True
+
+    return _copy_dump(cached[1]), cached[2]
+
+
 T = TypeVar("T", bound=Pyfig)
 
 
@@ -120,7 +324,11 @@ def load_configuration(
     overrides: Collection[Dict],
     evaluators: Collection[AbstractEvaluator],
     *,
-    allow_unused: bool=True
+    allow_unused: bool=True,
+    cache: Optional[EvaluationCache]=None,
+    snapshot: Optional["SnapshotCache"]=None,
+    executor: Union[Executor, bool, None]=None,
+    limits: Optional[EvaluationLimits]=None
 ) -> T:
     """
     Loads the configuration into the `default` type, using `overrides`, and consulting the given `evaluators`.
@@ -128,10 +336,66 @@ def load_configuration(
     Args:
         default:        the default configuration type
         overrides:      the configuration overrides (descending priority)
-        evaluators:     the evaluators to consult
+        evaluators:     the evaluators to consult (optionally, a prebuilt `EvaluatorRegistry`)
         allow_unused:   when false, validation errors will be raised for unused override keys
                         (this simply adds `model_config["extra"] = "forbid"` to each pydantic model)
                         by default, unused keys are ignored
+        cache:          memoizes the results of cacheable evaluators. See: `EvaluationCache` for the available
+                        scopes. By default, results are only reused within this load
+        snapshot:       if given, the loaded configuration is stored on disk, and reused by later loads (even in other
+                        processes) while the inputs are unchanged. See: `SnapshotCache`. Cannot be combined with
+                        `cache`, since evaluations answered by a shared cache can't be checked for staleness
+        executor:       evaluates all of the templates found in each round concurrently, with this (thread pool)
+                        executor, or a `ThreadPoolExecutor` if True. See: `evaluate_conf`
+        limits:         bounds the evaluation of templates, e.g., its time. See: `EvaluationLimits`
+
+    Returns:
+        the loaded configuration
+
+    Raises:
+        when the configuration cannot be built
+    """
+    if snapshot is not None:
+        if cache is not None:
+            raise ValueError("A snapshot cannot be combined with a shared evaluation cache")
+
+        return snapshot.load_or_build(
+            default,
+            ("load_configuration", overrides, allow_unused),
+            evaluators,
+            lambda: load_configuration(
+                default, overrides, evaluators, allow_unused=allow_unused, executor=executor, limits=limits
+            )
+        )
+
+    conf = _evaluated_copy(
+        _unified_conf(default, overrides), evaluators, cache=cache, executor=executor, limits=limits
+    )
+    return _validated(default, conf, allow_unused)
+
+
+async def load_configuration_async(
+    default: Type[T],
+    overrides: Collection[Dict],
+    evaluators: Collection[Union[AbstractEvaluator, AbstractAsyncEvaluator]],
+    *,
+    allow_unused: bool=True,
+    cache: Optional[EvaluationCache]=None,
+    max_concurrency: Optional[int]=None,
+    limits: Optional[EvaluationLimits]=None
+) -> T:
+    """
+    Like `load_configuration`, but the templates are evaluated by `evaluate_conf_async`. So `evaluators` may include
+    `AbstractAsyncEvaluator`s, and the templates found in each round are evaluated concurrently.
+
+    Args:
+        default:            the default configuration type
+        overrides:          the configuration overrides (descending priority)
+        evaluators:         the (sync and async) evaluators to consult (optionally, a prebuilt `EvaluatorRegistry`)
+        allow_unused:       see `load_configuration`
+        cache:              see `load_configuration`
+        max_concurrency:    the maximum number of evaluations to await at once, or None for no limit
+        limits:             see `load_configuration`
 
     Returns:
         the loaded configuration
@@ -139,10 +403,25 @@ def load_configuration(
     Raises:
         when the configuration cannot be built
     """
-    defaults = default().model_dump()
-    conf = unify_overrides(*overrides, defaults)
-    evaluate_conf(conf, evaluators)
+    conf = await _evaluated_copy_async(
+        _unified_conf(default, overrides), evaluators, cache=cache, max_concurrency=max_concurrency, limits=limits
+    )
+    return _validated(default, conf, allow_unused)
+
 
+def _unified_conf(default: Type[Pyfig], overrides: Collection[Dict]) -> Dict:
+    """
+    Unifies the overrides with the defaults of `default` (without evaluating any templates).
+    """
+    # the defaults and overrides are shared (rather than copied) by the unified overrides, and then by the evaluation
+    defaults = _load_defaults(default, read_only=True)
+    return unify_overrides(*overrides, defaults, model=default)
+
+
+def _validated(default: Type[T], conf: Dict, allow_unused: bool) -> T:
+    """
+    Validates the evaluated configuration as an instance of `default`.
+    """
     if not allow_unused:
         default = _apply_model_config_recursively(default, ConfigDict(extra="forbid")) # type: ignore
 
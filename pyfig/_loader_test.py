@@ -1,13 +1,21 @@
-from typing import Type, List, Union, Dict, Set, Tuple, Literal
+import asyncio
+from typing import Any, ClassVar, Type, List, Union, Dict, Set, Tuple, Literal
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 from copy import deepcopy
 
 import pytest
-from pydantic import BaseModel, ConfigDict, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+from typing_extensions import Annotated
 
+from ._eval import AbstractAsyncEvaluator, VariableEvaluator
+from ._evaluate_conf import EvaluationLimitError, EvaluationLimits, TemplateCycleError
+from ._override import MergeBy, OverridePatch
 from ._pyfig import Pyfig
-from ._loader import load_configuration, _apply_model_config_recursively, _apply_model_config_generic_recursively, \
-                     _is_generic_type, _issubclass_safe
+from . import _loader
+from ._loader import load_configuration, load_configuration_async, _apply_model_config_recursively, _apply_model_config_generic_recursively, \
+                     _is_generic_type, _issubclass_safe, _clear_derived_model_cache, \
+                     _clear_defaults_cache, _load_defaults
 
 
 @pytest.mark.parametrize("t", [
@@ -264,3 +272,255 @@ def test__given_config_class_tree__when_load_configuration_without_allow_unused_
         _unused_field_raises = load_configuration(MainConfig, [override_with_extra], [], allow_unused=False)
     _still_loaded_when_no_extra = load_configuration(MainConfig, [override_all_used], [], allow_unused=False)
     _normal_behaviour_preserved = load_configuration(MainConfig, [override_with_extra], [], allow_unused=True)
+
+
+def test__given_same_model_and_config__when_apply_model_config_recursively_twice__then_reuses_derived_class():
+    class NestedModel(BaseModel):
+        nested: bool = True
+
+    class TopModel(BaseModel):
+        n: NestedModel
+        many: List[NestedModel] = []
+
+    first = _apply_model_config_recursively(TopModel, ConfigDict(extra="forbid"))
+    second = _apply_model_config_recursively(TopModel, ConfigDict(extra="forbid"))
+    different = _apply_model_config_recursively(TopModel, ConfigDict(extra="allow"))
+
+    assert first is second
+    assert first.model_fields["n"].annotation is _apply_model_config_recursively(NestedModel, ConfigDict(extra="forbid"))
+    assert different is not first
+    assert different.model_config["extra"] == "allow"
+
+
+def test__given_cleared_cache__when_apply_model_config_recursively__then_builds_new_class():
+    class SimpleModel(BaseModel):
+        foo: int = 1
+
+    first = _apply_model_config_recursively(SimpleModel, ConfigDict(extra="forbid"))
+    _clear_derived_model_cache()
+    second = _apply_model_config_recursively(SimpleModel, ConfigDict(extra="forbid"))
+
+    assert first is not second
+    assert second.model_config == ConfigDict(extra="forbid")
+
+
+def test__given_unhashable_config__when_apply_model_config_recursively__then_derives_without_caching():
+    class SimpleModel(BaseModel):
+        foo: int = 1
+
+    cfg = ConfigDict(extra="forbid", json_schema_extra={"unhashable": ["value"]})
+    first = _apply_model_config_recursively(SimpleModel, cfg)
+    second = _apply_model_config_recursively(SimpleModel, cfg)
+
+    assert first is not second
+    assert first.model_config["extra"] == "forbid"
+
+
+def test__given_more_models_than_cache_size__when_apply_model_config_recursively__then_cache_is_bounded(
+        monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_loader, "_DERIVED_MODEL_CACHE_MAXSIZE", 2)
+    _clear_derived_model_cache()
+
+    models = [type(f"Model{i}", (BaseModel,), {"__annotations__": {"foo": int}, "foo": i}) for i in range(3)]
+    for model in models:
+        _apply_model_config_recursively(model, ConfigDict(extra="forbid"))
+
+    assert len(_loader._DERIVED_MODEL_CACHE) == 2
+    assert (models[0], (("extra", "forbid"),)) not in _loader._DERIVED_MODEL_CACHE
+
+
+class _CountedDefaults(Pyfig):
+    instances: ClassVar[int] = 0
+
+    integer: int = 1
+    items: List[Dict[str, int]] = [{"a": 1}]
+    nested: Dict[str, List[int]] = {"a": [1]}
+
+    @model_validator(mode="after")
+    def count(self):
+        type(self).instances += 1
+        return self
+
+
+def test__given_same_class__when_load_defaults_repeatedly__then_defaults_built_once():
+    _clear_defaults_cache()
+    _CountedDefaults.instances = 0
+
+    first = _load_defaults(_CountedDefaults)
+    second = _load_defaults(_CountedDefaults)
+
+    assert first == second == _CountedDefaults().model_dump()
+    assert _CountedDefaults.instances == 2 # once for the cache, once for the comparison above
+
+
+def test__given_loaded_defaults__when_modified__then_cache_is_unaffected():
+    _clear_defaults_cache()
+    defaults = _load_defaults(_CountedDefaults)
+
+    defaults["integer"] = 2
+    defaults["items"][0]["a"] = 2
+    defaults["nested"]["a"].append(2)
+
+    assert _load_defaults(_CountedDefaults) == _CountedDefaults().model_dump()
+
+
+def test__given_list_element_override__when_load_configuration_repeatedly__then_defaults_are_unaffected():
+    _clear_defaults_cache()
+
+    assert load_configuration(_CountedDefaults, [{"items": {0: {"a": 5}}}], []).items == [{"a": 5}]
+    assert load_configuration(_CountedDefaults, [{"items": {">": {"b": 1}}}], []).items == [{"a": 1}, {"b": 1}]
+    assert load_configuration(_CountedDefaults, [], []) == _CountedDefaults()
+
+
+def test__given_dynamic_default_factory__when_load_defaults__then_not_cached():
+    counter = iter(range(100))
+
+    class Dynamic(Pyfig):
+        value: int = Field(default_factory=lambda: next(counter))
+
+    assert _load_defaults(Dynamic)["value"] != _load_defaults(Dynamic)["value"]
+
+
+def test__given_rebuilt_class__when_load_defaults__then_cache_is_refreshed():
+    class Rebuilt(Pyfig):
+        value: int = 1
+
+    cached = _load_defaults(Rebuilt, read_only=True)
+    assert _load_defaults(Rebuilt, read_only=True) is cached
+
+    # not every supported pydantic version picks up a changed default on rebuild, but all of them replace the validator
+    validator = Rebuilt.__pydantic_validator__
+    Rebuilt.model_rebuild(force=True)
+    assert Rebuilt.__pydantic_validator__ is not validator
+
+    rebuilt = _load_defaults(Rebuilt, read_only=True)
+    assert rebuilt is not cached
+    assert rebuilt == Rebuilt().model_dump()
+
+
+def test__given_overrides_with_templates__when_load_configuration__then_overrides_are_not_modified():
+    class Templated(Pyfig):
+        names: List[str] = ["${{var.name}}"]
+        items: List[Dict[str, str]] = [{"a": "x"}]
+
+    overrides = [{"items": {0: {"a": "${{var.name}}"}, ">": {"b": "${{var.name}}"}}}, {"names": ["${{var.name}}"]}]
+    originals = deepcopy(overrides)
+
+    config = load_configuration(Templated, overrides, [VariableEvaluator(name="tester")])
+
+    assert config == Templated(names=["tester"], items=[{"a": "tester"}, {"b": "tester"}])
+    assert overrides == originals
+    assert load_configuration(Templated, [], [VariableEvaluator(name="other")]).names == ["other"]
+
+
+def test__given_typed_fields__when_load_defaults_read_only__then_shares_cached_dump():
+    _clear_defaults_cache()
+
+    assert _load_defaults(_CountedDefaults, read_only=True) is _load_defaults(_CountedDefaults, read_only=True)
+    assert _load_defaults(_CountedDefaults) is not _load_defaults(_CountedDefaults, read_only=True)
+
+
+@pytest.mark.parametrize("annotation, value, path", [
+    (Any, [1], []),
+    (list, [1], []),
+    (List[Any], [[1]], [0]),
+    (Dict[str, list], {"a": [1]}, ["a"]),
+    (Union[int, object], [1], []),
+])
+def test__given_field_validated_by_reference__when_load_defaults_read_only__then_returns_copy(annotation, value, path):
+    Shared = type("Shared", (Pyfig,), {"__annotations__": {"value": annotation}, "value": value})
+
+    assert _load_defaults(Shared, read_only=True) is not _load_defaults(Shared, read_only=True)
+
+    inner = load_configuration(Shared, [], []).value
+    for key in path:
+        inner = inner[key]
+    inner.append(2)
+    assert load_configuration(Shared, [], []).value == value
+
+
+def test__given_plain_field_validator__when_load_defaults_read_only__then_returns_copy():
+    class Plain(Pyfig):
+        value: List[int] = [1]
+
+        @field_validator("value", mode="plain")
+        @classmethod
+        def keep(cls, value):
+            return value
+
+    assert _load_defaults(Plain, read_only=True) is not _load_defaults(Plain, read_only=True)
+
+
+def test__given_override_patch__when_load_configuration__then_applied_like_its_overrides():
+    overrides = [{"items": {">": {"b": 2}}}, {"integer": 5, "nested": {"a": {"0": 3}}}]
+    patch = OverridePatch.compile(*overrides)
+
+    assert load_configuration(_CountedDefaults, [patch], []) == load_configuration(_CountedDefaults, overrides, [])
+    assert load_configuration(_CountedDefaults, [{"integer": 6}, patch], []).integer == 6
+
+
+def test__given_merge_by_field__when_load_configuration__then_overrides_merge_elements_by_key():
+    class Task(BaseModel):
+        name: str
+        retries: int = 0
+        enabled: bool = True
+
+    class Tasks(Pyfig):
+        tasks: Annotated[List[Task], MergeBy("name")] = [Task(name="fetch"), Task(name="train", retries=2)]
+
+    overrides = [{"tasks": [{"name": "train", "enabled": False}, {"name": "report"}]}, {"tasks": {"name=fetch": {"retries": 1}}}]
+    conf = load_configuration(Tasks, overrides, [])
+
+    assert conf.tasks == [
+        Task(name="fetch", retries=1),
+        Task(name="train", retries=2, enabled=False),
+        Task(name="report"),
+    ]
+
+
+def test__given_async_evaluator__when_load_configuration_async__then_loads_like_load_configuration():
+    class Secrets(AbstractAsyncEvaluator):
+        def name(self) -> str:
+            return "secret"
+
+        async def evaluate(self, value: str) -> Any:
+            await asyncio.sleep(0)
+            return value.upper()
+
+    class App(Pyfig):
+        password: str = "${{secret.${{var.user}}}}"
+        port: int = 80
+
+    evaluators = [Secrets(), VariableEvaluator(user="admin")]
+    conf = asyncio.run(load_configuration_async(App, [{"port": "8080"}], evaluators, max_concurrency=4))
+
+    assert conf == App(password="ADMIN", port=8080)
+    with pytest.raises(ValidationError):
+        asyncio.run(load_configuration_async(App, [{"unused": 1}], evaluators, allow_unused=False))
+
+
+def test__given_executor__when_load_configuration__then_loads_like_without_it():
+    class App(Pyfig):
+        names: List[str] = ["${{var.a}}", "${{var.b}}-${{var.a}}"]
+        port: int = 80
+
+    overrides = [{"port": "${{var.port}}"}]
+    evaluators = [VariableEvaluator(a="x", b="y", port=8080)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        conf = load_configuration(App, overrides, evaluators, executor=executor)
+
+    assert conf == load_configuration(App, overrides, evaluators) == App(names=["x", "y-x"], port=8080)
+
+def test__given_self_referencing_variables__when_load_configuration__then_raises_cycle_error_instead_of_hanging():
+    class App(Pyfig):
+        host: str = "${{var.host}}"
+
+    evaluators = [VariableEvaluator(host="${{var.fallback}}", fallback="${{var.host}}")]
+
+    with pytest.raises(TemplateCycleError):
+        load_configuration(App, [], evaluators)
+    with pytest.raises(TemplateCycleError):
+        asyncio.run(load_configuration_async(App, [], evaluators, limits=EvaluationLimits(max_evaluations=10)))
+    with pytest.raises(EvaluationLimitError):
+        load_configuration(App, [], evaluators, limits=EvaluationLimits(max_evaluations=1))
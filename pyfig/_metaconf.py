@@ -1,71 +1,41 @@
 import configparser
 import importlib
-import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Type, TypeVar, Union
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Collection, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
-from ._eval import AbstractEvaluator
-from ._loader import load_configuration
+from ._eval import AbstractEvaluator, DocumentCache, record_file_read
+from ._loader import _copy_dump, _reachable_models, _validation_copies_defaults, load_configuration
+from ._parsers import get_parser_backend
 from ._pyfig import Pyfig
+from ._snapshot import SnapshotCache
+
+if TYPE_CHECKING:
+    from ._live import LiveConfig
 
 
 def _load_dict_from_yaml(path: Union[str, Path]) -> Dict[str, Any]:
     """
     Load a YAML file from a path.
     """
-    try:
-        # pylint: disable=import-outside-toplevel
-        import yaml
-    except ImportError:
-        raise ImportError("Please install pyyaml to load YAML files.") from None
-
-    with Path(path).open("rb") as file:
-        return yaml.safe_load(file)
+    return get_parser_backend("yaml").loads(Path(path).read_bytes())
 
 
 def _load_dict_from_json(path: Union[str, Path]) -> Dict[str, Any]:
     """
     Load a JSON file from a path.
     """
-    with Path(path).open("rb") as file:
-        return json.load(file)
-
-
-def _get_toml_lib_loads() -> Callable[[str], Dict[str, Any]]:
-    try:
-        # built-in since v3.11
-        import tomllib
-
-        return tomllib.loads
-    except ImportError:
-        pass
-
-    try:
-        import tomli
-
-        return tomli.loads
-    except ImportError:
-        pass
-
-    try:
-        import toml
-
-        return toml.loads
-    except ImportError:
-        pass
-
-    raise ImportError(
-        "No toml support found. Upgrade to Py>=3.11, or install one of tomli or toml."
-    )
+    return get_parser_backend("json").loads(Path(path).read_bytes())
 
 
 def _load_dict_from_toml(path: Union[str, Path]) -> Dict[str, Any]:
     """
     Load a TOML file from a path.
     """
-    content = Path(path).read_text("utf-8")
-    return _get_toml_lib_loads()(content)
+    return get_parser_backend("toml").loads(Path(path).read_bytes())
 
 
 def _load_dict_from_ini(path: Union[str, Path]) -> Dict[str, Any]:
@@ -110,6 +80,23 @@ def _construct_evaluator(class_path: str, params: Dict[str, Any]):
 
 T = TypeVar("T", bound=Pyfig)
 
+
+@dataclass(frozen=True)
+class ConfigFileTiming:
+    """
+    How long a config file took to load during `Metaconf.load_config`.
+    """
+
+    path: str
+    """ the config file, as listed in `Metaconf.configs` """
+
+    seconds: float
+    """ the wall-clock time spent reading and parsing the file (or fetching it from the cache) """
+
+    cached: bool
+    """ whether the file was unchanged since a previous load, so it wasn't parsed again """
+
+
 @dataclass
 class Metaconf:
     """
@@ -139,9 +126,10 @@ class Metaconf:
     additional dependencies may be required.
     """
 
-    evaluators: List[AbstractEvaluator] = field(default_factory=list)
+    evaluators: Collection[AbstractEvaluator] = field(default_factory=list)
     """
-    A list of evaluators that can be used to fill-in templated values in the configuration files.
+    A list (or `EvaluatorRegistry`) of evaluators that can be used to fill-in templated values in the configuration
+    files.
 
     Recommended to always use, for their convienience. This can also be extended to meet your needs.
         - pyfig.VariableEvaluator
@@ -153,6 +141,16 @@ class Metaconf:
     Highest-priority overrides applied to the configuration. This bypasses the configuration files.
     """
 
+    file_timings: List[ConfigFileTiming] = field(default_factory=list, init=False, repr=False, compare=False)
+    """
+    Per-file timings of the most recent `load_config`, in the same (priority) order as `configs`.
+    """
+
+    _documents: DocumentCache = field(default_factory=DocumentCache, init=False, repr=False, compare=False)
+    """
+    Parsed config files, reused by later `load_config` calls until the file changes on disk.
+    """
+
     @staticmethod
     def from_path(path: Union[str, Path], *, relative_to: Union[str, Path, None]=None) -> "Metaconf":
         """
@@ -184,16 +182,105 @@ class Metaconf:
             configs=configs
         )
 
-    def load_config(self, target: Type[T], **kwargs) -> T:
+    def _load_config_file(self, path: str, share: bool=False) -> Tuple[Dict[str, Any], ConfigFileTiming]:
+        """
+        Loads a config file, reusing the previously parsed content if the file is unchanged.
+
+        Args:
+            path:   the config file
+            share:  whether the cached content itself may be returned (rather than a copy). Only safe when the loaded
+                    configuration can't end up sharing a value with it
+        """
+        start = perf_counter()
+        parsed = []
+
+        def parse(p: Path) -> Dict[str, Any]:
+            parsed.append(p)
+            return _load_dict(p)
+
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"Configuration file not found: {path}")
+
+        # loading the configuration never modifies its overrides, but the configuration may keep references into them
+        data = self._documents.load(path, "config", parse)
+        if not share:
+            data = _copy_dump(data)
+
+        return data, ConfigFileTiming(path, perf_counter() - start, cached=not parsed)
+
+    def load_config(
+        self,
+        target: Type[T],
+        *,
+        max_workers: Optional[int]=None,
+        snapshot: Optional[SnapshotCache]=None,
+        **kwargs
+    ) -> T:
         """
         Use the meta configuration to load your application's configuration.
 
+        Config files are read concurrently, and files which haven't changed since a previous call are not parsed
+        again. See `file_timings` for how long each file took.
+
         Args:
-            target: the config class to build
+            target:         the config class to build
+            max_workers:    the maximum number of threads reading config files. Defaults to one per file (within
+                            `ThreadPoolExecutor`'s default limit). Use 1 to read the files sequentially
+            snapshot:       if given, the loaded configuration is stored on disk, and reused by later loads (even in
+                            other processes) until this metaconf, a config file, or anything read by an evaluator
+                            changes. See: `SnapshotCache`. When a snapshot is used, `file_timings` is empty
 
         Kwargs:
             Any additional keyword arguments to pass into `load_configuration`.
             See: `pyfig.load_configuration` for more details on the available options.
         """
-        configs = [_load_dict(config) for config in self.configs]
+        if snapshot is not None:
+            if kwargs.get("cache") is not None:
+                raise ValueError("A snapshot cannot be combined with a shared evaluation cache")
+
+            self.file_timings = []
+            inputs = ("metaconf", self.configs, self.overrides, sorted(kwargs.items()))
+            build = partial(self._load_config, target, max_workers, kwargs)
+            return snapshot.load_or_build(target, inputs, self.evaluators, build)
+
+        return self._load_config(target, max_workers, kwargs)
+
+    def _load_config(self, target: Type[T], max_workers: Optional[int], kwargs: Dict[str, Any]) -> T:
+        """
+        Implementation of `load_config`, without snapshots.
+        """
+        # recorded from this thread: the reading threads don't share the context of an active snapshot
+        for config in self.configs:
+            record_file_read(config)
+
+        # e.g., an `Any` or `Dict[str, Any]` field keeps the given value, which must not be the cached document
+        load_file = partial(self._load_config_file, share=_validation_copies_defaults(_reachable_models(target)))
+
+        if len(self.configs) <= 1 or max_workers == 1:
+            loaded = [load_file(config) for config in self.configs]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers or min(32, len(self.configs))) as executor:
+                # map() preserves the order of `configs`, so priority is unaffected by which file loads first
+                loaded = list(executor.map(load_file, self.configs))
+
+        self.file_timings = [timing for _, timing in loaded]
+        configs = [data for data, _ in loaded]
         return load_configuration(target, [self.overrides, *configs], self.evaluators, **kwargs)
+
+    def watch(self, target: Type[T], **kwargs) -> "LiveConfig[T]":
+        """
+        Loads your application's configuration, and reloads it in the background whenever a config file changes.
+
+        Args:
+            target: the config class to build
+
+        Kwargs:
+            Any additional keyword arguments to pass into `LiveConfig` (e.g., `on_change`) or `load_configuration`.
+
+        Returns:
+            the started `LiveConfig`. Its `config` attribute is always the latest valid configuration
+        """
+        # pylint: disable=import-outside-toplevel
+        from ._live import LiveConfig
+
+        return LiveConfig(self, target, **kwargs).start()
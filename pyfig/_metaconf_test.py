@@ -1,13 +1,14 @@
-import sys
 import textwrap
 from pathlib import Path
+from typing import Any, Dict, List
 from unittest.mock import Mock, patch
 
 import pytest
 from pydantic import ValidationError
 
-from ._eval import AbstractEvaluator
-from ._metaconf import Metaconf, _construct_evaluator, _get_toml_lib_loads, _load_dict
+from ._eval import AbstractEvaluator, EvaluatorRegistry, VariableEvaluator
+from ._metaconf import Metaconf, _construct_evaluator, _load_dict
+from ._parsers import ParserBackend
 from ._pyfig import Pyfig
 
 
@@ -92,12 +93,12 @@ def test__given_toml__when_load_dict__then_dict_is_loaded(pytestdir: Path):
     }
 
 
-@patch("pyfig._metaconf._get_toml_lib_loads")
-def test__given_toml_lib__when_load_dict__then_calls_with_content(
-    mock_toml_lib_loads: Mock, pytestdir: Path
+@patch("pyfig._metaconf.get_parser_backend")
+def test__given_toml_backend__when_load_dict__then_calls_with_content(
+    mock_get_parser_backend: Mock, pytestdir: Path
 ):
     mock_loads = Mock(return_value={"mock": "loaded"})
-    mock_toml_lib_loads.return_value = mock_loads
+    mock_get_parser_backend.return_value = ParserBackend("toml", "mock", mock_loads)
 
     path = pytestdir / "some.toml"
     content = "[mock]\nloaded = true\n"
@@ -105,21 +106,11 @@ def test__given_toml_lib__when_load_dict__then_calls_with_content(
 
     loaded = _load_dict(path)
 
-    mock_loads.assert_called_once_with(content)
+    mock_get_parser_backend.assert_called_once_with("toml")
+    mock_loads.assert_called_once_with(content.encode())
     assert loaded == {"mock": "loaded"}
 
 
-def test__given_python_version__when__get_toml_lib_loads__then_returns_appropriate_loads():
-    if sys.version_info >= (3, 11):
-        import tomllib
-
-        assert _get_toml_lib_loads() is tomllib.loads
-    else:
-        import tomli
-
-        assert _get_toml_lib_loads() is tomli.loads
-
-
 def test__given_ini__when_load_dict__then_dict_is_loaded(pytestdir: Path):
     path = pytestdir / "test.ini"
     path.write_text(textwrap.dedent("""\
@@ -285,3 +276,89 @@ def test__given_metaconf__when_load_config_disallow_unused__then_calls_load_conf
     # but with allow_unused=False it should raise a ValidationError
     with pytest.raises(ValidationError):
         metaconf.load_config(TargetConf, allow_unused=False)
+
+def test__given_evaluator_registry__when_load_config__then_uses_registry():
+    class TargetConf(Pyfig):
+        name: str = "${{var.name}}"
+
+    metaconf = Metaconf(evaluators=EvaluatorRegistry([VariableEvaluator(name="registered")]))
+
+    assert metaconf.load_config(TargetConf).name == "registered"
+
+class LayeredConf(Pyfig):
+    value: int = 0
+    items: List[str] = ["default"]
+
+@pytest.mark.parametrize("max_workers", [None, 1, 3])
+def test__given_many_layered_configs__when_load_config__then_priority_order_is_kept(pytestdir: Path, max_workers):
+    configs = []
+    for i in range(20):
+        path = pytestdir / f"layer{i}.json"
+        path.write_text(f'{{ "value": {i} }}' if i % 2 else "{}", encoding="utf-8")
+        configs.append(path.as_posix())
+
+    metaconf = Metaconf(configs=configs)
+
+    assert metaconf.load_config(LayeredConf, max_workers=max_workers).value == 1
+    assert [timing.path for timing in metaconf.file_timings] == configs
+
+def test__given_unchanged_configs__when_load_config_again__then_files_are_not_parsed_again(pytestdir: Path):
+    path = pytestdir / "override.yaml"
+    path.write_text("items:\n  '>append': appended\n", encoding="utf-8")
+    metaconf = Metaconf(configs=[path.as_posix()])
+
+    with patch("pyfig._metaconf._load_dict", wraps=_load_dict) as load_dict:
+        first = metaconf.load_config(LayeredConf)
+        assert [timing.cached for timing in metaconf.file_timings] == [False]
+        second = metaconf.load_config(LayeredConf)
+        assert [timing.cached for timing in metaconf.file_timings] == [True]
+
+    load_dict.assert_called_once()
+    assert first.items == second.items == ["default", "appended"]
+    assert all(timing.seconds >= 0 for timing in metaconf.file_timings)
+
+def test__given_cached_config_with_templates__when_load_config__then_cached_document_is_not_modified(pytestdir: Path):
+    path = pytestdir / "override.json"
+    path.write_text('{ "value": "${{var.value}}", "items": { ">append": "${{var.item}}" } }', encoding="utf-8")
+    metaconf = Metaconf(configs=[path.as_posix()], evaluators=[VariableEvaluator(value=3, item="item ${{var.value}}")])
+
+    first = metaconf.load_config(LayeredConf)
+    second = metaconf.load_config(LayeredConf)
+
+    assert first == second == LayeredConf(value=3, items=["default", "item 3"])
+    assert metaconf._documents.load(path, "config", _load_dict) == { # pylint: disable=protected-access
+        "value": "${{var.value}}", "items": { ">append": "${{var.item}}" }
+    }
+
+class LooseConf(Pyfig):
+    extra: Dict[str, Any] = {}
+    items: List[Any] = []
+
+
+def test__given_loaded_config_modified__when_load_config_again__then_cached_document_is_unaffected(pytestdir: Path):
+    path = pytestdir / "override.json"
+    path.write_text('{ "extra": { "a": { "b": 1 } }, "items": [[1, 2]] }', encoding="utf-8")
+    metaconf = Metaconf(configs=[path.as_posix()])
+
+    first = metaconf.load_config(LooseConf)
+    first.extra["a"]["b"] = 999
+    first.items[0].append(3)
+
+    assert metaconf.load_config(LooseConf) == LooseConf(extra={ "a": { "b": 1 } }, items=[[1, 2]])
+    assert [timing.cached for timing in metaconf.file_timings] == [True]
+
+def test__given_changed_config__when_load_config_again__then_file_is_parsed_again(pytestdir: Path):
+    path = pytestdir / "override.json"
+    path.write_text('{ "value": 1 }', encoding="utf-8")
+    metaconf = Metaconf(configs=[path.as_posix()])
+    assert metaconf.load_config(LayeredConf).value == 1
+
+    path.write_text('{ "value": 22 }', encoding="utf-8")
+
+    assert metaconf.load_config(LayeredConf).value == 22
+    assert [timing.cached for timing in metaconf.file_timings] == [False]
+
+def test__given_missing_config_file__when_load_config__then_raises_file_not_found_error(pytestdir: Path):
+    metaconf = Metaconf(configs=[(pytestdir / "dne.json").as_posix(), (pytestdir / "dne.yaml").as_posix()])
+    with pytest.raises(FileNotFoundError):
+        metaconf.load_config(LayeredConf)
@@ -1,74 +1,807 @@
-from typing import Dict, Any
-
-
-def _list_element_override_with_error_messaging(src: list, key: Any, override: Any):
-    # preferring type() checks over isinstance() for strictness
-    # i.e., we don't want a bool to be treated as an int
-    if type(key) == str:
-        if key.startswith(">"):
-            src.append(override)
-            return
-        elif key.startswith("<"):
-            src.insert(0, override)
-            return
+import functools
+import typing
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+
+_MISSING = object()
+
+_Owned = Dict[int, Union[dict, list]]
+"""
+The containers created by the current merge (by id), which are safe to modify in-place. Every other container belongs
+to an input, so it is copied before being modified. The containers are kept (not just their ids) so that an id cannot
+be reused by another object during the merge.
+"""
+
+
+def _own(container: Union[dict, list], owned: _Owned) -> Any:
+    """
+    Returns `container` if it was created by the current merge, otherwise a shallow copy of it (which is then owned).
+    """
+    if id(container) in owned:
+        return container
+
+    copy = dict(container) if isinstance(container, dict) else list(container)
+    owned[id(copy)] = copy
+    return copy
+
+
+def _fresh(value: Any) -> Any:
+    """
+    Returns a copy of a container value of an `OverridePatch`, so that the results of applying the patch never share
+    (and so can't modify) the patch itself.
+    """
+    return deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+@dataclass(frozen=True)
+class MergeBy:
+    """
+    Annotates a list field so that an override list is merged into it by `key`, rather than replacing it. Each element
+    of the override is merged into the element with the same `key` value (or appended, if there is none).
+
+    E.g.,
+    ```
+    class MyConfig(Pyfig):
+        tasks: Annotated[List[TaskConfig], MergeBy("name")] = [TaskConfig(name="build"), TaskConfig(name="test")]
+
+    load_configuration(MyConfig, [{ "tasks": [{ "name": "test", "enabled": False }] }], [])
+    ```
+    """
+
+    key: str
+    """ the field which identifies each element """
+
+
+class _MergePlan(NamedTuple):
+    """
+    Where `MergeBy` applies within (part of) a configuration class, i.e., how to merge an override into a value.
+    """
+
+    key: Optional[str]
+    """ the `MergeBy` key for a list """
+
+    fields: Dict[str, "_MergePlan"]
+    """ the plans for the values of a dict (i.e., a model), by key """
+
+    values: Optional["_MergePlan"]
+    """ the plan for every value of a dict (e.g., `Dict[str, Model]`) """
+
+    items: Optional["_MergePlan"]
+    """ the plan for every element of a list """
+
+
+def _child_plan(plan: Optional[_MergePlan], key: Any) -> Optional[_MergePlan]:
+    return None if plan is None else plan.fields.get(key, plan.values)
+
+
+def _plan_annotation(annotation: Any, merge_by: Optional[MergeBy], visiting: FrozenSet[type]) -> Optional[_MergePlan]:
+    """
+    Plans how to merge into values of the annotation, or returns None if no `MergeBy` applies to them.
+    """
+    if hasattr(annotation, "__metadata__"): # Annotated[X, ...]
+        merge_by = next((m for m in annotation.__metadata__ if isinstance(m, MergeBy)), merge_by)
+        return _plan_annotation(typing.get_args(annotation)[0], merge_by, visiting)
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _plan_model(annotation, visiting)
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union:
+        return next((plan for arg in args if (plan := _plan_annotation(arg, merge_by, visiting))), None)
+    if origin is list and args:
+        items = _plan_annotation(args[0], None, visiting)
+        return _MergePlan(merge_by.key, {}, None, items) if merge_by or items else None
+    if origin is list:
+        return _MergePlan(merge_by.key, {}, None, None) if merge_by else None
+    if origin is dict and len(args) == 2:
+        values = _plan_annotation(args[1], None, visiting)
+        return _MergePlan(None, {}, values, None) if values else None
+
+    return None
+
+
+def _plan_model(model: Type[BaseModel], visiting: FrozenSet[type]) -> Optional[_MergePlan]:
+    if model in visiting: # a recursive model
+        return None
+
+    fields = {}
+    for name, field in model.model_fields.items():
+        merge_by = next((m for m in field.metadata if isinstance(m, MergeBy)), None)
+        plan = _plan_annotation(field.annotation, merge_by, visiting | {model})
+        if plan is not None:
+            fields[name] = plan
+            if field.alias:
+                fields[field.alias] = plan
+
+    return _MergePlan(None, fields, None, None) if fields else None
+
+
+@functools.lru_cache(maxsize=None)
+def _merge_plan(model: Type[BaseModel]) -> Optional[_MergePlan]:
+    """
+    Plans where `MergeBy` applies within the model, or returns None if it doesn't apply anywhere.
+    """
+    return _plan_model(model, frozenset())
+
+
+class _ListSplice:
+    """
+    Applies element overrides to a list in a single pass. Appended and prepended items are buffered, and only spliced
+    into the list by `finish`, so that prepending k items to an n-long list is O(n + k) rather than O(n * k). Indices
+    refer to the list as it would be after each of the previous overrides (i.e., including the buffered items).
+
+    Elements can also be found by the value of one of their keys, through an index which is built on first use (and
+    kept up to date), so matching m elements of an n-long list is O(n + m).
+    """
+
+    __slots__ = ("items", "prepended", "appended", "indices")
+
+    def __init__(self, items: list):
+        self.items = items
+        self.prepended: list = [] # in reverse order, since the last prepended item comes first
+        self.appended: list = []
+        self.indices: Dict[Tuple[str, bool], Dict[Any, Tuple[list, int]]] = {}
+        """ (key, whether the values are compared as text) -> the first element with each value of the key """
+
+    def locate(self, key: Any, index: int) -> Tuple[list, int]:
+        """
+        Finds the element at `index` of the list (as it currently is).
+
+        Returns:
+            the list (the original items, or a buffer) holding the element, and the element's index in it
+
+        Raises:
+            IndexError if the index is out of bounds
+        """
+        prepended, items = len(self.prepended), len(self.items)
+        length = prepended + items + len(self.appended)
+        position = index + length if index < 0 else index
+
+        if not 0 <= position < length:
+            raise IndexError(
+                f"Error applying override to out of bounds index {key}. List is only {length} elements long"
+            )
+
+        if position < prepended:
+            return self.prepended, prepended - 1 - position
+        if position < prepended + items:
+            return self.items, position - prepended
+        return self.appended, position - prepended - items
+
+    def find(self, key: str, value: Any, as_text: bool=False) -> Optional[Tuple[list, int]]:
+        """
+        Finds the first element (a dict) whose `key` is `value`. If `as_text`, the element's value is compared as a
+        string (e.g., the element `{ "id": 5 }` is found by the value "5").
+
+        Returns:
+            like `locate`, or None if no element has the value
+        """
+        index = self.indices.get((key, as_text))
+        if index is None:
+            index = self.indices[(key, as_text)] = {}
+            for elements in (self.prepended, self.items, self.appended):
+                positions = range(len(elements) - 1, -1, -1) if elements is self.prepended else range(len(elements))
+                for position in positions:
+                    self._index(index, key, as_text, elements, position, first=False)
+
+        try:
+            return index.get(value)
+        except TypeError: # unhashable
+            return None
+
+    def _index(self, index: Dict, key: str, as_text: bool, elements: list, position: int, first: bool) -> None:
+        element = elements[position]
+        if isinstance(element, dict) and key in element:
+            value = str(element[key]) if as_text else element[key]
+            try:
+                if first:
+                    index[value] = (elements, position)
+                else:
+                    index.setdefault(value, (elements, position))
+            except TypeError: # unhashable values can't be found
+                pass
+
+    def append(self, element: Any) -> None:
+        self.appended.append(element)
+        for (key, as_text), index in self.indices.items():
+            self._index(index, key, as_text, self.appended, len(self.appended) - 1, first=False)
+
+    def prepend(self, element: Any) -> None:
+        self.prepended.append(element)
+        for (key, as_text), index in self.indices.items():
+            self._index(index, key, as_text, self.prepended, len(self.prepended) - 1, first=True)
+
+    def update(self, elements: list, position: int, override: Callable[[Any], Any]) -> None:
+        """
+        Replaces the element at a position returned by `locate` or `find` with `override(element)`, which may also
+        modify the element in place.
+        """
+        previous = elements[position]
+        keys = [(key, previous.get(key, _MISSING) if isinstance(previous, dict) else _MISSING) for key, _ in self.indices]
+        element = elements[position] = override(previous)
+
+        # the indices are rebuilt if the element's value of an indexed key changed (which is rare)
+        for key, value in keys:
+            if not isinstance(element, dict) or element.get(key, _MISSING) != value:
+                self.indices.clear()
+                return
+
+    def finish(self) -> list:
+        """
+        Splices the buffered items into the list.
+
+        Returns:
+            the list, for convenience
+        """
+        if self.prepended:
+            self.prepended.reverse()
+            self.items[:0] = self.prepended
+        self.items.extend(self.appended)
+        return self.items
+
+
+def _find_by_key(splice: _ListSplice, key: str) -> Tuple[list, int]:
+    """
+    Finds the element for a `field=value` list override key.
+
+    Raises:
+        IndexError if no element has the value
+    """
+    field, _, value = key.partition("=")
+    found = splice.find(field, value, as_text=True)
+    if found is None:
+        raise IndexError(f"Error applying override to '{key}'. No element of the list has '{field}' equal to '{value}'")
+    return found
+
+
+def _apply_list_overrides(
+    src: list,
+    overrides: Iterable[Tuple[Any, Any]],
+    owned: _Owned,
+    plan: Optional[_MergePlan]=None
+) -> list:
+    """
+    Applies `{ index: override }` list element overrides (in order) to the (owned) list `src`. `>` keys append, `<`
+    keys prepend, `field=value` keys override the first element (a dict) whose field is equal to value, and any other
+    key is an index whose element is overridden.
+
+    Returns:
+        `src`, for convenience
+
+    Raises:
+        ValueError if a key isn't an index, or IndexError if an index is out of bounds (or no element has a value)
+    """
+    splice = _ListSplice(src)
+    items = None if plan is None else plan.items
+
+    for key, override in overrides:
+        # preferring type() checks over isinstance() for strictness
+        # i.e., we don't want a bool to be treated as an int
+        if type(key) == str and key.startswith(">"):
+            splice.append(override)
+            continue
+        if type(key) == str and key.startswith("<"):
+            splice.prepend(override)
+            continue
+
+        index = _list_index(key)
+        if index is not None:
+            elements, position = splice.locate(key, index)
+        elif type(key) == str and "=" in key:
+            elements, position = _find_by_key(splice, key)
         else:
-            index_validated = int(key)
-    elif type(key) == int:
-        index_validated = key
-    else:
-        raise ValueError(f"Error applying override to index in list. '{key}' is not an integer")
+            raise ValueError(f"Error applying override to index in list. '{key}' is not an integer")
 
-    try:
-        current = src[index_validated]
-    except IndexError:
-        raise IndexError(
-            f"Error applying override to out of bounds index {key}. List is only {len(src)} elements long"
-        )
+        splice.update(elements, position, lambda current: _override_value(current, override, owned, items))
 
-    # overriding a list element at a nested dict level
-    if isinstance(current, dict):
-        src[index_validated] = unify_overrides(override, current)
+    return splice.finish()
 
-    # overriding a list element with another list element override
-    # (we can't just call unify_overrides because it doesn't support lists)
-    elif isinstance(current, list) and isinstance(override, dict):
-        for sub_override_idx, sub_override_val in override.items():
-            _list_element_override_with_error_messaging(current, sub_override_idx, sub_override_val)
 
-    # atomic list element override
-    else:
-        src[index_validated] = override
+def _merge_by_key(src: list, override: list, owned: _Owned, plan: _MergePlan) -> list:
+    """
+    Merges each element of `override` into the element of the (owned) list `src` with the same `plan.key` value, or
+    appends it if there is none (or if it has no such key).
 
+    Returns:
+        `src`, for convenience
+    """
+    splice = _ListSplice(src)
+    key = typing.cast(str, plan.key)
 
-def unify_overrides(*overrides: Dict) -> Dict:
+    for element in override:
+        found = splice.find(key, element[key]) if isinstance(element, dict) and key in element else None
+        if found is None:
+            splice.append(element)
+        else:
+            elements, position = found
+            splice.update(elements, position, lambda current: _override_value(current, element, owned, plan.items))
+
+    return splice.finish()
+
+
+def _override_value(current: Any, override: Any, owned: _Owned, plan: Optional[_MergePlan]) -> Any:
+    """
+    Returns the result of overriding `current` with `override`, copying any input container before modifying it.
+    """
+    if isinstance(override, dict):
+        # recursive override at lower dict level
+        if isinstance(current, dict):
+            return _merge_dict(_own(current, owned), override, owned, plan)
+
+        # override a list element: if we are targeting a list with an override like { "n": X }, then index n
+        # should be assigned X
+        if isinstance(current, list):
+            return _apply_list_overrides(_own(current, owned), override.items(), owned, plan)
+
+    # merge a list into a list by key (see: `MergeBy`)
+    elif isinstance(override, list) and isinstance(current, list) and plan is not None and plan.key is not None:
+        return _merge_by_key(_own(current, owned), override, owned, plan)
+
+    # plain assignment (the value is shared with the override, and only copied if a later override modifies it)
+    return override
+
+
+def _merge_dict(unified: dict, override: Dict, owned: _Owned, plan: Optional[_MergePlan]=None) -> dict:
+    """
+    Merges `override` into the (owned) `unified` dictionary in-place, copying any input container before modifying it.
+
+    Returns:
+        `unified`, for convenience
+    """
+    for key, value in override.items():
+        if isinstance(value, (dict, list)):
+            unified[key] = _override_value(unified.get(key), value, owned, _child_plan(plan, key))
+        else:
+            unified[key] = value
+
+    return unified
+
+
+class _Operation(NamedTuple):
+    """
+    A single step of an `OverridePatch`: assigns (or merges) `value` at `key` of the container at `depth` of the path.
+    """
+
+    kind: str
+    """ "set", "merge", "index", "append" or "prepend": how `key` applies to a list (within a dict, it's just a key) """
+
+    depth: int
+    """ the depth of the container being modified (the patched dict is at depth 0) """
+
+    key: Any
+    """ the dict key, or the list index """
+
+    index: Any
+    """ `key` as a list index (only for "index" operations, and "merge" operations whose key is an index) """
+
+    value: Any
+    """ the value to assign. For "merge", the entire dict, which is assigned if its target can't be merged into """
+
+    span: int
+    """ the number of operations nested within this one (i.e., skipped when the value is assigned atomically) """
+
+
+def _list_index(key: Any) -> Any:
+    """
+    Parses a list override key as an index, or returns None if it isn't one. See: `_apply_list_overrides`.
+    """
+    if type(key) == int:
+        return key
+    if type(key) == str and not key.startswith((">", "<")):
+        try:
+            return int(key)
+        except ValueError:
+            return None
+    return None
+
+
+def _operation_kind(key: Any, value: Any) -> str:
+    """
+    Returns the kind of `_Operation` that overrides `key` with `value`.
+    """
+    if type(key) == str and key.startswith(">"):
+        return "append"
+    if type(key) == str and key.startswith("<"):
+        return "prepend"
+    if isinstance(value, dict):
+        return "merge"
+    return "index" if _list_index(key) is not None else "set"
+
+
+def _is_order_sensitive(override: Dict) -> bool:
+    """
+    Checks whether applying an override dict to a list might depend on the order of its keys, or on the overrides
+    applied before it: i.e., it appends, prepends, finds an element by key, uses a negative index, or targets the same
+    index with several keys.
+    """
+    indices = set()
+
+    for key in override:
+        index = _list_index(key)
+        if index is None:
+            if type(key) == str and (key.startswith((">", "<")) or "=" in key):
+                return True
+            continue
+
+        if index < 0 or index in indices:
+            return True
+        indices.add(index)
+
+    return False
+
+
+def _fold(lower: Dict, higher: Dict) -> Optional[Dict]:
+    """
+    Merges two override dicts into one, which has the same effect as applying `lower` and then `higher` to any
+    configuration (whether each level turns out to be a dict or a list). Returns None when that can't be guaranteed.
+    """
+    if _is_order_sensitive(lower) or _is_order_sensitive(higher):
+        return None
+
+    indices = {_list_index(key): key for key in lower}
+    folded = dict(lower)
+
+    for key, value in higher.items():
+        index = _list_index(key)
+        if index is not None and index in indices and type(indices[index]) != type(key):
+            return None # e.g., "0" and 0 both target the first element of a list, but in a different order
+
+        if key not in lower:
+            folded[key] = value
+            continue
+
+        current = folded[key]
+        if isinstance(current, dict) != isinstance(value, dict) or isinstance(current, list) or isinstance(value, list):
+            # applying `value` depends on what `current` replaced (e.g., a dict merges into a dict but replaces a
+            # scalar, and a list may be merged by key), or `current` might fail to apply (e.g., an out of bounds list
+            # index) before it's replaced
+            return None
+        if isinstance(value, dict):
+            value = _fold(current, value)
+            if value is None:
+                return None
+
+        folded[key] = value
+
+    return folded
+
+
+def _compile_dict(override: Dict, depth: int, operations: List[_Operation]) -> None:
+    """
+    Appends the operations of an override dict (at the given depth) to `operations`, in pre-order.
+    """
+    for key, value in override.items():
+        position = len(operations)
+        operations.append(_Operation(_operation_kind(key, value), depth, key, _list_index(key), value, 0))
+
+        if isinstance(value, dict):
+            _compile_dict(value, depth + 1, operations)
+            operations[position] = operations[position]._replace(span=len(operations) - position - 1)
+
+
+def _program(operations: Sequence[_Operation]) -> Tuple[_Operation, ...]:
+    """
+    Optimizes compiled operations for `_run`: each run of (two or more) consecutive scalar values for the same
+    container is preceded by an "update" operation, which assigns all of them at once if the container is a dict (or
+    is skipped if it's a list, so that the individual operations are applied instead).
+    """
+    program: List[_Operation] = []
+    enclosing: List[int] = [] # the positions of the operations whose dict value contains the current operation
+
+    def close(position: int) -> None:
+        program[position] = program[position]._replace(span=len(program) - position - 1)
+
+    i = 0
+    while i < len(operations):
+        operation = operations[i]
+        while len(enclosing) > operation.depth:
+            close(enclosing.pop())
+
+        end = i
+        while end < len(operations) and operations[end].depth == operation.depth \
+                and not isinstance(operations[end].value, (dict, list)):
+            end += 1
+
+        if end - i >= 2:
+            values = {op.key: op.value for op in operations[i:end]}
+            program.append(_Operation("update", operation.depth, None, None, values, end - i))
+            program.extend(operations[i:end])
+            i = end
+            continue
+
+        program.append(operation)
+        if isinstance(operation.value, dict):
+            enclosing.append(len(program) - 1)
+        i += 1
+
+    while enclosing:
+        close(enclosing.pop())
+
+    return tuple(program)
+
+
+def _run(
+    program: Sequence[_Operation],
+    start: int,
+    end: int,
+    target: Union[dict, list],
+    owned: _Owned,
+    plan: Optional[_MergePlan]=None
+) -> Any:
+    """
+    Applies `program[start:end]` (the operations on one container, followed by their nested operations) to the
+    (owned) `target`, with the same semantics as `_merge_dict` and `_apply_list_overrides`.
+
+    Returns:
+        `target`, for convenience
+    """
+    if isinstance(target, list):
+        return _run_list(program, start, end, target, owned, plan)
+
+    i = start
+    while i < end:
+        kind, _, key, _, value, span = program[i]
+        i += 1
+
+        if kind == "update":
+            if plan is not None:
+                continue # each of the values is applied individually, in case a list is merged by key
+            target.update(value)
+        elif isinstance(value, dict) and isinstance(target.get(key), (dict, list)):
+            target[key] = _run(program, i, i + span, _own(target[key], owned), owned, _child_plan(plan, key))
+        elif isinstance(value, list) and plan is not None:
+            target[key] = _override_value(target.get(key), _fresh(value), owned, _child_plan(plan, key))
+        else:
+            target[key] = _fresh(value)
+
+        i += span
+
+    return target
+
+
+def _run_list(
+    program: Sequence[_Operation],
+    start: int,
+    end: int,
+    target: list,
+    owned: _Owned,
+    plan: Optional[_MergePlan]
+) -> list:
+    """
+    `_run` for a list, which applies the operations in a single pass (see: `_ListSplice`).
+    """
+    splice = _ListSplice(target)
+    items = None if plan is None else plan.items
+
+    i = start
+    while i < end:
+        kind, _, key, index, value, span = program[i]
+        i += 1
+
+        if kind == "update":
+            continue # each of the values is applied individually
+
+        if kind == "append":
+            splice.append(_fresh(value))
+            i += span
+            continue
+        if kind == "prepend":
+            splice.prepend(_fresh(value))
+            i += span
+            continue
+
+        if index is not None:
+            elements, position = splice.locate(key, index)
+        elif type(key) == str and "=" in key:
+            elements, position = _find_by_key(splice, key)
+        else:
+            raise ValueError(f"Error applying override to index in list. '{key}' is not an integer")
+
+        if kind == "merge" and isinstance(elements[position], (dict, list)):
+            first, last = i, i + span
+            splice.update(
+                elements, position, lambda current: _run(program, first, last, _own(current, owned), owned, items)
+            )
+        else:
+            splice.update(elements, position, lambda current: _override_value(current, _fresh(value), owned, items))
+
+        i += span
+
+    return splice.finish()
+
+
+class OverridePatch:
+    """
+    An override compiled into a flat list of path operations, which can be applied to many configurations without
+    interpreting the override (i.e., its nesting, list index keys and `>`/`<` keys) again.
+
+    E.g.,
+    ```
+    patch = OverridePatch.compile(deployment_override, region_override)
+    configs = {
+        tenant: load_configuration(MyConfig, [tenant_override, patch], evaluators)
+        for tenant, tenant_override in tenant_overrides.items()
+    }
+    ```
+
+    Applying a patch is equivalent to unifying its overrides: `patch.apply(base) == unify_overrides(*overrides, base)`.
+    A patch can be given anywhere an override dict can (e.g., to `unify_overrides` or `load_configuration`). Patches
+    are immutable, composable (see: `compose`) and serializable (see: `to_operations`, or pickle).
+    """
+
+    __slots__ = ("_operations", "_program")
+
+    def __init__(self, operations: Iterable[_Operation]=()):
+        self._operations: Tuple[_Operation, ...] = tuple(operations)
+        self._program = _program(self._operations)
+
+    @classmethod
+    def compile(cls, *overrides: Union[Dict, "OverridePatch"]) -> "OverridePatch":
+        """
+        Compiles the overrides into a patch. The overrides are copied, so modifying them afterwards doesn't affect the
+        patch.
+
+        Consecutive override dicts are folded together when that doesn't change the result (e.g., unless they append
+        or prepend to the same list), so the patch applies them in a single pass. If several of the overrides are
+        invalid (e.g., an out of bounds list index), the error raised may differ from `unify_overrides`.
+
+        Args:
+            overrides:  descending order of precedence (like `unify_overrides`)
+
+        Returns:
+            the patch
+        """
+        operations: List[_Operation] = []
+        pending: Optional[Dict] = None # consecutive override dicts, folded together
+
+        for override in reversed(overrides):
+            if isinstance(override, OverridePatch):
+                if pending is not None:
+                    _compile_dict(pending, 0, operations)
+                    pending = None
+                operations.extend(override._operations)
+                continue
+
+            override = deepcopy(override)
+            folded = None if pending is None else _fold(pending, override)
+            if folded is None:
+                if pending is not None:
+                    _compile_dict(pending, 0, operations)
+                folded = override
+            pending = folded
+
+        if pending is not None:
+            _compile_dict(pending, 0, operations)
+
+        return cls(operations)
+
+    @classmethod
+    def compose(cls, *patches: "OverridePatch") -> "OverridePatch":
+        """
+        Combines patches into one, which applies all of them.
+
+        Args:
+            patches:    descending order of precedence (like `unify_overrides`)
+
+        Returns:
+            the combined patch
+        """
+        return cls.compile(*patches)
+
+    def apply(self, base: Dict) -> Dict:
+        """
+        Applies the patch to `base`, which isn't modified. The result shares the subtrees that the patch doesn't touch
+        with `base` (see: `unify_overrides`), but never the patch's own values (which are copied), so modifying the
+        result can't change the patch.
+
+        Returns:
+            the patched dictionary
+        """
+        return unify_overrides(self, base)
+
+    def to_operations(self) -> List[List[Any]]:
+        """
+        Serializes the patch as a list of `[kind, depth, key, value]` operations, in which a dict value is empty (since
+        its contents are the operations that follow, one level deeper). It's JSON serializable when the override
+        values are.
+
+        Returns:
+            the operations, which `from_operations` compiles back into a patch
+        """
+        return [
+            [op.kind, op.depth, op.key, {} if isinstance(op.value, dict) else _fresh(op.value)]
+            for op in self._operations
+        ]
+
+    @classmethod
+    def from_operations(cls, operations: Iterable[Sequence[Any]]) -> "OverridePatch":
+        """
+        Deserializes a patch serialized by `to_operations`.
+
+        Raises:
+            ValueError if the operations are malformed
+        """
+        compiled: List[_Operation] = []
+        enclosing: List[int] = [] # the positions of the operations whose dict value contains the current operation
+
+        def close(position: int) -> None:
+            compiled[position] = compiled[position]._replace(span=len(compiled) - position - 1)
+
+        for kind, depth, key, value in operations:
+            if not 0 <= depth <= len(enclosing):
+                raise ValueError(f"Malformed override patch: the operation on '{key}' at depth {depth} has no parent")
+            if kind != _operation_kind(key, value):
+                raise ValueError(f"Malformed override patch: the operation on '{key}' is not a '{kind}'")
+
+            while len(enclosing) > depth:
+                close(enclosing.pop())
+
+            if isinstance(value, dict):
+                value = {}
+                enclosing.append(len(compiled))
+            else:
+                value = _fresh(value)
+            if depth > 0:
+                compiled[enclosing[depth - 1]].value[key] = value
+
+            compiled.append(_Operation(kind, depth, key, _list_index(key), value, 0))
+
+        while enclosing:
+            close(enclosing.pop())
+
+        return cls(compiled)
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, OverridePatch) and self._operations == other._operations
+
+    def __hash__(self) -> int:
+        return hash(len(self._operations))
+
+    def __repr__(self) -> str:
+        return f"OverridePatch({self.to_operations()!r})"
+
+    def __getstate__(self) -> Tuple[_Operation, ...]:
+        return self._operations
+
+    def __setstate__(self, state: Tuple[_Operation, ...]) -> None:
+        self.__init__(state) # pylint: disable=unnecessary-dunder-call
+
+
+def unify_overrides(*overrides: Union[Dict, OverridePatch], model: Optional[Type[BaseModel]]=None) -> Dict:
     """
     Configuration overrides are unified by merging them together at a dictionary-key level. This means that if a key
     is present in multiple overrides, the last one will take precedence. Overrides are always performed at the lowest
     dictionary level possible.
 
+    The overrides are never modified. Subtrees which no other override touches are shared with the override they came
+    from (rather than copied), and only the dicts and lists on the way to an overridden value are copied (once). So
+    treat the nested values of the result as read-only.
+
     Args:
-        overrides: descending order of precedence
+        overrides: descending order of precedence. Each is an override dict, or a compiled `OverridePatch`
+        model:     the configuration class, whose `MergeBy` annotations are applied (by default, none are)
 
     Returns:
         the unified override dictionary
     """
-    unified = {}
+    unified: Dict = {}
+    owned: _Owned = {id(unified): unified}
+    plan = None if model is None else _merge_plan(model)
 
     for override in reversed(overrides):
-        for key, value in override.items():
-            # recursive override at lower dict level
-            if key in unified and isinstance(value, dict) and isinstance(unified[key], dict):
-                unified[key] = unify_overrides(value, unified[key])
-                continue
-
-            # override a list element: if we are targeting a list with an override like { "n": X }, then index n
-            # should be assigned X
-            if key in unified and isinstance(unified[key], list) and isinstance(value, dict):
-                for element_idx, element_override in value.items():
-                    _list_element_override_with_error_messaging(unified[key], element_idx, element_override)
-                continue
-
-            # plain assignment
-            unified[key] = value
+        if isinstance(override, OverridePatch):
+            program = override._program # pylint: disable=protected-access
+            _run(program, 0, len(program), unified, owned, plan)
+        else:
+            _merge_dict(unified, override, owned, plan)
 
     return unified
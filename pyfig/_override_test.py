@@ -1,6 +1,15 @@
+import json
+import pickle
+import random
+from copy import deepcopy
+from typing import Dict, List, Optional
+
 import pytest
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
 
-from ._override import unify_overrides
+from ._override import MergeBy, OverridePatch, unify_overrides
+from ._pyfig import Pyfig
 
 
 def test__given_no_overrides__when_unify_overrides__then_returns_empty_dict():
@@ -429,3 +438,360 @@ def test__given_all_list_overrides__when_unify_overrides__then_handles_all():
             { "item": "Buns",    "qty": 4 },
         ]
     }
+
+@pytest.mark.parametrize("override", [
+    { "cart": { "0": { "qty": 10 }, ">": { "item": "Buns" }, "<": { "item": "Plate" } } },
+    { "cart": { "1": { "tags": { "0": "crispy", ">": "smoked" } } } },
+    { "cart": [{ "item": "Buns" }], "store": { "name": "Corner", "address": { "city": "Toronto" } } },
+])
+def test__given_overrides__when_unify_overrides__then_inputs_are_not_modified(override):
+    conf = {
+        "cart": [
+            { "item": "Bacon", "qty": 1 },
+            { "item": "Lettuce", "tags": ["fresh", "green"] },
+        ],
+        "store": { "name": "Market", "address": { "city": "Ottawa", "street": "Main" } },
+    }
+    originals = deepcopy((override, conf))
+
+    unify_overrides(override, conf)
+
+    assert (override, conf) == originals
+
+def test__given_small_override__when_unify_overrides__then_untouched_subtrees_are_shared():
+    conf = {
+        "store": { "name": "Market", "address": { "city": "Ottawa" }, "hours": { "open": 9 } },
+        "cart": [{ "item": "Bacon" }, { "item": "Lettuce" }],
+        "other": { "big": list(range(100)) },
+    }
+    override = { "store": { "address": { "city": "Toronto" } }, "cart": { "1": { "qty": 2 } } }
+
+    unified = unify_overrides(override, conf)
+
+    assert unified["other"] is conf["other"]
+    assert unified["store"]["hours"] is conf["store"]["hours"]
+    assert unified["cart"][0] is conf["cart"][0]
+    assert unified["store"] is not conf["store"] and unified["cart"] is not conf["cart"]
+    assert unified["store"]["address"] == { "city": "Toronto" }
+    assert unified["cart"][1] == { "item": "Lettuce", "qty": 2 }
+
+def test__given_many_overrides_of_same_list__when_unify_overrides__then_all_apply_to_one_copy():
+    conf = { "list": [1, 2, 3] }
+    overrides = [{ "list": { ">": i } } for i in range(4, 7)]
+
+    unified = unify_overrides(*reversed(overrides), conf)
+
+    assert unified == { "list": [1, 2, 3, 4, 5, 6] }
+    assert conf == { "list": [1, 2, 3] }
+
+def test__given_list_element_dict_overridden_by_non_dict__when_unify_overrides__then_replaced_atomically():
+    conf = { "list": [{ "a": 1 }, { "b": 2 }] }
+    override = { "list": { "0": "replaced" } }
+
+    assert unify_overrides(override, conf) == { "list": ["replaced", { "b": 2 }] }
+
+
+_PATCH_BASE = {
+    "name": "app",
+    "store": { "name": "Market", "address": { "city": "Ottawa" } },
+    "cart": [
+        { "item": "Bacon", "qty": 1 },
+        { "item": "Lettuce", "tags": ["fresh", "green"] },
+    ],
+    "matrix": [[1, 2], [3, 4]],
+    "nothing": None,
+}
+
+_PATCH_OVERRIDES = [
+    {},
+    { "name": "other" },
+    { "store": { "address": { "city": "Toronto", "zip": "M5V" } } },
+    { "store": "closed", "nothing": { "now": "something" } },
+    { "cart": { "0": { "qty": 10 }, -1: { "tags": { "0": "crispy", ">": "smoked" } } } },
+    { "cart": { ">": { "item": "Buns" }, "<": { "item": "Plate" }, ">>": { "item": "Napkin" } } },
+    { "cart": [{ "item": "Buns" }], "new": { ">": 1, "0": 2 } },
+    { "matrix": { "1": { "0": 30 }, "0": [5] } },
+    { "cart": { "1": "replaced" } },
+]
+
+
+@pytest.mark.parametrize("override", _PATCH_OVERRIDES)
+def test__given_override__when_compiled_patch_applied__then_same_as_unify_overrides(override):
+    originals = deepcopy((override, _PATCH_BASE))
+    patch = OverridePatch.compile(override)
+
+    assert patch.apply(_PATCH_BASE) == unify_overrides(override, _PATCH_BASE)
+    assert patch.apply(_PATCH_BASE) == unify_overrides(override, _PATCH_BASE)
+    assert (override, _PATCH_BASE) == originals
+
+@pytest.mark.parametrize("override, error", [
+    ({ "cart": { "5": { "qty": 1 } } }, IndexError),
+    ({ "cart": { "-3": 1 } }, IndexError),
+    ({ "cart": { "first": 1 } }, ValueError),
+    ({ "cart": { "first": { "qty": 1 } } }, ValueError),
+    ({ "cart": { True: 1 } }, ValueError),
+    ({ "cart": { 1.0: 1 } }, ValueError),
+])
+def test__given_invalid_list_override__when_compiled_patch_applied__then_raises_like_unify_overrides(override, error):
+    with pytest.raises(error):
+        unify_overrides(override, _PATCH_BASE)
+    with pytest.raises(error):
+        OverridePatch.compile(override).apply(_PATCH_BASE)
+
+def test__given_many_overrides__when_compiled_together_or_composed__then_same_as_unify_overrides():
+    overrides = _PATCH_OVERRIDES[1:6]
+    expected = unify_overrides(*overrides, _PATCH_BASE)
+
+    assert OverridePatch.compile(*overrides).apply(_PATCH_BASE) == expected
+    assert OverridePatch.compose(*(OverridePatch.compile(o) for o in overrides)).apply(_PATCH_BASE) == expected
+    assert unify_overrides(overrides[0], OverridePatch.compile(*overrides[1:]), _PATCH_BASE) == expected
+
+def test__given_compiled_override__when_override_modified__then_patch_is_unaffected():
+    override = { "store": { "address": { "city": "Toronto" } } }
+    patch = OverridePatch.compile(override)
+
+    override["store"]["address"]["city"] = "Montreal"
+
+    assert patch.apply(_PATCH_BASE)["store"]["address"]["city"] == "Toronto"
+
+@pytest.mark.parametrize("override,base,path", [
+    ({ "a": { "b": [1] } },                             {},                         ["a", "b"]),
+    ({ "a": { "b": [1] } },                             { "a": { "b": 0 } },        ["a", "b"]),
+    ({ "a": { "b": [1], "c": 2 } },                     { "a": {} },                ["a", "b"]),
+    ({ "a": { ">new": { "b": [1] } } },                 { "a": [] },                ["a", 0, "b"]),
+    ({ "a": { "<new": [1] } },                          { "a": [0] },               ["a", 0]),
+    ({ "a": { "0": { "b": [1] } } },                    { "a": [0] },               ["a", 0, "b"]),
+    ({ "a": { "0": [1] } },                             { "a": [0] },               ["a", 0]),
+])
+def test__given_applied_patch__when_result_modified__then_patch_is_unaffected(override, base, path):
+    patch = OverridePatch.compile(override)
+    expected, operations = patch.apply(base), patch.to_operations()
+
+    result = patch.apply(base)
+    target = result
+    for key in path:
+        target = target[key]
+    target.append(2)
+
+    assert patch.apply(base) == expected
+    assert patch.to_operations() == operations
+    assert result != expected
+
+def test__given_patch_operations__when_modified__then_patch_is_unaffected():
+    operations = [["set", 0, "a", [1]]]
+    patch = OverridePatch.from_operations(operations)
+
+    operations[0][3].append(2)
+    patch.to_operations()[0][3].append(3)
+
+    assert patch.apply({}) == { "a": [1] }
+
+def test__given_patch__when_serialized_as_json__then_deserializes_to_equal_patch():
+    patch = OverridePatch.compose(*(OverridePatch.compile(o) for o in _PATCH_OVERRIDES[1:8]))
+
+    restored = OverridePatch.from_operations(json.loads(json.dumps(patch.to_operations())))
+
+    assert restored == patch
+    assert restored.apply(_PATCH_BASE) == patch.apply(_PATCH_BASE)
+
+def test__given_patch__when_pickled__then_unpickles_to_equal_patch():
+    patch = OverridePatch.compile(*_PATCH_OVERRIDES)
+
+    assert pickle.loads(pickle.dumps(patch)) == patch
+
+@pytest.mark.parametrize("operations", [
+    [["set", 1, "a", 1]],
+    [["merge", 0, "a", {}], ["set", 2, "b", 1]],
+    [["set", 0, "a", {}]],
+    [["append", 0, "0", 1]],
+])
+def test__given_malformed_operations__when_from_operations__then_raises_valueerror(operations):
+    with pytest.raises(ValueError):
+        OverridePatch.from_operations(operations)
+
+def _random_value(rng: random.Random, depth: int):
+    choice = rng.random()
+    if depth >= 3 or choice < 0.4:
+        return rng.choice([1, 2, "s", None, [1, 2], [{ "x": 1 }, { "y": 2 }], [[1], [2, 3]]])
+    keys = ["0", "1", 0, 1, "-1", -2, ">", "<", ">>", "x", "y", "z"]
+    return { rng.choice(keys): _random_value(rng, depth + 1) for _ in range(rng.randint(0, 4)) }
+
+def _outcome(fn):
+    try:
+        return fn()
+    except (IndexError, ValueError) as error:
+        return type(error)
+
+def test__given_random_overrides__when_compiled_together__then_same_as_unify_overrides():
+    rng = random.Random(1234)
+
+    for _ in range(3000):
+        base = { "a": _random_value(rng, 1), "b": [{ "x": 1 }, [1, 2], 3], "c": { "x": [1, 2, 3] } }
+        overrides = [
+            { rng.choice("abc"): _random_value(rng, 1) for _ in range(rng.randint(1, 3)) }
+            for _ in range(rng.randint(1, 4))
+        ]
+        originals = deepcopy((base, overrides))
+
+        expected = _outcome(lambda: unify_overrides(*overrides, base))
+        assert _outcome(lambda: OverridePatch.compile(*overrides).apply(base)) == expected, overrides
+        assert (base, overrides) == originals
+
+def _insert_one_at_a_time(items: list, override: dict) -> list:
+    items = list(items)
+    for key, value in override.items():
+        if key.startswith(">"):
+            items.append(value)
+        elif key.startswith("<"):
+            items.insert(0, value)
+        else:
+            items[int(key)] = value
+    return items
+
+def test__given_random_list_overrides__when_unify_overrides__then_same_as_inserting_one_at_a_time():
+    rng = random.Random(4321)
+
+    for _ in range(2000):
+        items = list(range(rng.randint(0, 5)))
+        override = {}
+        for i in range(rng.randint(1, 8)):
+            kind = rng.choice("<>i")
+            key = str(rng.randint(-8, 8)) if kind == "i" else f"{kind}{i}"
+            override[key] = f"value {i}"
+
+        expected = _outcome(lambda: _insert_one_at_a_time(items, override))
+        assert _outcome(lambda: unify_overrides({ "list": override }, { "list": items })["list"]) == expected
+        assert _outcome(lambda: OverridePatch.compile({ "list": override }).apply({ "list": items })["list"]) \
+            == expected
+
+def test__given_many_prepends_and_appends__when_unify_overrides__then_order_is_preserved():
+    conf = { "list": list(range(1000)) }
+    override = { "list": { **{ f"<{i}": -i for i in range(500) }, **{ f">{i}": 1000 + i for i in range(500) } } }
+
+    assert unify_overrides(override, conf)["list"] == [-i for i in reversed(range(500))] + list(range(1500))
+    assert conf == { "list": list(range(1000)) }
+
+
+
+@pytest.mark.parametrize("key, expected", [
+    ("name=b", [{ "name": "a" }, { "name": "b", "qty": 5 }, { "name": "c", "id": 3 }, { "name": "b" }]),
+    ("id=3", [{ "name": "a" }, { "name": "b" }, { "name": "c", "id": 3, "qty": 5 }, { "name": "b" }]),
+])
+def test__given_field_value_key__when_unify_overrides__then_first_matching_element_is_overridden(key, expected):
+    conf = { "list": [{ "name": "a" }, { "name": "b" }, { "name": "c", "id": 3 }, { "name": "b" }] }
+    override = { "list": { key: { "qty": 5 } } }
+
+    assert unify_overrides(override, conf)["list"] == expected
+    assert OverridePatch.compile(override).apply(conf)["list"] == expected
+
+@pytest.mark.parametrize("override", [
+    { "list": { "name=missing": { "qty": 5 } } },
+    { "list": { "qty=1": { "qty": 5 } } },
+])
+def test__given_field_value_key_without_match__when_unify_overrides__then_raises_indexerror(override):
+    conf = { "list": [{ "name": "a" }, "not a dict"] }
+
+    with pytest.raises(IndexError):
+        unify_overrides(override, conf)
+    with pytest.raises(IndexError):
+        OverridePatch.compile(override).apply(conf)
+
+def test__given_field_value_keys_with_other_list_overrides__when_unify_overrides__then_applied_in_order():
+    conf = { "list": [{ "name": "a" }, { "name": "b" }] }
+    override = { "list": {
+        "<": { "name": "c" },
+        "name=c": { "qty": 1 },
+        "name=a": { "name": "renamed" },
+        "name=renamed": { "qty": 2 },
+        "0": { "name": "b" },
+        "name=b": { "qty": 3 },
+    } }
+
+    expected = [{ "name": "b", "qty": 3 }, { "name": "renamed", "qty": 2 }, { "name": "b" }]
+    assert unify_overrides(override, conf)["list"] == expected
+    assert OverridePatch.compile(override).apply(conf)["list"] == expected
+
+
+class _Step(BaseModel):
+    name: str
+    command: str = ""
+    enabled: bool = True
+
+class _Pipeline(BaseModel):
+    name: str
+    steps: Annotated[List[_Step], MergeBy("name")] = []
+
+class _MergeConfig(Pyfig):
+    pipelines: Annotated[List[_Pipeline], MergeBy("name")] = []
+    by_env: Dict[str, _Pipeline] = {}
+    optional: Optional[Annotated[List[_Step], MergeBy("name")]] = None
+    aliased: Annotated[List[_Step], MergeBy("name")] = Field(default=[], alias="steps")
+    positional: List[_Step] = []
+
+_MERGE_BASE = {
+    "pipelines": [
+        { "name": "build", "steps": [{ "name": "compile", "command": "make" }, { "name": "lint", "command": "ruff" }] },
+        { "name": "test", "steps": [] },
+    ],
+    "by_env": { "prod": { "name": "deploy", "steps": [{ "name": "push", "command": "git push" }] } },
+    "optional": [{ "name": "a" }],
+    "steps": [{ "name": "a" }],
+    "positional": [{ "name": "a" }],
+}
+
+@pytest.mark.parametrize("override, expected", [
+    (
+        { "pipelines": [{ "name": "build", "steps": [{ "name": "lint", "enabled": False }] }] },
+        { "pipelines": [
+            { "name": "build", "steps": [
+                { "name": "compile", "command": "make" },
+                { "name": "lint", "command": "ruff", "enabled": False },
+            ] },
+            { "name": "test", "steps": [] },
+        ] },
+    ),
+    (
+        { "pipelines": [{ "name": "release" }, { "command": "keyless" }, { "name": "test", "steps": [{ "name": "unit" }] }] },
+        { "pipelines": [
+            _MERGE_BASE["pipelines"][0],
+            { "name": "test", "steps": [{ "name": "unit" }] },
+            { "name": "release" },
+            { "command": "keyless" },
+        ] },
+    ),
+    (
+        { "pipelines": { "name=build": { "steps": [{ "name": "package" }] } } },
+        { "pipelines": [
+            { "name": "build", "steps": [*_MERGE_BASE["pipelines"][0]["steps"], { "name": "package" }] },
+            _MERGE_BASE["pipelines"][1],
+        ] },
+    ),
+    (
+        { "by_env": { "prod": { "steps": [{ "name": "push", "command": "git push --force" }] } } },
+        { "by_env": { "prod": { "name": "deploy", "steps": [{ "name": "push", "command": "git push --force" }] } } },
+    ),
+    ({ "optional": [{ "name": "a", "enabled": False }] }, { "optional": [{ "name": "a", "enabled": False }] }),
+    ({ "steps": [{ "name": "b" }] }, { "steps": [{ "name": "a" }, { "name": "b" }] }),
+    ({ "positional": [{ "name": "b" }] }, { "positional": [{ "name": "b" }] }),
+])
+def test__given_merge_by_field__when_unify_overrides_with_model__then_list_is_merged_by_key(override, expected):
+    originals = deepcopy((override, _MERGE_BASE))
+
+    unified = unify_overrides(override, _MERGE_BASE, model=_MergeConfig)
+
+    assert unified == { **_MERGE_BASE, **expected }
+    assert OverridePatch.compile(override).apply(_MERGE_BASE) == unify_overrides(override, _MERGE_BASE)
+    assert unify_overrides(OverridePatch.compile(override), _MERGE_BASE, model=_MergeConfig) == unified
+    assert (override, _MERGE_BASE) == originals
+
+def test__given_merge_by_field__when_unify_overrides_without_model__then_list_is_replaced():
+    override = { "pipelines": [{ "name": "build" }] }
+
+    assert unify_overrides(override, _MERGE_BASE)["pipelines"] == [{ "name": "build" }]
+
+def test__given_many_lists_merged_by_key__when_compiled_together__then_none_are_folded_away():
+    overrides = [{ "steps": [{ "name": "c" }] }, { "steps": [{ "name": "b" }] }]
+
+    unified = unify_overrides(OverridePatch.compile(*overrides), _MERGE_BASE, model=_MergeConfig)
+
+    assert unified["steps"] == [{ "name": "a" }, { "name": "b" }, { "name": "c" }]
@@ -0,0 +1,184 @@
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ParserBackend:
+    """
+    A library which is able to parse a particular file format.
+    """
+
+    fmt: str
+    """ the file format, e.g., 'json', 'yaml', or 'toml' """
+
+    name: str
+    """ the name of the implementation, e.g., 'orjson' or 'CSafeLoader' """
+
+    loads: Callable[[bytes], Any]
+    """ parses the raw (utf-8) content of a file """
+
+
+def _orjson() -> Callable[[bytes], Any]:
+    import orjson
+
+    return orjson.loads
+
+
+def _ujson() -> Callable[[bytes], Any]:
+    import ujson
+
+    def loads(data: bytes) -> Any:
+        try:
+            return ujson.loads(data)
+        except ValueError as exc:
+            # consistent with the other backends (orjson's error is also a json.JSONDecodeError)
+            raise json.JSONDecodeError(str(exc), "", 0) from exc
+
+    return loads
+
+
+def _stdlib_json() -> Callable[[bytes], Any]:
+    return json.loads
+
+
+def _yaml_loader(loader_name: str) -> Callable[[], Callable[[bytes], Any]]:
+    def factory() -> Callable[[bytes], Any]:
+        import yaml
+
+        loader = getattr(yaml, loader_name, None)
+        if loader is None:
+            # CSafeLoader only exists when pyyaml was built against libyaml
+            raise ImportError(f"yaml.{loader_name} is not available")
+
+        return lambda data: yaml.load(data, Loader=loader)
+
+    return factory
+
+
+def _tomllib() -> Callable[[bytes], Any]:
+    # built-in since v3.11
+    import tomllib
+
+    return lambda data: tomllib.loads(data.decode("utf-8"))
+
+
+def _tomli() -> Callable[[bytes], Any]:
+    import tomli
+
+    return lambda data: tomli.loads(data.decode("utf-8"))
+
+
+def _toml() -> Callable[[bytes], Any]:
+    import toml
+
+    return lambda data: toml.loads(data.decode("utf-8"))
+
+
+_CANDIDATES: Dict[str, List[Tuple[str, Callable[[], Callable[[bytes], Any]]]]] = {
+    "json": [("orjson", _orjson), ("ujson", _ujson), ("json", _stdlib_json)],
+    "yaml": [("CSafeLoader", _yaml_loader("CSafeLoader")), ("SafeLoader", _yaml_loader("SafeLoader"))],
+    "toml": [("tomllib", _tomllib), ("tomli", _tomli), ("toml", _toml)],
+}
+"""
+The safe parser implementations for each format, fastest first.
+"""
+
+_OPT_IN = frozenset({"orjson", "ujson"})
+"""
+Implementations which are only used when chosen with `set_parser_backend`, since they parse some documents differently
+from the standard library's `json`. E.g., orjson rounds a 30-digit integer to a float, and rejects `NaN` and `1e400`.
+Every other implementation gives the same results as the ones after it, so the fastest installed one is selected.
+"""
+
+_NOT_INSTALLED: Dict[str, str] = {
+    "json": "No json support found.",
+    "yaml": "Please install pyyaml to load YAML files.",
+    "toml": "No toml support found. Upgrade to Py>=3.11, or install one of tomli or toml.",
+}
+
+_ACTIVE: Dict[str, ParserBackend] = {}
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _candidates(fmt: str) -> List[Tuple[str, Callable[[], Callable[[bytes], Any]]]]:
+    try:
+        return _CANDIDATES[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown file format '{fmt}'. Expected one of: {', '.join(_CANDIDATES)}") from None
+
+
+def get_parser_backend(fmt: str) -> ParserBackend:
+    """
+    Gets the parser used for a file format. Unless set via `set_parser_backend`, the fastest installed
+    implementation is selected on first use, excluding those which parse differently (i.e., json is parsed by the
+    standard library unless 'orjson' or 'ujson' is chosen).
+
+    Args:
+        fmt:    the file format, one of 'json', 'yaml', or 'toml'
+
+    Raises:
+        ImportError when no implementation is installed
+    """
+    backend = _ACTIVE.get(fmt)
+    if backend is not None:
+        return backend
+
+    for name, factory in _candidates(fmt):
+        if name in _OPT_IN:
+            continue
+        try:
+            backend = ParserBackend(fmt, name, factory())
+            break
+        except ImportError:
+            continue
+    else:
+        raise ImportError(_NOT_INSTALLED[fmt])
+
+    with _ACTIVE_LOCK:
+        return _ACTIVE.setdefault(fmt, backend)
+
+
+def set_parser_backend(fmt: str, name: Optional[str]) -> ParserBackend:
+    """
+    Chooses the implementation used to parse a file format.
+
+    Args:
+        fmt:    the file format, one of 'json', 'yaml', or 'toml'
+        name:   the implementation's name (e.g., 'json', 'orjson', 'ujson', 'CSafeLoader', 'SafeLoader', 'tomllib',
+                'tomli', 'toml'), or None to go back to the automatic selection (see: `get_parser_backend`)
+
+    Returns:
+        the now-active backend
+
+    Raises:
+        ValueError when the format or implementation is unknown
+        ImportError when the implementation isn't installed
+    """
+    if name is None:
+        with _ACTIVE_LOCK:
+            _ACTIVE.pop(fmt, None)
+        return get_parser_backend(fmt)
+
+    factories = dict(_candidates(fmt))
+    if name not in factories:
+        raise ValueError(f"Unknown {fmt} parser '{name}'. Expected one of: {', '.join(factories)}")
+
+    backend = ParserBackend(fmt, name, factories[name]())
+    with _ACTIVE_LOCK:
+        _ACTIVE[fmt] = backend
+    return backend
+
+
+def parser_backends() -> Dict[str, Optional[str]]:
+    """
+    Reports the name of the active parser implementation for each file format, or None if none is installed.
+    """
+    report: Dict[str, Optional[str]] = {}
+    for fmt in _CANDIDATES:
+        try:
+            report[fmt] = get_parser_backend(fmt).name
+        except ImportError:
+            report[fmt] = None
+    return report
@@ -0,0 +1,97 @@
+import json
+import sys
+from typing import Iterator
+
+import pytest
+import yaml
+
+from . import _parsers
+from ._parsers import get_parser_backend, set_parser_backend, parser_backends
+
+
+@pytest.fixture(autouse=True)
+def restore_backends() -> Iterator[None]:
+    active = dict(_parsers._ACTIVE)
+    yield
+    _parsers._ACTIVE.clear()
+    _parsers._ACTIVE.update(active)
+
+
+def test__given_python_version__when_get_toml_backend__then_returns_appropriate_backend():
+    if sys.version_info >= (3, 11):
+        assert get_parser_backend("toml").name == "tomllib"
+    else:
+        assert get_parser_backend("toml").name == "tomli"
+
+def test__given_libyaml__when_get_yaml_backend__then_prefers_c_loader():
+    expected = "CSafeLoader" if getattr(yaml, "__with_libyaml__", False) else "SafeLoader"
+    assert get_parser_backend("yaml").name == expected
+
+@pytest.mark.parametrize("fmt,content,expected", [
+    ("json", b'{ "a": [1, 2.5, null, true] }', {"a": [1, 2.5, None, True]}),
+    ("yaml", b"a:\n  - 1\n  - 2.5\n  - null\n  - true\n", {"a": [1, 2.5, None, True]}),
+    ("toml", b"a = [1, 2]\n[b]\nc = 'caf\xc3\xa9'\n", {"a": [1, 2], "b": {"c": "café"}}),
+])
+def test__given_each_installed_backend__when_loads__then_parses_the_same(fmt: str, content: bytes, expected):
+    for name, factory in _parsers._CANDIDATES[fmt]:
+        try:
+            factory()
+        except ImportError:
+            continue
+
+        assert set_parser_backend(fmt, name).loads(content) == expected
+        assert get_parser_backend(fmt).name == name
+
+@pytest.mark.parametrize("name", [name for name, _ in _parsers._CANDIDATES["json"]])
+def test__given_json_backend__when_loads_malformed__then_raises_json_decode_error(name: str):
+    try:
+        backend = set_parser_backend("json", name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads(b"badjson: missing quotes")
+
+def test__given_yaml_backend__when_loads_unsafe_tag__then_refuses():
+    with pytest.raises(yaml.YAMLError):
+        get_parser_backend("yaml").loads(b"!!python/object/apply:os.system ['echo unsafe']")
+
+def test__given_stdlib_json__when_set_parser_backend__then_reported_as_active():
+    set_parser_backend("json", "json")
+    assert get_parser_backend("json").name == "json"
+    assert parser_backends()["json"] == "json"
+
+def test__given_faster_json_backend_installed__when_get_json_backend__then_uses_stdlib_json(
+        monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(_parsers._CANDIDATES, "json", [("orjson", lambda: json.loads), *_parsers._CANDIDATES["json"]])
+    _parsers._ACTIVE.pop("json", None)
+
+    backend = get_parser_backend("json")
+
+    assert backend.name == "json"
+    assert backend.loads(b"[123456789012345678901234567890, NaN, 1e400]")[0] == 123456789012345678901234567890
+
+def test__given_override__when_set_parser_backend_none__then_reselects_fastest():
+    fastest = get_parser_backend("json").name
+    set_parser_backend("json", "json")
+    assert set_parser_backend("json", None).name == fastest
+
+def test__given_unknown_format_or_name__when_set_parser_backend__then_raises_value_error():
+    with pytest.raises(ValueError):
+        set_parser_backend("xml", "lxml")
+    with pytest.raises(ValueError):
+        set_parser_backend("json", "simdjson")
+    with pytest.raises(ValueError):
+        get_parser_backend("xml")
+
+def test__given_no_implementation_installed__when_get_parser_backend__then_raises_import_error(
+        monkeypatch: pytest.MonkeyPatch):
+    def not_installed():
+        raise ImportError("not installed")
+
+    monkeypatch.setitem(_parsers._CANDIDATES, "yaml", [("missing", not_installed)])
+    _parsers._ACTIVE.pop("yaml", None)
+
+    with pytest.raises(ImportError):
+        get_parser_backend("yaml")
+    assert parser_backends()["yaml"] is None
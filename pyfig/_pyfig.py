@@ -1,8 +1,124 @@
+import functools
 import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple, Type, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 from pydantic_core import PydanticUndefined
 
+from ._fingerprint import models_in, schema_fingerprint
+from ._trusted import construct_trusted
+
+
+P = TypeVar("P", bound="Pyfig")
+
+
+DEFER_DEFAULT_VALIDATION_ENV = "PYFIG_DEFER_DEFAULT_VALIDATION"
+"""
+Setting this environment variable to "1" (or "true") has the same effect as calling `defer_default_validation()`
+before any config class is defined.
+"""
+
+_defer_default_validation = os.environ.get(DEFER_DEFAULT_VALIDATION_ENV, "").strip().lower() in ("1", "true")
+
+_PENDING_DEFAULTS: List[Type["Pyfig"]] = []
+""" the classes whose defaults are not yet validated (in definition order) """
+
+_PENDING_DEFAULTS_LOCK = threading.RLock()
+
+
+def defer_default_validation(enabled: bool=True) -> None:
+    """
+    Controls when the defaults of Pyfig classes are validated.
+
+    By default, defining a Pyfig class validates its defaults immediately (calling any default factories), so bad
+    defaults fail at import time. This can make importing a large config package slow. When deferred, classes defined
+    afterwards are validated when they (or a config containing them) are first instantiated, or all at once by
+    `validate_all_defaults()`.
+
+    Args:
+        enabled:    whether to defer the validation of classes defined from now on
+    """
+    global _defer_default_validation # pylint: disable=global-statement
+    _defer_default_validation = enabled
+
+
+def _validate_pending_defaults(classes: Sequence[Type["Pyfig"]]) -> None:
+    """
+    Validates the defaults of each of the given classes that are still pending.
+
+    Raises:
+        the error of the first class whose defaults are invalid. It (and the classes after it) remain pending
+    """
+    with _PENDING_DEFAULTS_LOCK:
+        for cls in classes:
+            if cls not in _PENDING_DEFAULTS:
+                continue
+
+            # removed first, since instantiating the class validates the pending defaults of its own fields' classes
+            _PENDING_DEFAULTS.remove(cls)
+            try:
+                cls()
+            except Exception:
+                _PENDING_DEFAULTS.append(cls)
+                raise
+
+            setattr(cls, "_pyfig_defaults_validated", True)
+
+
+def validate_all_defaults() -> None:
+    """
+    Validates the defaults of every Pyfig class whose validation was deferred (see: `defer_default_validation`).
+    Useful in a test, or at the end of application startup.
+
+    Raises:
+        the error of the first class whose defaults are invalid
+    """
+    with _PENDING_DEFAULTS_LOCK:
+        _validate_pending_defaults(list(_PENDING_DEFAULTS))
+
+
+def _validating_pending_defaults(init: Callable[..., None]) -> Callable[..., None]:
+    """
+    Wraps the `__init__` of a class whose defaults are deferred, so that instantiating it first validates the pending
+    defaults of its class tree.
+
+    Only installed on such classes: any `__init__` makes pydantic call back into Python for every nested instance it
+    validates, which would slow down the validation of every config.
+    """
+    if getattr(init, "_pyfig_validates_pending", False):
+        return init
+
+    def __init__(self, /, **data: Any) -> None:
+        if _PENDING_DEFAULTS:
+            _validate_pending_defaults(_reachable_pyfigs(type(self)))
+        init(self, **data)
+
+    setattr(__init__, "_pyfig_validates_pending", True)
+    return __init__
+
+
+@functools.lru_cache(maxsize=None)
+def _reachable_pyfigs(cls: Type["Pyfig"]) -> Tuple[Type["Pyfig"], ...]:
+    """
+    Returns the Pyfig classes of the (nested) fields of `cls`, deepest first, followed by `cls` itself.
+    """
+    found: List[Type[Pyfig]] = []
+    seen: Set[type] = set()
+
+    def visit(model: Type[BaseModel]) -> None:
+        seen.add(model)
+        for field in model.model_fields.values():
+            for nested in models_in(field.annotation):
+                if nested not in seen:
+                    visit(nested)
+        if issubclass(model, Pyfig):
+            found.append(model)
+
+    visit(cls)
+    return tuple(found)
+
 
 class Pyfig(BaseModel):
     """
@@ -14,13 +130,22 @@ class Pyfig(BaseModel):
 
     model_config = ConfigDict(validate_default=True)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # runs before pydantic checks for a custom `__init__`, unlike `__pydantic_init_subclass__`
+        if _defer_default_validation:
+            cls.__init__ = _validating_pending_defaults(cls.__init__) # type: ignore[method-assign]
+
     @classmethod
     def __pydantic_init_subclass__(cls, **kwargs):
         """
         Validates that all fields have a default value.
         """
         for name, field in cls.model_fields.items():
-            if field.get_default(call_default_factory=True) == PydanticUndefined:
+            # when deferred, default factories aren't called (just like the validation of the defaults below)
+            missing = field.is_required() if _defer_default_validation \
+                else field.get_default(call_default_factory=True) == PydanticUndefined
+            if missing:
                 raise TypeError(f"Field '{name}' of '{cls.__qualname__}' must have a default value")
 
         # Construct the class once to see if the defaults are valid.
@@ -28,9 +153,14 @@ class Pyfig(BaseModel):
         #    instance of the class to be constructed.
         # 2. _pyfig_defaults_validated is set so we only validate the class's defaults once. This prevents issues with
         #    Derived* classes with different model config
+        # 3. When deferred, the class is instead validated on its first instantiation (or by validate_all_defaults)
         if not hasattr(cls, "_pyfig_defaults_validated"):
-            cls()
-            setattr(cls, "_pyfig_defaults_validated", True)
+            if _defer_default_validation:
+                with _PENDING_DEFAULTS_LOCK:
+                    _PENDING_DEFAULTS.append(cls)
+            else:
+                cls()
+                setattr(cls, "_pyfig_defaults_validated", True)
 
 
     def model_dump_dict(self) -> dict:
@@ -49,3 +179,48 @@ class Pyfig(BaseModel):
         plain_json = self.model_dump_json()
         plain_dict = json.loads(plain_json)
         return plain_dict
+
+    @classmethod
+    def schema_fingerprint(cls) -> str:
+        """
+        Fingerprints this class tree: every (nested) model's fields, defaults, config, and the source code defining
+        them. It differs whenever the schema (or the code validating it) may have changed.
+
+        Returns:
+            a hex digest which is stable across processes
+        """
+        return schema_fingerprint(cls)
+
+    @classmethod
+    def from_trusted(cls: Type[P], data: Dict[str, Any], *, fingerprint: str) -> P:
+        """
+        Rebuilds a configuration from data which this class already validated, without validating it again. Field
+        and model validators are not run. Nested models (including within lists, tuples and dicts) are rebuilt with
+        `model_construct`.
+
+        E.g.,
+        ```
+        data, fingerprint = config.model_dump(), MyConfig.schema_fingerprint()
+        ... # e.g., sent to another process
+        config = MyConfig.from_trusted(data, fingerprint=fingerprint)
+        ```
+
+        Args:
+            data:           the `model_dump()` (python mode, not json mode) of an instance of this class
+            fingerprint:    the `schema_fingerprint()` of the class which produced `data`
+
+        Returns:
+            the configuration
+
+        Raises:
+            ValueError if `fingerprint` doesn't match this class, i.e., `data` was produced by another class or
+            another version of this class
+            TypeError if a (nested) field holds a union of several models, since which one was dumped can't be known
+            without validating it (use `model_validate` for such classes)
+        """
+        if fingerprint != cls.schema_fingerprint():
+            raise ValueError(
+                f"Cannot trust data for '{cls.__qualname__}': it was dumped by a different class (or class version)"
+            )
+
+        return construct_trusted(cls, data)
@@ -1,11 +1,15 @@
+import os
+import subprocess
+import sys
 from typing import Optional, Any, List, Dict
 from pathlib import Path
 from enum import Enum
 
 import pytest
-from pydantic import ValidationError, ConfigDict, Field
+from pydantic import ValidationError, ConfigDict, Field, field_validator
 
-from ._pyfig import Pyfig
+from . import _pyfig
+from ._pyfig import Pyfig, defer_default_validation, validate_all_defaults
 
 
 def test__given_config_without_default__when_instantiating__then_raise_error():
@@ -76,3 +80,126 @@ def test__given_default_given_via_factory__when_defining_pyfig_class__then_no_er
 def test__given_default_given_via_Field_arg__when_defining_pyfig_class__then_no_error():
     class _MyConfig(Pyfig):
         foo: bool = Field(default=True)
+
+def test__given_same_class__when_schema_fingerprint__then_stable():
+    class MyConfig(Pyfig):
+        integer: int = 1
+
+    assert MyConfig.schema_fingerprint() == MyConfig.schema_fingerprint()
+
+def test__given_trusted_dump__when_from_trusted__then_equal_without_validating():
+    calls = []
+
+    class Nested(Pyfig):
+        value: int = 1
+
+        @field_validator("value")
+        @classmethod
+        def count(cls, value: int) -> int:
+            calls.append(value)
+            return value
+
+    class MyConfig(Pyfig):
+        nested: Nested = Nested()
+        nested_list: List[Nested] = [Nested(value=2)]
+        nested_dict: Dict[str, Nested] = {"a": Nested(value=3)}
+        optional: Optional[Nested] = None
+
+    original = MyConfig(optional=Nested(value=4))
+    calls.clear()
+
+    rebuilt = MyConfig.from_trusted(original.model_dump(), fingerprint=MyConfig.schema_fingerprint())
+
+    assert rebuilt == original
+    assert isinstance(rebuilt.nested_list[0], Nested)
+    assert isinstance(rebuilt.nested_dict["a"], Nested)
+    assert isinstance(rebuilt.optional, Nested)
+    assert calls == []
+
+def test__given_other_class_fingerprint__when_from_trusted__then_raises_valueerror():
+    class MyConfig(Pyfig):
+        integer: int = 1
+
+    class OtherConfig(Pyfig):
+        integer: str = "1"
+
+    with pytest.raises(ValueError):
+        MyConfig.from_trusted({"integer": "1"}, fingerprint=OtherConfig.schema_fingerprint())
+
+@pytest.fixture
+def deferred():
+    defer_default_validation()
+    yield
+    defer_default_validation(False)
+    _pyfig._PENDING_DEFAULTS.clear()
+
+def test__given_deferred__when_defining_class_with_bad_default__then_does_not_raise(deferred):
+    factory_calls = []
+
+    class MyConfig(Pyfig):
+        integer: int = Field(default_factory=lambda: factory_calls.append(1) or "not an int")
+
+    assert factory_calls == []
+    with pytest.raises(ValidationError):
+        validate_all_defaults()
+    assert MyConfig in _pyfig._PENDING_DEFAULTS
+
+def test__given_deferred__when_defining_class_without_default__then_still_raises(deferred):
+    with pytest.raises(TypeError):
+        class _MyConfig(Pyfig):
+            no_default_value: int
+
+def test__given_deferred_bad_default__when_first_instantiated__then_raises(deferred):
+    class MyConfig(Pyfig):
+        integer: int = "not an int" # type: ignore
+
+    with pytest.raises(ValidationError):
+        MyConfig(integer=1)
+
+def test__given_deferred_bad_nested_default__when_parent_instantiated__then_raises(deferred):
+    class Nested(Pyfig):
+        integer: int = "not an int" # type: ignore
+
+    class MyConfig(Pyfig):
+        nested: Nested = Field(default_factory=lambda: Nested.model_construct())
+
+    with pytest.raises(ValidationError):
+        MyConfig(nested={"integer": 1})
+
+def test__given_deferred_good_defaults__when_validate_all_defaults__then_nothing_pending(deferred):
+    class Nested(Pyfig):
+        integer: int = 1
+
+    class MyConfig(Pyfig):
+        nested: Nested = Nested()
+
+    assert _pyfig._PENDING_DEFAULTS == [MyConfig]
+
+    validate_all_defaults()
+
+    assert _pyfig._PENDING_DEFAULTS == []
+    assert MyConfig() == MyConfig(nested=Nested(integer=1))
+
+def test__given_not_deferred__when_defining_class__then_nested_validation_does_not_call_init():
+    class MyConfig(Pyfig):
+        integer: int = 1
+
+    assert not MyConfig.__pydantic_custom_init__
+
+def test__given_deferred_bad_nested_default__when_eager_parent_validates_it__then_raises(deferred):
+    class Nested(Pyfig):
+        integer: int = "not an int" # type: ignore
+
+    defer_default_validation(False)
+
+    class MyConfig(Pyfig):
+        nested: Nested = Field(default_factory=lambda: Nested.model_construct())
+
+    assert not MyConfig.__pydantic_custom_init__
+    with pytest.raises(ValidationError):
+        MyConfig.model_validate({"nested": {"integer": 1}})
+
+def test__given_env_var__when_importing_pyfig__then_validation_is_deferred():
+    code = "from pyfig import _pyfig; assert _pyfig._defer_default_validation"
+    env = {**os.environ, _pyfig.DEFER_DEFAULT_VALIDATION_ENV: "1"}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
@@ -0,0 +1,153 @@
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Collection, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from ._eval import AbstractEvaluator
+from ._eval.dependencies import Dependencies, recording_dependencies
+from ._fingerprint import digest, schema_fingerprint
+from ._loader import _has_static_defaults, _reachable_models
+
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _evaluators_fingerprint(evaluators: Collection[AbstractEvaluator]) -> Optional[list]:
+    """
+    Fingerprints each evaluator, or returns None if any evaluator's results can't be reproduced.
+    """
+    fingerprints = []
+
+    for evaluator in evaluators:
+        fingerprint = evaluator.fingerprint()
+        if fingerprint is None:
+            return None
+
+        evaluator_class = type(evaluator)
+        fingerprints.append((evaluator_class.__module__, evaluator_class.__qualname__, fingerprint))
+
+    return fingerprints
+
+
+class SnapshotCache:
+    """
+    Stores fully loaded configurations on disk, so that a later process with the same inputs can skip reading
+    overrides, evaluating templates and validating.
+
+    A snapshot is keyed by the config class's schema (including the source code defining it), the overrides (or
+    metaconf), and the evaluators' settings. It is only reused while every config file, and every environment variable
+    and file read by the evaluators, is unchanged (files are compared by content). Configurations using an evaluator
+    whose `fingerprint()` is None (e.g., `pyeval`), or a config class with a dynamic default factory (e.g., a
+    timestamp or a random id), are never snapshotted.
+
+    Snapshots are pickled: only use a directory that no one else can write to.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """
+        Args:
+            directory:  where snapshots are stored. Created if necessary
+        """
+        self.directory = Path(directory).expanduser()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        """ the number of loads answered by a snapshot """
+        self.misses = 0
+        """ the number of loads that had to build the configuration """
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.snapshot"
+
+    def _read(self, key: str) -> Any:
+        """
+        Returns the snapshot for `key` if it is still fresh, otherwise None.
+        """
+        try:
+            with open(self._path(key), "rb") as file:
+                dependencies: Dependencies = pickle.load(file)
+                if not dependencies.unchanged():
+                    return None
+                return pickle.load(file)
+        except Exception: # pylint: disable=broad-exception-caught
+            # missing, corrupt, or no longer unpicklable (e.g., a class was moved): the snapshot is rebuilt
+            return None
+
+    def _write(self, key: str, dependencies: Dependencies, config: Any) -> None:
+        """
+        Atomically stores a snapshot, unless the configuration cannot be pickled (e.g., it has a local class).
+        """
+        try:
+            data = pickle.dumps(dependencies, pickle.HIGHEST_PROTOCOL) + pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+        except Exception: # pylint: disable=broad-exception-caught
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp, self._path(key))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def load_or_build(
+        self,
+        target: Type[T],
+        inputs: Any,
+        evaluators: Collection[AbstractEvaluator],
+        build: Callable[[], T]
+    ) -> T:
+        """
+        Returns the snapshot for these inputs if it is fresh, otherwise builds (and snapshots) the configuration.
+
+        Args:
+            target:     the config class being built
+            inputs:     everything else (besides the evaluators) that the configuration is built from. Must have a
+                        stable repr
+            evaluators: the evaluators used by `build`
+            build:      builds the configuration. Any inputs it reads must be reported with `record_file_read` or
+                        `record_environment_read`
+
+        Returns:
+            the configuration
+        """
+        fingerprints = _evaluators_fingerprint(evaluators)
+        if fingerprints is None or not _has_static_defaults(_reachable_models(target)):
+            return build()
+
+        # relative paths (in templates and metaconfs) depend on the working directory
+        key = digest(schema_fingerprint(target), inputs, fingerprints, os.getcwd())
+
+        config = self._read(key)
+        if config is not None:
+            with self._lock:
+                self.hits += 1
+            return config
+
+        with self._lock:
+            self.misses += 1
+
+        with recording_dependencies() as dependencies:
+            config = build()
+
+        self._write(key, dependencies, config)
+        return config
+
+    def clear(self) -> None:
+        """
+        Deletes every stored snapshot.
+        """
+        for path in self.directory.glob("*.snapshot"):
+            path.unlink()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.snapshot"))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.directory.as_posix()!r}, hits={self.hits}, misses={self.misses})"
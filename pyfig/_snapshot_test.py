@@ -0,0 +1,210 @@
+import json
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+import pytest
+from pydantic import Field
+
+from ._eval import AbstractEvaluator, EnvironmentEvaluator, EvaluationCache, JSONFileEvaluator, VariableEvaluator
+from ._loader import load_configuration
+from ._metaconf import Metaconf
+from ._pyfig import Pyfig
+from ._snapshot import SnapshotCache
+
+
+class CountingEvaluator(AbstractEvaluator):
+
+    def __init__(self, fingerprint: Optional[str]=""):
+        self.calls = 0
+        self._fingerprint = fingerprint
+
+    def name(self) -> str:
+        return "count"
+
+    def fingerprint(self) -> Optional[str]:
+        return self._fingerprint
+
+    def evaluate(self, value: str) -> str:
+        self.calls += 1
+        return value
+
+
+class DatabaseConfig(Pyfig):
+    host: str = "localhost"
+    port: int = 5432
+
+
+class SnapshotConfig(Pyfig):
+    name: str = "app"
+    database: DatabaseConfig = DatabaseConfig()
+
+
+class OtherConfig(Pyfig):
+    name: str = "app"
+
+
+def test__given_no_snapshot__when_load_configuration__then_builds_and_stores(pytestdir: Path):
+    snapshot = SnapshotCache(pytestdir / "snapshots")
+    evaluator = CountingEvaluator()
+
+    config = load_configuration(SnapshotConfig, [{ "name": "${{count.x}}" }], [evaluator], snapshot=snapshot)
+
+    assert config == SnapshotConfig(name="x")
+    assert evaluator.calls == 1
+    assert (snapshot.hits, snapshot.misses) == (0, 1)
+    assert len(snapshot) == 1
+
+
+def test__given_snapshot__when_load_configuration_again__then_reuses_without_evaluating(pytestdir: Path):
+    evaluator = CountingEvaluator()
+    load_configuration(SnapshotConfig, [{ "name": "${{count.x}}" }], [evaluator], snapshot=SnapshotCache(pytestdir))
+
+    snapshot = SnapshotCache(pytestdir)
+    config = load_configuration(SnapshotConfig, [{ "name": "${{count.x}}" }], [evaluator], snapshot=snapshot)
+
+    assert config == SnapshotConfig(name="x")
+    assert evaluator.calls == 1
+    assert (snapshot.hits, snapshot.misses) == (1, 0)
+
+
+@pytest.mark.parametrize("overrides, evaluators, target", [
+    ([{ "name": "other" }], [VariableEvaluator(x="1")], SnapshotConfig),
+    ([{ "name": "${{var.x}}" }], [VariableEvaluator(x="2")], SnapshotConfig),
+    ([{ "name": "${{var.x}}" }], [VariableEvaluator(x="1")], OtherConfig),
+])
+def test__given_different_inputs__when_load_configuration__then_snapshot_is_not_reused(
+    pytestdir: Path, overrides, evaluators, target
+):
+    snapshot = SnapshotCache(pytestdir)
+    load_configuration(SnapshotConfig, [{ "name": "${{var.x}}" }], [VariableEvaluator(x="1")], snapshot=snapshot)
+
+    config = load_configuration(target, overrides, evaluators, snapshot=snapshot)
+
+    assert config == load_configuration(target, overrides, evaluators)
+    assert (snapshot.hits, snapshot.misses) == (0, 2)
+
+
+def test__given_env_var_changed__when_load_configuration__then_snapshot_is_stale(
+    pytestdir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    snapshot = SnapshotCache(pytestdir)
+    overrides = [{ "database": { "host": "${{env.PYFIG_SNAPSHOT_HOST}}" } }]
+
+    monkeypatch.setenv("PYFIG_SNAPSHOT_HOST", "first")
+    load_configuration(SnapshotConfig, overrides, [EnvironmentEvaluator()], snapshot=snapshot)
+    assert load_configuration(SnapshotConfig, overrides, [EnvironmentEvaluator()], snapshot=snapshot).database.host \
+        == "first"
+
+    monkeypatch.setenv("PYFIG_SNAPSHOT_HOST", "second")
+    config = load_configuration(SnapshotConfig, overrides, [EnvironmentEvaluator()], snapshot=snapshot)
+
+    assert config.database.host == "second"
+    assert (snapshot.hits, snapshot.misses) == (1, 2)
+
+
+def test__given_evaluated_file_changed__when_load_configuration__then_snapshot_is_stale(pytestdir: Path):
+    snapshot = SnapshotCache(pytestdir / "snapshots")
+    path = pytestdir / "db.json"
+    path.write_text(json.dumps({ "port": 1 }))
+    overrides = [{ "database": { "port": f"${{{{jsonfile.port:{path}}}}}" } }]
+
+    assert load_configuration(SnapshotConfig, overrides, [JSONFileEvaluator()], snapshot=snapshot).database.port == 1
+
+    path.write_text(json.dumps({ "port": 2 }))
+    assert load_configuration(SnapshotConfig, overrides, [JSONFileEvaluator()], snapshot=snapshot).database.port == 2
+    assert (snapshot.hits, snapshot.misses) == (0, 2)
+
+
+def test__given_evaluator_without_fingerprint__when_load_configuration__then_never_snapshotted(pytestdir: Path):
+    snapshot = SnapshotCache(pytestdir)
+    evaluator = CountingEvaluator(fingerprint=None)
+
+    load_configuration(SnapshotConfig, [{ "name": "${{count.x}}" }], [evaluator], snapshot=snapshot)
+    load_configuration(SnapshotConfig, [{ "name": "${{count.x}}" }], [evaluator], snapshot=snapshot)
+
+    assert evaluator.calls == 2
+    assert len(snapshot) == 0
+
+
+class RunConfig(Pyfig):
+    run_id: str = Field(default_factory=lambda: uuid4().hex)
+
+
+class NestedRunConfig(Pyfig):
+    name: str = "app"
+    run: RunConfig = Field(default_factory=RunConfig)
+
+
+@pytest.mark.parametrize("target", [RunConfig, NestedRunConfig])
+def test__given_dynamic_default_factory__when_load_configuration__then_never_snapshotted(pytestdir: Path, target):
+    snapshot = SnapshotCache(pytestdir)
+
+    first = load_configuration(target, [], [], snapshot=snapshot)
+    second = load_configuration(target, [], [], snapshot=snapshot)
+
+    assert first != second
+    assert len(snapshot) == 0
+
+
+def test__given_corrupt_snapshot__when_load_configuration__then_rebuilds(pytestdir: Path):
+    snapshot = SnapshotCache(pytestdir)
+    load_configuration(SnapshotConfig, [], [], snapshot=snapshot)
+    for path in pytestdir.glob("*.snapshot"):
+        path.write_bytes(b"not a pickle")
+
+    assert load_configuration(SnapshotConfig, [], [], snapshot=snapshot) == SnapshotConfig()
+    assert load_configuration(SnapshotConfig, [], [], snapshot=snapshot) == SnapshotConfig()
+    assert (snapshot.hits, snapshot.misses) == (1, 2)
+
+
+def test__given_unpicklable_config__when_load_configuration__then_loads_without_snapshot(pytestdir: Path):
+    class LocalConfig(Pyfig):
+        name: str = "local"
+
+    snapshot = SnapshotCache(pytestdir)
+
+    assert load_configuration(LocalConfig, [], [], snapshot=snapshot) == LocalConfig()
+    assert len(snapshot) == 0
+
+
+def test__given_shared_evaluation_cache__when_load_configuration_with_snapshot__then_raises(pytestdir: Path):
+    with pytest.raises(ValueError):
+        load_configuration(SnapshotConfig, [], [], cache=EvaluationCache(), snapshot=SnapshotCache(pytestdir))
+
+
+def test__given_snapshots__when_clear__then_all_are_deleted(pytestdir: Path):
+    snapshot = SnapshotCache(pytestdir)
+    load_configuration(SnapshotConfig, [], [], snapshot=snapshot)
+    load_configuration(OtherConfig, [], [], snapshot=snapshot)
+    assert len(snapshot) == 2
+
+    snapshot.clear()
+
+    assert len(snapshot) == 0
+
+
+def test__given_metaconf__when_load_config_with_snapshot__then_reused_until_config_file_changes(pytestdir: Path):
+    path = pytestdir / "config.json"
+    path.write_text(json.dumps({ "name": "${{var.name}}" }))
+    metaconf = Metaconf(configs=[path.as_posix()], evaluators=[VariableEvaluator(name="first")])
+    snapshot = SnapshotCache(pytestdir / "snapshots")
+
+    assert metaconf.load_config(SnapshotConfig, snapshot=snapshot).name == "first"
+    assert metaconf.load_config(SnapshotConfig, snapshot=snapshot).name == "first"
+    assert (snapshot.hits, snapshot.misses) == (1, 1)
+    assert metaconf.file_timings == []
+
+    path.write_text(json.dumps({ "name": "second" }))
+    assert metaconf.load_config(SnapshotConfig, snapshot=snapshot).name == "second"
+    assert (snapshot.hits, snapshot.misses) == (1, 2)
+
+
+def test__given_metaconf_changed__when_load_config_with_snapshot__then_not_reused(pytestdir: Path):
+    snapshot = SnapshotCache(pytestdir)
+    Metaconf(overrides={ "name": "first" }).load_config(SnapshotConfig, snapshot=snapshot)
+
+    config = Metaconf(overrides={ "name": "second" }).load_config(SnapshotConfig, snapshot=snapshot)
+
+    assert config.name == "second"
+    assert snapshot.hits == 0
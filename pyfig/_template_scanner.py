@@ -0,0 +1,288 @@
+import bisect
+import functools
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+
+_OPEN = "${{"
+
+_NAME_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-")
+
+_SPECIAL_CHARS = "\\$}"
+""" the only characters of a value which aren't simply part of it """
+
+_SPECIAL_PATTERN = re.compile(r"[\\$}]")
+
+
+class Template(NamedTuple):
+    """
+    A template found in a string, e.g., `${{var.name}}`.
+    """
+
+    evaluator: str
+    """ the name of the evaluator, e.g., "var" """
+
+    value: str
+    """ the value given to the evaluator, e.g., "name" """
+
+
+class ParsedString(NamedTuple):
+    """
+    A string split into its templates and the literal text around them.
+    """
+
+    templates: Tuple[Template, ...]
+    """ the templates, in order """
+
+    literals: Tuple[str, ...]
+    """ the text before each template, followed by the text after the last one """
+
+    whole: bool
+    """ whether the entire string is a single template (whose evaluation replaces it, keeping its type) """
+
+
+def parse_templates(string: str) -> ParsedString:
+    """
+    Finds the templates of a string. This accepts exactly what `_TEMPLATE_PATTERN` (of `_evaluate_conf`) matches, but
+    in time linear in the length of the string (the regular expression backtracks exponentially on some inputs, e.g.,
+    a long run of backslashes). Strings without a template are answered without scanning them, and the parses of the
+    other strings are cached, since the same strings tend to be parsed repeatedly.
+
+    A string is a whole template only if it starts with the template (the pattern's full match also allowed one
+    character before it, e.g., `x${{var.a}}`, which dropped that character).
+    """
+    if _OPEN not in string:
+        return ParsedString((), (string,), False)
+    return _parse_cached(string)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_cached(string: str) -> ParsedString:
+    values = _Values(string)
+
+    whole = _whole_template(string, values)
+    if whole is not None:
+        return ParsedString((whole,), ("", ""), True)
+
+    templates: List[Template] = []
+    literals: List[str] = []
+    position = 0 # where the next match may start, i.e., its (non-escape) character before the template
+    start = string.find(_OPEN)
+
+    while start != -1:
+        # the character before the template can't be an escape, nor be part of the previous template
+        if start == 0 or (start > position and string[start - 1] != "\\"):
+            found = _template_at(string, start, values)
+            if found is not None:
+                template, end = found
+                templates.append(template)
+                literals.append(string[position:start])
+                position = end
+                start = string.find(_OPEN, end)
+                continue
+
+        start = string.find(_OPEN, start + 1)
+
+    literals.append(string[position:])
+    return ParsedString(tuple(templates), tuple(literals), False)
+
+
+def _name_end(string: str, start: int) -> int:
+    """
+    Returns the end of the evaluator name which starts at `start`.
+    """
+    end, length = start, len(string)
+    while end < length and string[end] in _NAME_CHARS:
+        end += 1
+    return end
+
+
+def _template_at(string: str, start: int, values: "_Values") -> Optional[Tuple[Template, int]]:
+    """
+    Parses the template whose opening `${{` is at `start`.
+
+    Returns:
+        the template and the end of its closing `}}`, or None if it isn't a template
+    """
+    name_start = start + len(_OPEN)
+    name_end = _name_end(string, name_start)
+
+    if string.startswith("}}", name_end):
+        return Template(string[name_start:name_end], ""), name_end + 2
+
+    if string.startswith(".", name_end):
+        found = values.first_end(name_end + 1)
+        if found is not None:
+            value_end, end = found
+            return Template(string[name_start:name_end], string[name_end + 1:value_end]), end
+
+    return None
+
+
+def _whole_template(string: str, values: "_Values") -> Optional[Template]:
+    """
+    Returns the template if the entire string is a single template, otherwise None.
+    """
+    if not string.startswith(_OPEN):
+        return None
+
+    name_end = _name_end(string, len(_OPEN))
+    name = string[len(_OPEN):name_end]
+
+    if string[name_end:] == "}}":
+        return Template(name, "")
+    if string.startswith(".", name_end) and values.reaches_end(name_end + 1):
+        return Template(name, string[name_end + 1:-2])
+
+    return None
+
+
+class _Values:
+    """
+    Finds where the value of a template (i.e., the text after `${{name.`) ends.
+
+    Most values contain none of `\\`, `$` and `}` before the closing `}}`, and simply end there. Otherwise, the ends
+    of all values of the string are found by a `_ValueScanner`, which is only built (once) when first needed.
+    """
+
+    __slots__ = ("_string", "_scanner")
+
+    def __init__(self, string: str) -> None:
+        self._string = string
+        self._scanner: Optional[_ValueScanner] = None
+
+    def first_end(self, start: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (value end, template end) of the value starting at `start`, or None if there isn't one.
+        """
+        close = self._plain_close(start)
+        if close is not None:
+            return (close, close + 2) if close != -1 else None
+        return self._scan().first_end(start)
+
+    def reaches_end(self, start: int) -> bool:
+        """
+        Checks whether a value starting at `start` can be closed by the last `}}` of the string.
+        """
+        close = self._plain_close(start)
+        if close is not None:
+            # a '}' at the closing '}}' can only be followed by the end, or by one more '}' and the end
+            return close != -1 and len(self._string) - close in (2, 3) and self._string.endswith("}}")
+        return self._scan().reaches_end(start)
+
+    def _plain_close(self, start: int) -> Optional[int]:
+        """
+        Returns the position of the first `}}` after `start` (or -1 if there isn't one) when the text before it has
+        none of `\\`, `$` and `}`, otherwise None.
+        """
+        string = self._string
+        close = string.find("}}", start)
+        end = len(string) if close == -1 else close
+        if any(string.find(char, start, end) != -1 for char in _SPECIAL_CHARS):
+            return None
+        return close
+
+    def _scan(self) -> "_ValueScanner":
+        if self._scanner is None:
+            self._scanner = _ValueScanner(self._string, self._string.index(_OPEN))
+        return self._scanner
+
+
+class _ValueScanner:
+    """
+    Decides where the value of a template (i.e., the text after `${{name.`) ends, for every position a value might
+    start at, in a single right-to-left pass over the string.
+
+    A value is a sequence of tokens: an escape (`\\` and any character but a newline), any character but `$` and `}`,
+    a `}` not followed by `}`, or a `$` (or `${`) not followed by `{`. It may end with a single `}`, `$` or `$}`, and
+    is followed by the closing `}}`. A backslash can either start an escape or be a token of its own, and where
+    several ways to parse a value are possible, the first is used in this order of preference: an escape, a longer
+    sequence of tokens, and then the shortest ending. This is the order in which the regular expression's
+    backtracking tries them.
+
+    Only the positions of `\\`, `$` and `}` are visited, since any other character is simply part of the value.
+    """
+
+    __slots__ = ("_string", "_specials", "_first", "_reaches")
+
+    def __init__(self, string: str, start: int) -> None:
+        self._string = string
+        self._specials = [special.start() for special in _SPECIAL_PATTERN.finditer(string, start)]
+
+        self._first: List[Optional[Tuple[int, int]]] = [None] * len(self._specials)
+        """ for each special position, the (value end, template end) of a value continuing from it, if any """
+
+        self._reaches: List[bool] = [False] * len(self._specials)
+        """ for each special position, whether a value continuing from it can end with the end of the string """
+
+        self._scan()
+
+    def first_end(self, position: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (value end, template end) of the value starting at `position`, or None if there isn't one.
+        """
+        index = bisect.bisect_left(self._specials, position)
+        return self._first[index] if index < len(self._specials) else None
+
+    def reaches_end(self, position: int) -> bool:
+        """
+        Checks whether a value starting at `position` can be closed by the last `}}` of the string.
+        """
+        index = bisect.bisect_left(self._specials, position)
+        return self._reaches[index] if index < len(self._specials) else False
+
+    def _scan(self) -> None:
+        string, specials, first, reaches = self._string, self._specials, self._first, self._reaches
+        length, count = len(string), len(specials)
+
+        for index in range(count - 1, -1, -1):
+            position = specials[index]
+            char = string[position]
+            following = string[position + 1:position + 2]
+
+            # the positions at which the value continues, after each possible token (in order of preference)
+            if char == "\\":
+                continuations: Tuple[int, ...] = \
+                    (position + 2, position + 1) if following and following != "\n" else (position + 1,)
+            elif char == "}":
+                continuations = (position + 2,) if following and following != "}" else ()
+            elif following == "{":
+                continuations = (position + 3,) if string[position + 2:position + 3] not in ("", "{") else ()
+            else:
+                continuations = (position + 2,) if following else ()
+
+            found: Optional[Tuple[int, int]] = None
+            reached = False
+            for continuation in continuations:
+                # any characters between the special positions are simply part of the value
+                after = index + 1
+                while after < count and specials[after] < continuation:
+                    after += 1
+                if after < count:
+                    found = found or first[after]
+                    reached = reached or reaches[after]
+
+            # otherwise, the value ends here (optionally, with a final '}', '$}' or '$'), followed by the closing '}}'
+            if (found is None or not reached) and following == "}":
+                for value_end, end in _endings(string, position, char):
+                    found = found or (value_end, end)
+                    reached = reached or end == length
+
+            first[index] = found
+            reaches[index] = reached
+
+
+def _endings(string: str, position: int, char: str) -> List[Tuple[int, int]]:
+    """
+    Returns the (value end, template end) of each way a value may end at `position`, in order of preference.
+    """
+    endings = []
+    if string.startswith("}}", position):
+        endings.append((position, position + 2))
+    if char == "}" and string.startswith("}}", position + 1):
+        endings.append((position + 1, position + 3))
+    if char == "$" and string.startswith("}}}", position + 1):
+        endings.append((position + 2, position + 4))
+    if char == "$" and string.startswith("}}", position + 1):
+        endings.append((position + 1, position + 3))
+    return endings
@@ -0,0 +1,68 @@
+import random
+from typing import Tuple
+
+import pytest
+
+from ._evaluate_conf import _TEMPLATE_PATTERN
+from ._template_scanner import ParsedString, Template, parse_templates
+
+
+def _parse_with_pattern(string: str) -> Tuple[Tuple[Template, ...], Tuple[str, ...], bool]:
+    """
+    Parses a string with the reference regular expression.
+    """
+    full_match = _TEMPLATE_PATTERN.fullmatch(string)
+    if full_match is not None and full_match.group("nonesc") == "":
+        return (Template(full_match.group("evaluator"), full_match.group("value") or ""),), ("", ""), True
+
+    templates, literals, start = [], [], 0
+    for patmatch in _TEMPLATE_PATTERN.finditer(string):
+        templates.append(Template(patmatch.group("evaluator"), patmatch.group("value") or ""))
+        literals.append(string[start:patmatch.start()] + patmatch.group("nonesc"))
+        start = patmatch.end()
+    literals.append(string[start:])
+    return tuple(templates), tuple(literals), False
+
+
+@pytest.mark.parametrize("string,templates", [
+    ("",                                        []),
+    ("no templates",                            []),
+    ("\\${{escaped}}",                          []),
+    ("${{inv@lid.character}}",                  []),
+    ("${{easy}}",                               [("easy", "")]),
+    ("${{easy.mode}}",                          [("easy", "mode")]),
+    ("it's a ${{sub.string}}!",                 [("sub", "string")]),
+    ("${{partial ${{evaluate.me}}",             [("evaluate", "me")]),
+    ("${{eval.$}}",                             [("eval", "$")]),
+    ("${{eval.${js_string} }}",                 [("eval", "${js_string} ")]),
+    ("${{recursive.repl='\\${{template\\}}'}}", [("recursive", "repl='\\${{template\\}}'")]),
+    ("${{cap.${{var.name}}}}",                  [("var", "name")]),
+    ("${{a.x}} and ${{b}}",                     [("a", "x"), ("b", "")]),
+])
+def test__given_string__when_parse_templates__then_finds_templates(string: str, templates: list):
+    assert [tuple(template) for template in parse_templates(string).templates] == templates
+
+def test__given_text_before_template__when_parse_templates__then_is_not_whole_template():
+    assert parse_templates("x${{var.a}}") == ParsedString((Template("var", "a"),), ("x", ""), False)
+    assert parse_templates("${{var.a}}") == ParsedString((Template("var", "a"),), ("", ""), True)
+
+def test__given_random_strings__when_parse_templates__then_agrees_with_template_pattern():
+    rand = random.Random(0)
+    alphabet = ["$", "{", "}", "\\", ".", "a", "\n", "${{", "}}", "${{a.", "${{b}}"]
+
+    for _ in range(20_000):
+        string = "".join(rand.choice(alphabet) for _ in range(rand.randint(0, 12)))
+        assert tuple(parse_templates(string)) == _parse_with_pattern(string), string
+
+def test__given_pathological_strings__when_parse_templates__then_parses_in_linear_time():
+    # the regular expression backtracks for minutes (or longer) on even a small fraction of these lengths
+    backslashes = "\\" * 100_000
+
+    assert parse_templates("${{a." + backslashes).templates == ()
+    assert parse_templates("${{a." + backslashes + "}}") == ParsedString((Template("a", backslashes),), ("", ""), True)
+    assert parse_templates("${{a." + "$}" * 50_000).templates == ()
+    assert parse_templates("${{a.b}} " * 20_000).templates == (Template("a", "b"),) * 20_000
+
+def test__given_same_string__when_parse_templates_twice__then_reuses_parse():
+    string = "${{var.a}} and ${{var.b}}"
+    assert parse_templates(string) is parse_templates("".join(list(string)))
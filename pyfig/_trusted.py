@@ -0,0 +1,139 @@
+import functools
+import types
+import typing
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+
+M = TypeVar("M", bound=BaseModel)
+
+_Builder = Callable[[Any], Any]
+"""
+Rebuilds the models within a (trusted) dumped value.
+"""
+
+_NONE_TYPE = type(None)
+
+_UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union)) # i.e., also `X | Y` since v3.10
+
+_object_setattr = object.__setattr__
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _compile(annotation: Any) -> Optional[_Builder]:
+    """
+    Compiles a builder for values of the given annotation, or returns None if the annotation contains no models (so
+    its values are used as-is).
+
+    Raises:
+        TypeError if the models can't be rebuilt without validation, e.g., for a union of several models, since the dump
+        doesn't record which of them it was
+    """
+    try:
+        hash(annotation)
+    except TypeError: # unhashable annotation, e.g., with unhashable `Annotated` metadata
+        return _compile_uncached(annotation)
+    return _compile_cached(annotation)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_cached(annotation: Any) -> Optional[_Builder]:
+    return _compile_uncached(annotation)
+
+
+def _compile_uncached(annotation: Any) -> Optional[_Builder]:
+    if _is_model(annotation):
+        return lambda value: construct_trusted(annotation, value) if isinstance(value, dict) else value
+
+    if hasattr(annotation, "__metadata__"): # Annotated[X, ...]
+        return _compile(annotation.__origin__)
+
+    args = typing.get_args(annotation)
+    builders = [_compile(arg) if arg is not Ellipsis else None for arg in args]
+    if not any(builders):
+        return None
+
+    origin = typing.get_origin(annotation)
+
+    if origin is list:
+        item = builders[0]
+        return lambda value: [item(v) for v in value] if isinstance(value, list) else value
+
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        item = builders[0]
+        return lambda value: tuple(item(v) for v in value) if isinstance(value, (list, tuple)) else value
+
+    if origin is tuple:
+        items = [builder or (lambda v: v) for builder in builders]
+        return lambda value: tuple(b(v) for b, v in zip(items, value)) if isinstance(value, (list, tuple)) else value
+
+    if origin is dict:
+        item = builders[1] or (lambda v: v)
+        return lambda value: {k: item(v) for k, v in value.items()} if isinstance(value, dict) else value
+
+    if origin in _UNION_TYPES:
+        options = [(arg, builder) for arg, builder in zip(args, builders) if arg is not _NONE_TYPE]
+        if len(options) == 1:
+            only = options[0][1]
+            return lambda value: None if value is None else only(value) # type: ignore
+
+    # anything else (e.g., a union of several models) can't be rebuilt without knowing which type was dumped
+    raise TypeError(f"'{annotation}' contains models, but it isn't a model, list, tuple, dict, or optional model")
+
+
+@functools.lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> Tuple[FrozenSet[str], List[Tuple[str, _Builder]], bool]:
+    """
+    Returns the field names of a model, the builders for fields which contain models, and whether instances can be
+    created directly (rather than with `model_construct`) when every field is given.
+    """
+    names = frozenset(model.model_fields)
+    builders: List[Tuple[str, _Builder]] = []
+    for name, field in model.model_fields.items():
+        try:
+            builder = _compile(field.annotation)
+        except TypeError as error:
+            raise TypeError(
+                f"Field '{name}' of '{model.__qualname__}' can't be rebuilt from trusted data (without validation): "
+                f"{error}"
+            ) from None
+        if builder is not None:
+            builders.append((name, builder))
+    direct = not model.__private_attributes__ \
+        and model.model_config.get("extra") != "allow" \
+        and getattr(model, "__pydantic_post_init__", None) is None
+
+    return names, builders, direct
+
+
+def construct_trusted(model: Type[M], data: Dict[str, Any]) -> M:
+    """
+    Recursively builds `model` from data that was already validated (i.e., the `model_dump()` of an instance of the
+    same class), without validating it again. Nested models (also within lists, tuples and dicts) are rebuilt too.
+
+    Raises:
+        TypeError if a field (of `model`, or of a nested model) holds a union of several models, or models within a
+        type other than the containers above, since which model was dumped can't be known without validating it
+    """
+    names, builders, direct = _plan(model)
+    values = dict(data)
+
+    for name, builder in builders:
+        if name in values:
+            values[name] = builder(values[name])
+
+    if not direct or values.keys() != names:
+        return model.model_construct(**values)
+
+    # equivalent to `model_construct` when every field is given (and the model has no extras, private attributes or
+    # post-init hook), but without its per-field bookkeeping
+    instance = model.__new__(model)
+    _object_setattr(instance, "__dict__", values)
+    _object_setattr(instance, "__pydantic_fields_set__", set(names))
+    _object_setattr(instance, "__pydantic_extra__", None)
+    _object_setattr(instance, "__pydantic_private__", None)
+    return instance
@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import pytest
+from pydantic import BaseModel
+from typing_extensions import Annotated
+
+from ._trusted import construct_trusted
+
+
+class Leaf(BaseModel):
+    value: int = 0
+
+
+class OtherLeaf(BaseModel):
+    name: str = ""
+
+
+class Tree(BaseModel):
+    leaf: Leaf = Leaf()
+    leaves: List[Leaf] = []
+    grid: Dict[str, List[Optional[Leaf]]] = {}
+    pair: Tuple[Leaf, int] = (Leaf(), 0)
+    many: Tuple[Leaf, ...] = ()
+    maybe: Optional[Leaf] = None
+    annotated: List[Annotated[Leaf, "metadata"]] = []
+    plain: List[int] = []
+
+
+class Ambiguous(BaseModel):
+    either: Union[Leaf, OtherLeaf] = Leaf()
+
+
+class NestedAmbiguous(BaseModel):
+    items: List[Ambiguous] = []
+
+
+def test__given_dump__when_construct_trusted__then_nested_models_are_rebuilt():
+    original = Tree(
+        leaf=Leaf(value=1),
+        leaves=[Leaf(value=2)],
+        grid={"a": [Leaf(value=3), None]},
+        pair=(Leaf(value=4), 5),
+        many=(Leaf(value=6), Leaf(value=7)),
+        maybe=Leaf(value=8),
+        annotated=[Leaf(value=9)],
+        plain=[10],
+    )
+
+    rebuilt = construct_trusted(Tree, original.model_dump())
+
+    assert rebuilt == original
+    assert type(rebuilt.grid["a"][0]) is Leaf
+    assert type(rebuilt.pair[0]) is Leaf
+    assert type(rebuilt.many[1]) is Leaf
+    assert type(rebuilt.maybe) is Leaf
+    assert type(rebuilt.annotated[0]) is Leaf
+
+
+@pytest.mark.parametrize("model,data", [
+    (Ambiguous,         { "either": { "name": "other" } }),
+    (NestedAmbiguous,   { "items": [{ "either": { "name": "other" } }] }),
+])
+def test__given_union_of_models__when_construct_trusted__then_raises_type_error_rather_than_guessing(model, data):
+    # the dump doesn't record whether it was a Leaf or an OtherLeaf
+    with pytest.raises(TypeError, match="'either' of 'Ambiguous'"):
+        construct_trusted(model, data)
+
+
+def test__given_partial_dump__when_construct_trusted__then_defaults_are_used():
+    rebuilt = construct_trusted(Tree, {"leaf": {"value": 1}})
+
+    assert rebuilt == Tree(leaf=Leaf(value=1))
+
+
+def test__given_instances__when_construct_trusted__then_kept():
+    leaf = Leaf(value=1)
+
+    rebuilt = construct_trusted(Tree, {"leaf": leaf, "leaves": [leaf]})
+
+    assert rebuilt.leaf is leaf
+    assert rebuilt.leaves[0] is leaf
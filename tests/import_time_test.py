@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import pyfig
+
+
+LAZY_MODULES = [
+    "pyfig._metaconf",
+    "pyfig._live",
+    "pyfig._debug",
+    "pyfig._snapshot",
+    "pyfig._incremental",
+    "pyfig._parsers",
+    "pyfig._eval.document_cache",
+    "pyfig._eval.json_stream",
+    "pyfig._eval.variable_evaluator",
+    "pyfig._eval.environment_evaluator",
+    "pyfig._eval.python_evaluator",
+    "pyfig._eval.string_evaluator",
+    "pyfig._eval.cat_evaluator",
+    "pyfig._eval.sympy_evaluator",
+    "pyfig._eval.jsonfile_evaluator",
+    "pyfig._eval.yamlfile_evaluator",
+]
+
+
+def _import_times(code: str) -> Dict[str, int]:
+    """
+    Runs `code` in a fresh interpreter with `-X importtime`, and returns each imported module's self time (us).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # e.g., "import time:       246 |        246 |       _weakrefset"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative_us, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(self_us)
+
+    return times
+
+
+def test__given_fresh_interpreter__when_import_pyfig__then_lazy_modules_are_not_imported():
+    imported = _import_times("import pyfig")
+
+    assert "pyfig._loader" in imported
+    assert [module for module in LAZY_MODULES if module in imported] == []
+
+
+def test__given_fresh_interpreter__when_lazy_name_used__then_only_its_modules_are_imported():
+    # lazy imports go through importlib, which `-X importtime` doesn't report
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, pyfig; pyfig.VariableEvaluator; print('\\n'.join(sys.modules))"],
+        capture_output=True, text=True, check=True
+    )
+    imported = result.stdout.splitlines()
+
+    assert "pyfig._eval.variable_evaluator" in imported
+    assert "pyfig._metaconf" not in imported
+    assert "pyfig._eval.jsonfile_evaluator" not in imported
+
+
+@pytest.mark.parametrize("name", pyfig.__all__)
+def test__given_public_name__when_accessed__then_resolves(name: str):
+    assert getattr(pyfig, name) is not None
+    assert name in dir(pyfig)
+
+
+def test__given_unknown_name__when_accessed__then_raises_attributeerror():
+    with pytest.raises(AttributeError):
+        pyfig.NotAThing # pylint: disable=pointless-statement